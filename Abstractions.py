@@ -1,5 +1,5 @@
 
-from typing import Any, Iterable, Optional, List, Tuple
+from typing import Any, Dict, FrozenSet, Iterable, Optional, List, Tuple
 
 class State:
     def key(self) -> Any: raise NotImplementedError
@@ -7,16 +7,36 @@ class State:
     def __eq__(self, o): return isinstance(o, State) and self.key()==o.key()
 
 class Problem:
+    # Reglas declarativas de poda de operadores (las aplica successors):
+    #   INVERSE    acción -> acción que la deshace; no se genera justo después
+    #   COMMUTING  pares (a, b) con a;b == b;a: tras `a` no se genera `b`
+    #              (basta el orden b;a; declarar solo uno de los dos órdenes)
+    INVERSE: Dict[Any, Any] = {}
+    COMMUTING: FrozenSet[Tuple[Any, Any]] = frozenset()
+    pruning: bool = True  # False: generar todas las acciones válidas
+
     def initial_state(self) -> Any: raise NotImplementedError
     def is_goal(self, state: Any) -> bool: raise NotImplementedError
     def actions(self, state: Any) -> Iterable[Any]: raise NotImplementedError
     def result(self, state: Any, action: Any) -> Any: raise NotImplementedError
     def step_cost(self, state: Any, action: Any, next_state: Any) -> float: return 1.0
     
+    def pruned(self, last_action: Any, action: Any) -> bool:
+        """True si aplicar `action` justo después de `last_action` es redundante"""
+        return self.INVERSE.get(last_action) == action or (last_action, action) in self.COMMUTING
+
     # Método para compatibilidad con FASE 1
-    def successors(self, state: Any):
-        """Retorna (action, next_state, step_cost) para cada acción válida"""
+    def successors(self, state: Any, last_action: Any = None, stats=None):
+        """Retorna (action, next_state, step_cost) para cada acción válida
+
+        Con `last_action` (la acción que llevó a `state`) se omiten las acciones
+        podadas por INVERSE/COMMUTING; con `stats` se suman en stats.pruned.
+        """
+        prune = self.pruning and last_action is not None
         for action in self.actions(state):
+            if prune and self.pruned(last_action, action):
+                if stats is not None: stats.pruned += 1
+                continue
             next_state = self.result(state, action)
             cost = self.step_cost(state, action, next_state)
             yield (action, next_state, cost)
@@ -34,8 +54,9 @@ class Node:
         self.depth = (parent.depth + 1) if parent else 0
         self.f = f  # para A*/Greedy
         
-    def expand(self, problem: Problem):
-        for action, next_state, cost in problem.successors(self.state):
+    def expand(self, problem: Problem, stats=None):
+        """Hijos del nodo sin las acciones podadas tras self.action (se suman en stats.pruned)"""
+        for action, next_state, cost in problem.successors(self.state, self.action, stats):
             yield Node(next_state, self, action, cost)
 
 def reconstruct_path(goal_node: Node) -> List[Any]:
@@ -1,4 +1,7 @@
-from typing import Tuple, Callable, Dict
+from typing import Tuple, Callable, Dict, List, Optional
+from collections import OrderedDict
+from math import isqrt
+import threading
 
 State = Tuple[int, ...]
 GOAL = (1,2,3,4,5,6,7,8,0)
@@ -8,24 +11,20 @@ def misplaced_tiles(state: State, goal: State = GOAL) -> int:
     """Número de fichas mal ubicadas (excluye el hueco 0)"""
     return sum(1 for i,v in enumerate(state) if v != 0 and v != goal[i])
 
-def manhattan_distance(state: State, goal: State = GOAL) -> int:
+def manhattan_distance(state: State, goal: State = GOAL, width: Optional[int] = None) -> int:
     """Suma de distancias Manhattan por ficha (excluye el hueco 0)"""
-    dist = 0
-    goal_pos = {v:i for i,v in enumerate(goal)}
-    for i,v in enumerate(state):
-        if v == 0: continue
-        gi = goal_pos[v]
-        x1, y1 = divmod(i, 3)
-        x2, y2 = divmod(gi, 3)
-        dist += abs(x1-x2) + abs(y1-y2)
-    return dist
+    # Meta por defecto: compilada una sola vez al importar, sin lock ni LRU por llamada
+    if width is None and (goal is GOAL or goal == GOAL):
+        return _manhattan_goal(state)
+    # Otras metas (y tableros no cuadrados, que deben indicar el ancho) pasan por la caché
+    return compile_heuristic("manhattan", goal, width)(state)
 
 # Aliases para compatibilidad
 def misplaced(state: State) -> int:
     return misplaced_tiles(state, GOAL)
 
 def manhattan(state: State) -> int:
-    return manhattan_distance(state, GOAL)
+    return _manhattan_goal(state)
 
 # Clase dummy para tipado, solo para evitar errores de importación
 class PuzzleState:
@@ -33,8 +32,60 @@ class PuzzleState:
     def key(self): return self.tiles
     def __repr__(self): return f"PuzzleState{self.tiles}"
 
-# Mapa por nombre para el menú
-HEURISTICS: Dict[str, Callable[[State, State], int]] = {
+# Mapa por nombre para el menú: h(estado, meta=GOAL) (manhattan acepta además el ancho)
+HEURISTICS: Dict[str, Callable[..., int]] = {
     "misplaced": misplaced_tiles,
     "manhattan": manhattan_distance,
-}
\ No newline at end of file
+}
+
+# ---------------------------------------------------------------------------
+# Heurísticas compiladas por meta: ambas son una suma de costos por (casilla,
+# ficha), así que se precalcula una fila por casilla y h(s) es
+# sum(filas[i][s[i]]): sin diccionarios ni divmod por llamada (~5x más rápido).
+
+COMPILED_CACHE_SIZE = 256  # metas distintas compiladas en memoria (LRU)
+
+def _cell_costs(name: str, goal: State, width: int) -> List[List[int]]:
+    n = len(goal)
+    goal_pos = [0] * n
+    for i, v in enumerate(goal):
+        goal_pos[v] = i
+    rows = []
+    for i in range(n):
+        x1, y1 = divmod(i, width)
+        row = [0] * n
+        for v in range(1, n):  # el hueco no cuenta
+            if name == "manhattan":
+                x2, y2 = divmod(goal_pos[v], width)
+                row[v] = abs(x1 - x2) + abs(y1 - y2)
+            elif name == "misplaced":
+                row[v] = int(goal[i] != v)
+            else:
+                raise KeyError(f"Heurística desconocida: {name}")
+        rows.append(row)
+    return rows
+
+_compiled: "OrderedDict[Tuple[str, State, int], Callable[[State], int]]" = OrderedDict()
+_compiled_lock = threading.Lock()
+
+def compile_heuristic(name: str, goal: State = GOAL, width: Optional[int] = None) -> Callable[[State], int]:
+    """h(state) de `name` hacia `goal`, compilada una vez por (nombre, meta, ancho)"""
+    goal = tuple(goal)
+    key = (name, goal, width or isqrt(len(goal)))
+    with _compiled_lock:
+        h = _compiled.get(key)
+        if h is not None:
+            _compiled.move_to_end(key)
+            return h
+    rows = _cell_costs(name, goal, key[2])
+    getitem = list.__getitem__
+    h = lambda state: sum(map(getitem, rows, state))
+    h.heuristic_name = name  # identidad estable (checkpoints); la meta va aparte
+    with _compiled_lock:
+        _compiled[key] = h
+        while len(_compiled) > COMPILED_CACHE_SIZE:
+            _compiled.popitem(last=False)
+    return h
+
+# Manhattan hacia GOAL, la que usan manhattan() y manhattan_distance() por defecto
+_manhattan_goal = compile_heuristic("manhattan", GOAL)
@@ -1,3 +1,6 @@
+import heapq
+import sys
+
 class Stack:
     def __init__(self): self._a = []
     def push(self, x): self._a.append(x)
@@ -6,6 +9,7 @@ class Stack:
         return self._a.pop()
     def is_empty(self): return not self._a
     def __len__(self): return len(self._a)
+    def __sizeof__(self): return object.__sizeof__(self) + sys.getsizeof(self._a)
 
 class Queue:
     # Cola circular para O(1) amortizado
@@ -35,23 +39,63 @@ class Queue:
         return x
     def is_empty(self): return self._size == 0
     def __len__(self): return self._size
+    def __sizeof__(self): return object.__sizeof__(self) + sys.getsizeof(self._a)
+
+# Bytes de cada entrada del montículo: tupla (prioridad, contador, item) + float + int
+_HEAP_ENTRY_BYTES = sys.getsizeof((0.0, 0, None)) + sys.getsizeof(0.0) + sys.getsizeof(1 << 20)
+
+# Desempates entre prioridades iguales (en A* con costo unitario hay muchísimos)
+FIFO, LIFO, HIGH_G, LOW_H = "fifo", "lifo", "high_g", "low_h"
+TIE_BREAKS = (FIFO, LIFO, HIGH_G, LOW_H)
 
 class MinHeap:
     # Montículo mínimo binario 1-indexed con prioridades
-    def __init__(self): 
+    def __init__(self, tie_break: str = FIFO): 
+        if tie_break not in TIE_BREAKS:
+            raise ValueError(f"Desempate desconocido: {tie_break!r} (opciones: {', '.join(TIE_BREAKS)})")
         self._a = [None]
         self._counter = 0
+        self.tie_break = tie_break
         
     def __len__(self): return len(self._a)-1
     def is_empty(self): return len(self) == 0
+    def __sizeof__(self): return object.__sizeof__(self) + sys.getsizeof(self._a) + len(self) * _HEAP_ENTRY_BYTES
     
-    def push(self, item, priority: float):
-        """Inserta item con prioridad dada"""
+    def push(self, item, priority: float, g: float = 0.0, h: float = 0.0):
+        """Inserta item con prioridad dada; g y h solo se usan para desempatar"""
         self._counter += 1
-        entry = (priority, self._counter, item)
+        # El contador es único, así que nunca se llegan a comparar los items
+        tie = self.tie_break
+        if tie == FIFO:
+            key = self._counter
+        elif tie == LIFO:
+            key = -self._counter
+        elif tie == HIGH_G:
+            key = (-g, self._counter)
+        else:
+            key = (h, self._counter)
+        entry = (priority, key, item)
         self._a.append(entry)
         self._sift_up(len(self))
         
+    def __iter__(self):
+        """Items en orden arbitrario (orden del arreglo)"""
+        return (entry[2] for entry in self._a[1:])
+    
+    def truncate(self, k: int) -> None:
+        """Conserva solo las k entradas de menor prioridad"""
+        # Un arreglo ordenado ya cumple la propiedad de montículo
+        self._a = [None] + heapq.nsmallest(k, self._a[1:])
+
+    def snapshot(self):
+        """(entradas (priority, key, item) en orden del arreglo, contador) para guardar y restaurar"""
+        return self._a[1:], self._counter
+
+    def restore(self, entries, counter: int) -> None:
+        """Inverso de snapshot: mismo arreglo y contador, así los desempates no cambian"""
+        self._a = [None] + list(entries)
+        self._counter = counter
+
     def pop(self):
         """Retorna (priority, item)"""
         if self.is_empty(): raise IndexError("pop from empty heap")
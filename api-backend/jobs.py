@@ -0,0 +1,280 @@
+"""Asynchronous solve jobs: a SQLite-backed queue plus a local worker pool.
+
+``POST /api/jobs`` stores the request and returns at once; worker threads claim
+jobs by priority (then age), run them under a per-job deadline and store the
+result. Everything lives in one SQLite file (WAL), so jobs survive restarts and
+several uvicorn workers can share the queue: a claim is a single conditional
+UPDATE, and a running job whose heartbeat stops (its process died) is claimed
+again after ``lease`` seconds. Workers send heartbeats from a timer, not from
+the search, and every claim gets a fresh token: once a job is claimed again,
+writes from the previous worker are ignored. Finished results are kept until their total
+size passes ``max_result_bytes``; then the oldest finished jobs are deleted.
+"""
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED, EXPIRED = "queued", "running", "done", "failed", "cancelled", "expired"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    created REAL NOT NULL,
+    deadline REAL,            -- absolute time.time(); NULL = none
+    started REAL,
+    finished REAL,
+    heartbeat REAL,           -- last sign of life of the worker running it
+    token TEXT,               -- claim token of that worker
+    attempts INTEGER NOT NULL DEFAULT 0,
+    request TEXT NOT NULL,    -- JSON
+    progress TEXT,            -- JSON
+    message TEXT,
+    result BLOB,              -- zlib(JSON)
+    result_bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, priority DESC, created);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (finished) WHERE finished IS NOT NULL;
+"""
+
+class JobStore:
+    """Job rows in SQLite; safe across threads and processes"""
+    def __init__(self, path: str, max_result_bytes: int = 64 * 1024 * 1024, lease: float = 30.0):
+        self.path = path
+        self.max_result_bytes = max_result_bytes
+        self.lease = lease
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(jobs)")}
+        if "token" not in columns:  # files written before claim tokens
+            self._db.execute("ALTER TABLE jobs ADD COLUMN token TEXT")
+
+    def submit(self, request: Dict[str, Any], priority: int = 0, deadline: Optional[float] = None) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._db.execute("INSERT INTO jobs (id, status, priority, created, deadline, request) VALUES (?, ?, ?, ?, ?, ?)",
+                             (job_id, QUEUED, priority, time.time(), deadline, json.dumps(request)))
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Take the next job (highest priority, oldest first) or None
+
+        The job's ``token`` must be passed to every later write for it.
+        """
+        now, token = time.time(), uuid.uuid4().hex
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                # Past their deadline before anyone ran them
+                self._db.execute("UPDATE jobs SET status = ?, finished = ?, message = 'Deadline passed while queued' "
+                                 "WHERE status = ? AND deadline IS NOT NULL AND deadline <= ?", (EXPIRED, now, QUEUED, now))
+                # Orphans: their worker stopped sending heartbeats
+                self._db.execute("UPDATE jobs SET status = ? WHERE status = ? AND heartbeat < ?",
+                                 (QUEUED, RUNNING, now - self.lease))
+                row = self._db.execute("SELECT id FROM jobs WHERE status = ? ORDER BY priority DESC, created LIMIT 1",
+                                       (QUEUED,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE jobs SET status = ?, started = ?, heartbeat = ?, token = ?, "
+                                     "attempts = attempts + 1 WHERE id = ?", (RUNNING, now, now, token, row[0]))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        job = self.get(row[0])
+        job["token"] = token
+        return job
+
+    def heartbeat(self, job_id: str, token: str) -> bool:
+        """Keep the claim alive; False if the job was cancelled or claimed by another worker"""
+        with self._lock:
+            cursor = self._db.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = ? AND token = ?",
+                                      (time.time(), job_id, RUNNING, token))
+        return cursor.rowcount == 1
+
+    def progress(self, job_id: str, token: str, progress: Dict[str, Any]) -> bool:
+        """Record progress (and a heartbeat); False if the job was cancelled or claimed by another worker"""
+        with self._lock:
+            cursor = self._db.execute("UPDATE jobs SET progress = ?, heartbeat = ? WHERE id = ? AND status = ? AND token = ?",
+                                      (json.dumps(progress), time.time(), job_id, RUNNING, token))
+        return cursor.rowcount == 1
+
+    def finish(self, job_id: str, token: str, status: str, result: Optional[Dict[str, Any]] = None,
+               message: str = "") -> bool:
+        """Store the outcome; False if the job was cancelled or claimed by another worker meanwhile"""
+        blob = zlib.compress(json.dumps(result).encode()) if result is not None else None
+        with self._lock:
+            # A job cancelled while running keeps its status
+            cursor = self._db.execute("UPDATE jobs SET status = ?, finished = ?, message = ?, result = ?, result_bytes = ? "
+                                      "WHERE id = ? AND status = ? AND token = ?",
+                                      (status, time.time(), message, blob, len(blob) if blob else 0, job_id, RUNNING, token))
+            self._evict()
+        return cursor.rowcount == 1
+
+    def release(self, job_id: str, token: str) -> None:
+        """Put a running job back in the queue (its worker is shutting down)"""
+        with self._lock:
+            self._db.execute("UPDATE jobs SET status = ?, heartbeat = NULL, token = NULL "
+                             "WHERE id = ? AND status = ? AND token = ?", (QUEUED, job_id, RUNNING, token))
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; False if it already finished or does not exist"""
+        with self._lock:
+            cursor = self._db.execute("UPDATE jobs SET status = ?, finished = ?, message = 'Cancelled' "
+                                      "WHERE id = ? AND status IN (?, ?)", (CANCELLED, time.time(), job_id, QUEUED, RUNNING))
+        return cursor.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT id, status, priority, created, deadline, started, finished, attempts, "
+                                   "request, progress, message, result FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(("id", "status", "priority", "created", "deadline", "started", "finished", "attempts",
+                        "request", "progress", "message", "result"), row))
+        job["request"] = json.loads(job["request"])
+        job["progress"] = json.loads(job["progress"]) if job["progress"] else None
+        job["result"] = json.loads(zlib.decompress(job["result"])) if job["result"] is not None else None
+        return job
+
+    def position(self, job_id: str) -> Optional[int]:
+        """Jobs ahead of a queued job (None if it is not queued)"""
+        with self._lock:
+            row = self._db.execute("SELECT priority, created FROM jobs WHERE id = ? AND status = ?",
+                                   (job_id, QUEUED)).fetchone()
+            if row is None:
+                return None
+            return self._db.execute("SELECT count(*) FROM jobs WHERE status = ? AND "
+                                    "(priority > ? OR (priority = ? AND created < ?))",
+                                    (QUEUED, row[0], row[0], row[1])).fetchone()[0]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT status, count(*) FROM jobs GROUP BY status").fetchall()
+            stored = self._db.execute("SELECT coalesce(sum(result_bytes), 0) FROM jobs").fetchone()[0]
+        return dict(rows, result_bytes=stored)
+
+    def _evict(self) -> None:
+        """Delete the oldest finished jobs while stored results exceed max_result_bytes (lock held)"""
+        total = self._db.execute("SELECT coalesce(sum(result_bytes), 0) FROM jobs").fetchone()[0]
+        if total <= self.max_result_bytes:
+            return
+        excess, doomed = total - self.max_result_bytes, []
+        for job_id, size in self._db.execute("SELECT id, result_bytes FROM jobs WHERE finished IS NOT NULL "
+                                             "AND status != ? ORDER BY finished", (RUNNING,)):
+            doomed.append((job_id,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._db.executemany("DELETE FROM jobs WHERE id = ?", doomed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+class JobCancel:
+    """Cancellation token of a running job: set on shutdown, on cancel or past the deadline"""
+    def __init__(self, stopping: threading.Event, deadline: Optional[float]):
+        self.stopping = stopping
+        self.deadline = deadline
+        self.cancelled = False  # set by the worker when the store says the job was cancelled (or lost)
+
+    def expired(self) -> bool:
+        return self.deadline is not None and time.time() >= self.deadline
+
+    def is_set(self) -> bool:
+        return self.cancelled or self.stopping.is_set() or self.expired()
+
+class JobQueue:
+    """Worker threads that run ``run(job, cancel, progress)`` for each claimed job.
+
+    ``run`` returns (status, result, message); ``progress(dict)`` records
+    progress and returns False once the job has been cancelled. A timer sends
+    heartbeats every ``lease / 3`` seconds while ``run`` works, even if it
+    reports no progress (waiting for the profiler, loading tables).
+    """
+    def __init__(self, store: JobStore, run: Callable, workers: int = 2, poll: float = 1.0):
+        self.store = store
+        self.run = run
+        self.workers = workers
+        self.poll = poll  # also picks up jobs submitted by other processes
+        self._wake = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = 5.0) -> bool:
+        """Interrupt running jobs; they go back to the queue for the next start.
+
+        Returns False if some worker is still running after ``timeout`` (a search
+        that does not check its cancel token often): it still writes to the
+        store when it ends, so the store must stay open.
+        """
+        self._stopping.set()
+        with self._wake:
+            self._wake.notify_all()
+        end = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, end - time.monotonic()))
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        return not self._threads
+
+    def submit(self, request: Dict[str, Any], priority: int = 0, deadline: Optional[float] = None) -> str:
+        job_id = self.store.submit(request, priority, deadline)
+        with self._wake:
+            self._wake.notify()
+        return job_id
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            job = self.store.claim()
+            if job is None:
+                with self._wake:
+                    self._wake.wait(self.poll)
+                continue
+            cancel = JobCancel(self._stopping, job["deadline"])
+
+            def progress(info: Dict[str, Any], job=job, cancel=cancel) -> bool:
+                if not self.store.progress(job["id"], job["token"], info):
+                    cancel.cancelled = True
+                return not cancel.cancelled
+
+            done = threading.Event()
+            beat = threading.Thread(target=self._heartbeat, args=(job, cancel, done),
+                                    name=f"{threading.current_thread().name}-heartbeat", daemon=True)
+            beat.start()
+            try:
+                status, result, message = self.run(job, cancel, progress)
+            except Exception as e:
+                status, result, message = FAILED, None, f"Error during solving: {e}"
+            finally:
+                done.set()
+                beat.join()
+            if self._stopping.is_set() and not cancel.cancelled:
+                # Shutting down: the job runs again from the start after the restart
+                self.store.release(job["id"], job["token"])
+                return
+            if cancel.expired() and status != DONE:
+                status, message = EXPIRED, "Deadline exceeded"
+            self.store.finish(job["id"], job["token"], status, result, message)
+
+    def _heartbeat(self, job: Dict[str, Any], cancel: JobCancel, done: threading.Event) -> None:
+        """Renew the claim until ``done``; stop the job if it was cancelled or lost"""
+        while not done.wait(self.store.lease / 3):
+            if not self.store.heartbeat(job["id"], job["token"]):
+                cancel.cancelled = True
+                return
@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Open-loop load generator for the solver API.
+
+Requests arrive as a Poisson process at ``--rate`` per second regardless of
+how fast the server answers (open loop), so queueing delay shows up in the
+latencies instead of silently lowering the offered load. Each request draws
+an algorithm, a heuristic and a board difficulty from a weighted mix.
+
+Usage:
+    python loadtest.py run --spawn --rate 20 --duration 30 -o before.json
+    python loadtest.py run --url http://127.0.0.1:8000 \\
+        --algorithms astar:4,ida:2,bfs:1 --difficulty easy:5,medium:3,hard:1
+    python loadtest.py run --spawn --corpus ../corpus_3x3.bin --difficulty easy:1,medium:1,hard:1
+    python loadtest.py compare before.json after.json [--threshold 0.10]
+
+Identical concurrent requests are coalesced by the server (see
+singleflight.py); a realistic mix with many distinct boards keeps that from
+hiding the real per-solve cost.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.instances import INSTANCE_SETS
+
+# Difficulty level -> curated boards (optimal depth 4-8, 12-16, 20-28)
+DIFFICULTY_SETS = {
+    "easy": "3x3-shallow",
+    "medium": "3x3-medium",
+    "hard": "3x3-deep",
+}
+INFORMED_ALGORITHMS = ("greedy", "astar", "ida")
+
+
+class Sample(NamedTuple):
+    algorithm: str
+    difficulty: str
+    outcome: str  # ok | unsolved | http_<status> | timeout | error
+    latency: float  # seconds, from scheduled arrival to full response
+    server_time: Optional[float]  # metrics.time reported by the API (ms)
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """``"astar:3,ida:1"`` -> ``{"astar": 3.0, "ida": 1.0}`` (weight defaults to 1)"""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition(":")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def pick(rng: random.Random, mix: Dict[str, float]) -> str:
+    return rng.choices(list(mix), weights=list(mix.values()))[0]
+
+
+def to_matrix(state, width: int) -> List[List[int]]:
+    return [list(state[i:i + width]) for i in range(0, len(state), width)]
+
+
+def board_pool(difficulty: Dict[str, float], corpus: Optional[str] = None) -> Dict[str, List[List[List[int]]]]:
+    """Boards per difficulty level, as the API's board matrices.
+
+    Without a corpus the levels are the curated benchmark sets; with a
+    corpus from ``python -m solver.generator`` they are its lower, middle and
+    upper thirds by depth (or heuristic estimate).
+    """
+    for level in difficulty:
+        if level not in DIFFICULTY_SETS:
+            raise SystemExit(f"Unknown difficulty {level!r}; choose from {', '.join(DIFFICULTY_SETS)}")
+    if corpus is None:
+        return {level: [to_matrix(inst.state, inst.width) for inst in INSTANCE_SETS[DIFFICULTY_SETS[level]]]
+                for level in difficulty}
+
+    from solver.generator import load
+    loaded = load(corpus)
+    boards = sorted(loaded.boards, key=lambda b: b.depth)
+    third = max(1, len(boards) // 3)
+    slices = {"easy": boards[:third], "medium": boards[third:2 * third], "hard": boards[2 * third:]}
+    return {level: [to_matrix(b.state, loaded.width) for b in slices[level]] for level in difficulty}
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+async def post_json(host: str, port: int, path: str, body: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """Minimal HTTP/1.1 POST over a fresh connection (stdlib only)"""
+    payload = json.dumps(body).encode()
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload
+        )
+        await writer.drain()
+        raw = await reader.read()
+    finally:
+        writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    headers = head.lower()
+    if b"transfer-encoding: chunked" in headers:
+        data = _dechunk(data)
+    try:
+        return status, json.loads(data) if data else {}
+    except ValueError:
+        return status, {}
+
+
+def _dechunk(data: bytes) -> bytes:
+    out, pos = bytearray(), 0
+    while True:
+        end = data.index(b"\r\n", pos)
+        size = int(data[pos:end].split(b";")[0], 16)
+        if size == 0:
+            return bytes(out)
+        out += data[end + 2:end + 2 + size]
+        pos = end + 2 + size + 2
+
+
+async def one_request(url, body, algorithm, difficulty, scheduled, timeout, samples: List[Sample]):
+    try:
+        status, doc = await asyncio.wait_for(post_json(url.hostname, url.port or 80, "/api/solve", body), timeout)
+    except asyncio.TimeoutError:
+        samples.append(Sample(algorithm, difficulty, "timeout", time.perf_counter() - scheduled, None))
+        return
+    except (OSError, ValueError, IndexError):
+        samples.append(Sample(algorithm, difficulty, "error", time.perf_counter() - scheduled, None))
+        return
+    latency = time.perf_counter() - scheduled
+    if status != 200:
+        outcome = f"http_{status}"
+    else:
+        outcome = "ok" if doc.get("success") else "unsolved"
+    server_time = (doc.get("metrics") or {}).get("time")
+    samples.append(Sample(algorithm, difficulty, outcome, latency, server_time))
+
+
+async def generate(args) -> Tuple[List[Sample], float, int]:
+    """Fire requests for ``args.duration`` seconds; returns (samples, wall time, dropped)"""
+    rng = random.Random(args.seed)
+    url = urlsplit(args.url)
+    algorithms, heuristics = parse_mix(args.algorithms), parse_mix(args.heuristics)
+    difficulty = parse_mix(args.difficulty)
+    pool = board_pool(difficulty, args.corpus)
+
+    samples: List[Sample] = []
+    tasks = set()
+    dropped = 0
+    start = time.perf_counter()
+    next_arrival = start
+    while next_arrival - start < args.duration:
+        delay = next_arrival - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        algorithm, level = pick(rng, algorithms), pick(rng, difficulty)
+        body = {"algorithm": algorithm, "initial": rng.choice(pool[level]), "mode": "solve"}
+        if algorithm in INFORMED_ALGORITHMS:
+            body["heuristic"] = pick(rng, heuristics)
+        if len(tasks) >= args.max_in_flight:
+            # Keep the generator itself from exhausting sockets; counted as failures
+            dropped += 1
+        else:
+            task = asyncio.ensure_future(
+                one_request(url, body, algorithm, level, next_arrival, args.timeout, samples))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        next_arrival += rng.expovariate(args.rate)
+    if tasks:
+        await asyncio.wait(tasks)
+    return samples, time.perf_counter() - start, dropped
+
+
+def summarize(samples: List[Sample], wall: float, dropped: int) -> Dict[str, Any]:
+    def block(group: List[Sample]) -> Dict[str, Any]:
+        ok = sorted(s.latency for s in group if s.outcome == "ok")
+        outcomes: Dict[str, int] = {}
+        for s in group:
+            outcomes[s.outcome] = outcomes.get(s.outcome, 0) + 1
+        total = len(group) or 1
+        return {
+            "requests": len(group),
+            "ok": len(ok),
+            "throughput": len(ok) / wall if wall else 0.0,
+            "p50": percentile(ok, 50), "p95": percentile(ok, 95), "p99": percentile(ok, 99),
+            "max": ok[-1] if ok else None,
+            "error_rate": sum(n for o, n in outcomes.items() if o not in ("ok", "unsolved", "timeout")) / total,
+            "timeout_rate": outcomes.get("timeout", 0) / total,
+            "outcomes": outcomes,
+        }
+
+    summary = block(samples)
+    summary["dropped"] = dropped
+    summary["wall"] = wall
+    summary["by_algorithm"] = {a: block([s for s in samples if s.algorithm == a])
+                               for a in sorted({s.algorithm for s in samples})}
+    summary["by_difficulty"] = {d: block([s for s in samples if s.difficulty == d])
+                                for d in sorted({s.difficulty for s in samples})}
+    return summary
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return f"{seconds * 1000:.1f}" if seconds is not None else "-"
+
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    print(f"\n{'group':<16} {'req':>6} {'ok':>6} {'ok/s':>7} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'err%':>6} {'tmo%':>6}")
+    print("-" * 80)
+
+    def row(label, b):
+        print(f"{label:<16} {b['requests']:>6} {b['ok']:>6} {b['throughput']:>7.2f} {_ms(b['p50']):>8} "
+              f"{_ms(b['p95']):>8} {_ms(b['p99']):>8} {b['error_rate'] * 100:>6.1f} {b['timeout_rate'] * 100:>6.1f}")
+
+    row("all", summary)
+    for name, b in summary["by_algorithm"].items():
+        row(f"  {name}", b)
+    for name, b in summary["by_difficulty"].items():
+        row(f"  {name}", b)
+    print(f"\noutcomes: {summary['outcomes']}  dropped by generator: {summary['dropped']}")
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(workers: int) -> Tuple[subprocess.Popen, str]:
+    """Start a local uvicorn on a free port and wait until /health answers"""
+    port = free_port()
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=here,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"uvicorn exited with code {proc.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5) as s:
+                s.sendall(b"GET /health HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n")
+                if s.recv(32).startswith(b"HTTP/1.1 200"):
+                    return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("uvicorn did not become healthy within 60 s")
+
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def cmd_run(args) -> int:
+    server = None
+    if args.spawn:
+        server, args.url = spawn_server(args.workers)
+        print(f"🚀 Spawned uvicorn ({args.workers} worker(s)) at {args.url}")
+    try:
+        print(f"🔥 {args.rate:g} req/s for {args.duration:g} s against {args.url}")
+        samples, wall, dropped = asyncio.run(generate(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    summary = summarize(samples, wall, dropped)
+    print_summary(summary)
+    if args.output:
+        doc = {
+            "meta": {
+                "date": datetime.datetime.now().isoformat(timespec="seconds"),
+                "git": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "url": args.url, "spawned": args.spawn, "workers": args.workers if args.spawn else None,
+                "rate": args.rate, "duration": args.duration, "timeout": args.timeout, "seed": args.seed,
+                "algorithms": args.algorithms, "heuristics": args.heuristics, "difficulty": args.difficulty,
+                "corpus": args.corpus,
+            },
+            "summary": summary,
+        }
+        with open(args.output, "w") as f:
+            json.dump(doc, f, indent=2)
+        print(f"💾 Results saved to {args.output}")
+    return 0
+
+
+def cmd_compare(args) -> int:
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+    if base["meta"]["rate"] != new["meta"]["rate"] or base["meta"]["difficulty"] != new["meta"]["difficulty"]:
+        print("⚠️  Runs used different rates or request mixes; the comparison may not be meaningful")
+
+    regressions = 0
+    print(f"{'group':<16} {'metric':<12} {'base':>10} {'new':>10} {'change':>8}")
+    print("-" * 60)
+    groups = [("all", base["summary"], new["summary"])]
+    groups += [(f"  {name}", b, new["summary"]["by_algorithm"][name])
+               for name, b in base["summary"]["by_algorithm"].items() if name in new["summary"]["by_algorithm"]]
+    for label, b, n in groups:
+        # Higher is worse for latencies and error rates, lower is worse for throughput
+        for metric, worse_if_higher in (("p50", True), ("p95", True), ("p99", True),
+                                        ("throughput", False), ("error_rate", True), ("timeout_rate", True)):
+            old, cur = b.get(metric), n.get(metric)
+            if old is None or cur is None:
+                continue
+            if old == 0:
+                regressed = worse_if_higher and cur > 0
+                change = ""
+            else:
+                ratio = cur / old
+                regressed = ratio > 1 + args.threshold if worse_if_higher else ratio < 1 - args.threshold
+                change = f"{(ratio - 1) * 100:+.1f}%"
+            regressions += regressed
+            flag = " 🔴" if regressed else ""
+            print(f"{label:<16} {metric:<12} {old:>10.4f} {cur:>10.4f} {change:>8}{flag}")
+    print(f"\n{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Open-loop load test for the solver API")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="generate load and report latency/throughput")
+    run.add_argument("--url", default="http://127.0.0.1:8000")
+    run.add_argument("--spawn", action="store_true", help="start a local uvicorn on a free port")
+    run.add_argument("--workers", type=int, default=1, help="uvicorn workers when --spawn is used")
+    run.add_argument("--rate", type=float, default=10.0, help="mean arrivals per second (Poisson)")
+    run.add_argument("--duration", type=float, default=30.0, help="seconds of arrivals")
+    run.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    run.add_argument("--max-in-flight", type=int, default=1000)
+    run.add_argument("--algorithms", default="astar:4,ida:2,greedy:1,bfs:1",
+                     help="weighted mix, e.g. astar:4,ida:2 (auto is allowed)")
+    run.add_argument("--heuristics", default="manhattan:3,misplaced:1")
+    run.add_argument("--difficulty", default="easy:5,medium:3,hard:1",
+                     help=f"weighted mix of {', '.join(DIFFICULTY_SETS)}")
+    run.add_argument("--corpus", help="board corpus from `python -m solver.generator build`")
+    run.add_argument("--seed", type=int, default=2024)
+    run.add_argument("-o", "--output", help="save the summary as JSON")
+
+    cmp = sub.add_parser("compare", help="compare two saved runs")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.10)
+
+    args = parser.parse_args()
+    return cmd_run(args) if args.command == "run" else cmd_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,35 +7,46 @@ Optimized for Render deployment
 import sys
 import os
 import time
-import importlib.util
+import asyncio
+import gzip
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-from fastapi import FastAPI, HTTPException
+from typing import List, Dict, Any, Optional, Tuple
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
+try:
+    import brotli
+except ImportError:  # optional: GET /api/solve/{board} falls back to gzip
+    brotli = None
+
 # Add parent directory to path to import our algorithms
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(Path(__file__).parent))
 
 # Import our existing modules
 try:
     from Abstractions import Node, Problem, reconstruct_path
     from Heuristics import HEURISTICS, GOAL
-    spec = importlib.util.spec_from_file_location(
-        "n_8_problem", 
-        parent_dir / "Problems" / "N-8-Problem.py"
-    )
-    n_8_problem = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(n_8_problem)
-    EightPuzzle = n_8_problem.EightPuzzle
-    
-    spec = importlib.util.spec_from_file_location(
-        "search_algorithms", 
-        parent_dir / "Search-algoritms" / "BFS - DFS - Uniform Cost - Greedy - A - IDA.py"
-    )
-    search_algorithms = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(search_algorithms)
+    from Strucure import TIE_BREAKS
+    import solver
+    from solver import search as search_algorithms
+    from solver.problem import EightPuzzle, SlidingPuzzle, is_solvable
+    from solver.planner import choose as choose_plan, heuristic_function, TooHard
+    from solver.profiling import PhaseProfile, ProfilerBusy, PHASES, server_timing
+    from solver.realtime import LearnedTable, choose_move
+    from solver.stats import SearchObserver, SearchStats
+    from singleflight import SingleFlight, ClientDisconnected, until_disconnected
+    import jobs
+    import solution_store
     
 except ImportError as e:
     print(f"Error importing modules: {e}")
@@ -47,6 +58,13 @@ app = FastAPI(
     version="2.0.0"
 )
 
+@app.on_event("startup")
+async def load_tables():
+    """Map the prebuilt lookup tables before the first request arrives"""
+    timings = solver.tables.preload()
+    for name, seconds in timings.items():
+        print(f"📦 Table {name} ready in {seconds * 1000:.1f} ms")
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -62,6 +80,12 @@ class SolveRequest(BaseModel):
     heuristic: str = "manhattan"
     initial: List[List[int]]
     mode: str = "steps"
+    optimal: bool = True  # only used by algorithm="auto"
+    profile: bool = False  # per-phase breakdown in metrics["profile"] and Server-Timing
+    tie_break: str = "fifo"  # equal-priority order for ucs/greedy/astar/ara: fifo, lifo, high_g, low_h
+    timeout_ms: Optional[int] = None  # deadline; "ara" returns its best answer so far, others fail
+    beam_width: Optional[int] = None  # nodes kept per layer ("beam") or in the open list ("bounded")
+    goal: Optional[List[List[int]]] = None  # target board, same shape; defaults to 1..n-1 with the blank last
 
 class StepInfo(BaseModel):
     board: List[List[int]]
@@ -76,6 +100,20 @@ class SolveResponse(BaseModel):
     steps: Optional[List[StepInfo]] = None
     metrics: Optional[Dict[str, Any]] = None
 
+class HintRequest(BaseModel):
+    initial: List[List[int]]
+    heuristic: str = "manhattan"
+    lookahead: int = 2  # search depth per move; drops to 1 where the learned table already covers it
+    goal: Optional[List[List[int]]] = None
+
+class HintResponse(BaseModel):
+    success: bool
+    message: str = ""
+    move: Optional[str] = None
+    action: Optional[str] = None
+    board: Optional[List[List[int]]] = None
+    metrics: Optional[Dict[str, Any]] = None
+
 # Algorithm mapping
 ALGORITHMS = {
     "bfs": search_algorithms.bfs,
@@ -84,21 +122,42 @@ ALGORITHMS = {
     "greedy": search_algorithms.greedy,
     "astar": search_algorithms.astar,
     "ida": search_algorithms.ida_star,
+    "ara": search_algorithms.ara_star,
+    "beam": search_algorithms.beam_search,
+    "bounded": search_algorithms.bounded_best_first,
 }
 
+# Largest board accepted (5x5 = 24-puzzle)
+MAX_CELLS = 25
+
 def matrix_to_tuple(matrix: List[List[int]]) -> tuple:
-    """Convert 3x3 matrix to flat tuple for our algorithms"""
+    """Convert board matrix to flat tuple for our algorithms"""
     return tuple(item for row in matrix for item in row)
 
-def tuple_to_matrix(state_tuple: tuple) -> List[List[int]]:
-    """Convert flat tuple back to 3x3 matrix"""
-    return [
-        [state_tuple[0], state_tuple[1], state_tuple[2]],
-        [state_tuple[3], state_tuple[4], state_tuple[5]],
-        [state_tuple[6], state_tuple[7], state_tuple[8]]
-    ]
+def tuple_to_matrix(state_tuple: tuple, width: int = 3) -> List[List[int]]:
+    """Convert flat tuple back to a matrix with rows of the given width"""
+    return [list(state_tuple[i:i + width]) for i in range(0, len(state_tuple), width)]
 
-def get_move_description(from_state: tuple, to_state: tuple) -> str:
+def parse_board(matrix: List[List[int]], goal: Optional[List[List[int]]] = None) -> SlidingPuzzle:
+    """Validate a board matrix (and optional goal board) and build its problem (raises ValueError)"""
+    width = len(matrix[0]) if matrix else 0
+    if width < 2 or len(matrix) < 2 or any(len(row) != width for row in matrix):
+        raise ValueError("Board must be a rectangular matrix of at least 2x2")
+    state = matrix_to_tuple(matrix)
+    if len(state) > MAX_CELLS:
+        raise ValueError(f"Boards larger than {MAX_CELLS} cells are not supported")
+    if set(state) != set(range(len(state))):
+        raise ValueError(f"Board must contain the numbers 0-{len(state) - 1} exactly once")
+    if goal is None:
+        return SlidingPuzzle(state, width=width)
+    if len(goal) != len(matrix) or any(len(row) != width for row in goal):
+        raise ValueError("Goal must have the same shape as the board")
+    goal_state = matrix_to_tuple(goal)
+    if set(goal_state) != set(state):
+        raise ValueError(f"Goal must contain the numbers 0-{len(state) - 1} exactly once")
+    return SlidingPuzzle(state, goal=goal_state, width=width)
+
+def get_move_description(from_state: tuple, to_state: tuple, width: int = 3) -> str:
     """Generate human-readable move description"""
     if from_state == to_state:
         return "Initial state"
@@ -108,8 +167,8 @@ def get_move_description(from_state: tuple, to_state: tuple) -> str:
     moved_number = from_state[to_empty]
     
     directions = {
-        -3: "Up",
-        3: "Down", 
+        -width: "Up",
+        width: "Down", 
         -1: "Left",
         1: "Right"
     }
@@ -122,7 +181,7 @@ def reconstruct_solution_steps(problem: EightPuzzle, result: Dict, heuristic_fun
     steps = []
     
     if not result.get('success') or not result.get('actions'):
-        initial_matrix = tuple_to_matrix(problem.initial)
+        initial_matrix = tuple_to_matrix(problem.initial, problem.width)
         steps.append(StepInfo(
             board=initial_matrix,
             move="Initial state",
@@ -135,7 +194,7 @@ def reconstruct_solution_steps(problem: EightPuzzle, result: Dict, heuristic_fun
     current_state = problem.initial
     current_cost = 0
     
-    initial_matrix = tuple_to_matrix(current_state)
+    initial_matrix = tuple_to_matrix(current_state, problem.width)
     steps.append(StepInfo(
         board=initial_matrix,
         move="Initial state", 
@@ -148,8 +207,8 @@ def reconstruct_solution_steps(problem: EightPuzzle, result: Dict, heuristic_fun
         next_state = problem.result(current_state, action)
         current_cost += problem.step_cost(current_state, action, next_state)
         
-        matrix = tuple_to_matrix(next_state)
-        move_desc = get_move_description(current_state, next_state)
+        matrix = tuple_to_matrix(next_state, problem.width)
+        move_desc = get_move_description(current_state, next_state, problem.width)
         
         steps.append(StepInfo(
             board=matrix,
@@ -169,324 +228,658 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy", "timestamp": time.time()}
+    return {"status": "healthy", "timestamp": time.time(), "solves_in_flight": solve_flight.in_flight()}
 
 @app.get("/algorithms")
 async def get_algorithms():
     """Get available algorithms and heuristics"""
     return {
-        "algorithms": list(ALGORITHMS.keys()),
-        "heuristics": list(HEURISTICS.keys())
+        "algorithms": list(ALGORITHMS.keys()) + ["auto"],
+        "heuristics": list(HEURISTICS.keys()),
+        "tie_breaks": list(TIE_BREAKS)
     }
 
-@app.post("/api/solve", response_model=SolveResponse)
-async def solve_puzzle(request: SolveRequest):
-    """Solve the 8-puzzle with specified algorithm and heuristic"""
-    
-    if request.algorithm not in ALGORITHMS:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unknown algorithm: {request.algorithm}. Available: {list(ALGORITHMS.keys())}"
-        )
-    
-    if request.algorithm in ["greedy", "astar", "ida"] and request.heuristic not in HEURISTICS:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Unknown heuristic: {request.heuristic}. Available: {list(HEURISTICS.keys())}"
-        )
-    
-    try:
-        initial_tuple = matrix_to_tuple(request.initial)
-        if len(initial_tuple) != 9 or set(initial_tuple) != set(range(9)):
-            raise ValueError("Invalid state")
-    except Exception:
-        raise HTTPException(
-            status_code=400,
-            detail="Initial state must be a 3x3 matrix with numbers 0-8 exactly once"
-        )
-    
-    problem = EightPuzzle(initial_tuple)
-    algorithm_func = ALGORITHMS[request.algorithm]
+INFORMED_ALGORITHMS = ("greedy", "astar", "ida", "ara", "beam", "bounded")
+# Algorithms driven by a priority queue, which accept a tie_break policy
+PRIORITY_ALGORITHMS = ("ucs", "greedy", "astar", "ara", "bounded")
+# Approximate solvers with a width parameter, and its accepted range
+WIDTH_ALGORITHMS = ("beam", "bounded")
+MAX_BEAM_WIDTH = 10000
+
+# Anytime search budget when the request gives no timeout_ms
+ARA_DEFAULT_TIMEOUT_MS = 1000
+
+# Per-run counters copied from the search result into metrics["stats"]
+SEARCH_STATS = ("expanded", "generated", "duplicates", "reopened", "pruned", "max_frontier", "max_closed", "ebf",
+                "peak_memory", "bytes_per_node")
+
+# Per-solve memory cap (estimated frontier + closed set size); 0 disables it.
+# Searches that would exceed it stop with status "memory_limit" instead of
+# getting the worker OOM-killed.
+SOLVE_MEMORY_LIMIT = int(float(os.environ.get("SOLVE_MEMORY_LIMIT_MB", "256")) * 1024 * 1024) or None
+
+# Identical concurrent solves share one running search
+solve_flight = SingleFlight()
+
+def solve_key(request: SolveRequest, problem: SlidingPuzzle) -> tuple:
+    """Everything that determines the answer of a solve request"""
+    heuristic = request.heuristic if request.algorithm in INFORMED_ALGORITHMS else None
+    optimal = request.optimal if request.algorithm == "auto" else None
+    tie_break = request.tie_break if request.algorithm in PRIORITY_ALGORITHMS + ("auto",) else None
+    beam_width = request.beam_width if request.algorithm in WIDTH_ALGORITHMS + ("auto",) else None
+    return (problem.initial, problem.goal, problem.width, request.algorithm, heuristic, optimal, tie_break,
+            request.timeout_ms, beam_width, request.mode, request.profile)
+
+# Solutions persisted across restarts and shared by all workers (see
+# solution_store.py); "" disables it. Anytime "ara" answers depend on the
+# clock and are never stored.
+SOLUTION_STORE_PATH = os.environ.get("SOLUTION_STORE_PATH", os.path.join(solver.tables.DATA_DIR, "solutions.sqlite"))
+_solution_store: Optional[solution_store.SolutionStore] = None
+_solution_store_lock = threading.Lock()
+
+def get_solution_store() -> Optional[solution_store.SolutionStore]:
+    """Open the solution store on first use (None when disabled)"""
+    global _solution_store
+    if not SOLUTION_STORE_PATH:
+        return None
+    with _solution_store_lock:
+        if _solution_store is None:
+            os.makedirs(os.path.dirname(os.path.abspath(SOLUTION_STORE_PATH)), exist_ok=True)
+            _solution_store = solution_store.SolutionStore(SOLUTION_STORE_PATH)
+        return _solution_store
+
+def stored_solution_key(request: SolveRequest, problem: SlidingPuzzle) -> Optional[solution_store.Key]:
+    """Store key of a request (None if its answer depends on the clock)"""
+    if request.algorithm == "ara":
+        return None
+    initial, goal, width, algorithm, heuristic, optimal, tie_break, _, beam_width, _, _ = solve_key(request, problem)
+    return solution_store.solution_key(initial, goal, width, algorithm, heuristic, optimal, tie_break, beam_width)
+
+def stored_response(problem: SlidingPuzzle, moves: str, metrics: Dict[str, Any],
+                    start_time: float) -> SolveResponse:
+    """Rebuild the response of a stored solution"""
+    heuristic_func = heuristic_function(metrics["heuristic"], problem) if metrics.get("heuristic") else None
+    result = {'success': True, 'actions': solution_store.decode_moves(moves)}
+    steps = reconstruct_solution_steps(problem, result, heuristic_func)
+    return SolveResponse(
+        success=True,
+        message="Solution found successfully",
+        steps=steps,
+        metrics=dict(metrics, time=(time.perf_counter() - start_time) * 1000, stored=True)
+    )
+
+class Deadline:
+    """Cancellation flag that also trips once ``seconds`` have elapsed"""
+    def __init__(self, cancel, seconds: float):
+        self.cancel = cancel
+        self.expires = time.perf_counter() + seconds
+
+    def is_set(self) -> bool:
+        return self.cancel.is_set() or time.perf_counter() >= self.expires
+
+def too_hard_message(error: TooHard) -> str:
+    return (f"{error.size} board with Manhattan estimate {error.estimate} > {error.limit} is too hard for an "
+            "interactive optimal solve; use optimal=false or POST /api/jobs")
+
+def run_solve(request: SolveRequest, problem: SlidingPuzzle, cancel,
+              on_solution=None, observer=None, limit: bool = True,
+              memory_limit: Optional[int] = SOLVE_MEMORY_LIMIT,
+              profile_wait: bool = False) -> Tuple[SolveResponse, Dict[str, float]]:
+    """Run the search synchronously (in a worker thread) and build the response.
+
+    Also returns the seconds spent per phase, for the Server-Timing header.
+    ``on_solution`` receives every improved answer of the anytime search;
+    ``observer`` is an optional SearchObserver passed to the engine.
+    ``limit=False`` lets "auto" attempt optimal solves past the interactive
+    difficulty limit (background jobs), which also pass their own
+    ``memory_limit`` in bytes (None disables it).
+
+    Only one profiled solve runs per process (cProfile allows one active
+    profiler): another ``profile`` request raises ProfilerBusy unless
+    ``profile_wait`` lets it wait its turn.
+    """
+    timings: Dict[str, float] = {}
+    store = get_solution_store()
+    store_key = stored_solution_key(request, problem) if store is not None else None
+    if store_key is not None and not request.profile:
+        lookup_start = time.perf_counter()
+        try:
+            stored = store.get(store_key)
+        except sqlite3.Error as e:
+            print(f"⚠️ Solution store read failed: {e}")
+            stored = None
+        if stored is not None:
+            response = stored_response(problem, *stored, lookup_start)
+            timings["store"] = time.perf_counter() - lookup_start
+            return response, timings
+    
+    algorithm, heuristic, plan = request.algorithm, request.heuristic, None
+    if algorithm == "auto":
+        try:
+            plan = choose_plan(problem, optimal=request.optimal, limit=limit)
+        except TooHard as e:
+            return SolveResponse(success=False, message=too_hard_message(e)), timings
+        algorithm, heuristic = plan.algorithm, plan.heuristic
+    algorithm_func = ALGORITHMS[algorithm]
     
     heuristic_func = None
-    if request.algorithm in ["greedy", "astar", "ida"]:
-        heuristic_func = lambda state: HEURISTICS[request.heuristic](state, GOAL)
+    if algorithm in INFORMED_ALGORITHMS:
+        heuristic_func = heuristic_function(heuristic, problem)
     
+    prof = PhaseProfile(blocking=profile_wait) if request.profile else None
     start_time = time.time()
     
     try:
-        if heuristic_func:
-            result = algorithm_func(problem, heuristic_func)
-        else:
-            result = algorithm_func(problem)
+        with prof or nullcontext():
+            # "estimate" mode: tracemalloc is process-wide and solves run in threads
+            limits = {"memory": "estimate", "memory_limit": memory_limit}
+            if observer is not None:
+                limits["observer"] = observer
+            if algorithm in PRIORITY_ALGORITHMS:
+                limits["tie_break"] = request.tie_break
+            if algorithm == "ara":
+                limits["deadline"] = (request.timeout_ms or ARA_DEFAULT_TIMEOUT_MS) / 1000
+                limits["on_solution"] = on_solution
+            elif request.timeout_ms is not None:
+                cancel = Deadline(cancel, request.timeout_ms / 1000)
+            if algorithm in WIDTH_ALGORITHMS and request.beam_width is not None:
+                limits["width"] = request.beam_width
+            if heuristic_func:
+                result = algorithm_func(problem, heuristic_func, cancel=cancel, **limits)
+            else:
+                result = algorithm_func(problem, cancel=cancel, **limits)
         
         end_time = time.time()
         execution_time = (end_time - start_time) * 1000
+        if prof is not None:
+            phases = prof.phases()
+            timings.update({phase: phases[phase] for phase in PHASES})
+        timings["solve"] = end_time - start_time
         
         if not result.get('success'):
+            messages = {
+                search_algorithms.CANCELLED: 'Search cancelled',
+                search_algorithms.MEMORY_LIMIT: f"Search stopped: memory limit of {(memory_limit or 0) // (1024 * 1024)} MB exceeded",
+                search_algorithms.DEADLINE: f"No solution found within {request.timeout_ms or ARA_DEFAULT_TIMEOUT_MS} ms",
+            }
+            status = result.get('status')
+            if status == search_algorithms.CANCELLED and isinstance(cancel, Deadline) and not cancel.cancel.is_set():
+                status = search_algorithms.DEADLINE  # our timeout, not the client leaving
+            message = messages.get(status, 'No solution found')
             return SolveResponse(
                 success=False,
-                message=result.get('message', 'No solution found'),
+                message=result.get('message', message),
                 steps=None,
                 metrics=None
-            )
+            ), timings
         
+        steps_start = time.perf_counter()
         steps = reconstruct_solution_steps(problem, result, heuristic_func)
+        timings["steps"] = time.perf_counter() - steps_start
         
         metrics = {
             "moves": result.get('depth', 0),
             "time": execution_time,
-            "nodes_explored": result.get('nodes_explored', 0),
+            "nodes_explored": result.get('expanded', 0),
             "cost": result.get('cost', 0),
-            "algorithm": request.algorithm,
-            "heuristic": request.heuristic if heuristic_func else None
+            "algorithm": algorithm,
+            "heuristic": heuristic if heuristic_func else None,
+            "tie_break": request.tie_break if algorithm in PRIORITY_ALGORITHMS else None
         }
+        metrics["stats"] = {key: result.get(key) for key in SEARCH_STATS}
+        if plan is not None:
+            metrics["auto"] = {"estimate": plan.estimate, "exact": plan.exact, "reason": plan.reason}
+        if prof is not None:
+            metrics["profile"] = {phase: phases[phase] * 1000 for phase in PHASES}
+        if store_key is not None:
+            try:
+                store.put(store_key, solution_store.encode_moves(result['actions']),
+                          {k: v for k, v in metrics.items() if k not in ("time", "profile")})
+            except sqlite3.Error as e:
+                print(f"⚠️ Solution store write failed: {e}")
+        if 'solutions' in result:
+            # Anytime search: cost <= bound * optimal; intermediate answers in order
+            metrics["anytime"] = {
+                "bound": result['bound'],
+                "weight": result['weight'],
+                "interrupted": result.get('interrupted'),
+                "solutions": [dict(s, time=s['time'] * 1000) for s in result['solutions']],
+            }
         
         return SolveResponse(
             success=True,
             message="Solution found successfully",
             steps=steps,
             metrics=metrics
-        )
+        ), timings
         
+    except ProfilerBusy:
+        raise
     except Exception as e:
         return SolveResponse(
             success=False,
             message=f"Error during solving: {str(e)}",
             steps=None,
             metrics=None
-        )
-
-if __name__ == "__main__":
-    import uvicorn
-    port = int(os.environ.get("PORT", 8000))
-    host = os.environ.get("HOST", "0.0.0.0")
-    
-    print(f"🚀 Starting 8-Puzzle API Server on {host}:{port}")
-    print(f"📚 API Documentation: http://{host}:{port}/docs")
-    
-    uvicorn.run(app, host=host, port=port)
-
-# Request/Response models
-class SolveRequest(BaseModel):
-    algorithm: str
-    heuristic: str = "manhattan"
-    initial: List[List[int]]
-    mode: str = "steps"
-
-class StepInfo(BaseModel):
-    board: List[List[int]]
-    move: str
-    heuristic: Optional[float] = None
-    depth: int = 0
-    cost: float = 0
-
-class SolveResponse(BaseModel):
-    success: bool
-    message: str = ""
-    steps: Optional[List[StepInfo]] = None
-    metrics: Optional[Dict[str, Any]] = None
-
-# Algorithm mapping
-ALGORITHMS = {
-    "bfs": search_algorithms.bfs,
-    "dfs": search_algorithms.dfs,
-    "ucs": search_algorithms.ucs,
-    "greedy": search_algorithms.greedy,
-    "astar": search_algorithms.astar,
-    "ida": search_algorithms.ida_star,
-}
-
-def matrix_to_tuple(matrix: List[List[int]]) -> tuple:
-    """Convert 3x3 matrix to flat tuple for our algorithms"""
-    return tuple(item for row in matrix for item in row)
-
-def tuple_to_matrix(state_tuple: tuple) -> List[List[int]]:
-    """Convert flat tuple back to 3x3 matrix"""
-    return [
-        [state_tuple[0], state_tuple[1], state_tuple[2]],
-        [state_tuple[3], state_tuple[4], state_tuple[5]],
-        [state_tuple[6], state_tuple[7], state_tuple[8]]
-    ]
-
-def get_move_description(from_state: tuple, to_state: tuple) -> str:
-    """Generate human-readable move description"""
-    if from_state == to_state:
-        return "Initial state"
-    
-    # Find the empty position (0) in both states
-    from_empty = from_state.index(0)
-    to_empty = to_state.index(0)
-    
-    # Find what number moved into the empty position
-    moved_number = from_state[to_empty]
-    
-    # Determine direction
-    directions = {
-        -3: "Up",
-        3: "Down", 
-        -1: "Left",
-        1: "Right"
-    }
-    
-    direction = directions.get(to_empty - from_empty, "Unknown")
-    return f"Move {moved_number} {direction}"
-
-def reconstruct_solution_steps(problem: EightPuzzle, result: Dict, heuristic_func) -> List[StepInfo]:
-    """Reconstruct step-by-step solution from search result"""
-    steps = []
-    
-    if not result.get('success') or not result.get('actions'):
-        # No solution found, return just initial state
-        initial_matrix = tuple_to_matrix(problem.initial)
-        steps.append(StepInfo(
-            board=initial_matrix,
-            move="Initial state",
-            heuristic=heuristic_func(problem.initial) if heuristic_func else None,
-            depth=0,
-            cost=0
-        ))
-        return steps
-    
-    # Reconstruct path from actions
-    current_state = problem.initial
-    current_cost = 0
-    
-    # Add initial state
-    initial_matrix = tuple_to_matrix(current_state)
-    steps.append(StepInfo(
-        board=initial_matrix,
-        move="Initial state", 
-        heuristic=heuristic_func(current_state) if heuristic_func else None,
-        depth=0,
-        cost=current_cost
-    ))
-    
-    # Apply each action
-    for i, action in enumerate(result['actions']):
-        next_state = problem.result(current_state, action)
-        current_cost += problem.step_cost(current_state, action, next_state)
-        
-        matrix = tuple_to_matrix(next_state)
-        move_desc = get_move_description(current_state, next_state)
-        
-        steps.append(StepInfo(
-            board=matrix,
-            move=move_desc,
-            heuristic=heuristic_func(next_state) if heuristic_func else None,
-            depth=i + 1,
-            cost=current_cost
-        ))
-        
-        current_state = next_state
-    
-    return steps
-
-@app.get("/")
-async def root():
-    return {"message": "8-Puzzle Solver API", "version": "2.0.0"}
+        ), timings
 
-@app.get("/algorithms")
-async def get_algorithms():
-    """Get available algorithms and heuristics"""
-    return {
-        "algorithms": list(ALGORITHMS.keys()),
-        "heuristics": list(HEURISTICS.keys())
-    }
+def validate_request(request: SolveRequest, limit: bool = True) -> SlidingPuzzle:
+    """Check algorithm, heuristic and board; raises HTTPException(400)
 
-@app.post("/api/solve", response_model=SolveResponse)
-async def solve_puzzle(request: SolveRequest):
-    """Solve the 8-puzzle with specified algorithm and heuristic"""
-    
-    # Validate algorithm
-    if request.algorithm not in ALGORITHMS:
+    With ``limit``, "auto" optimal requests estimated too hard are rejected here,
+    before any search (background jobs pass ``limit=False``).
+    """
+    if request.algorithm not in ALGORITHMS and request.algorithm != "auto":
         raise HTTPException(
             status_code=400, 
-            detail=f"Unknown algorithm: {request.algorithm}. Available: {list(ALGORITHMS.keys())}"
+            detail=f"Unknown algorithm: {request.algorithm}. Available: {list(ALGORITHMS.keys()) + ['auto']}"
         )
     
-    # Validate heuristic for informed algorithms
-    if request.algorithm in ["greedy", "astar", "ida"] and request.heuristic not in HEURISTICS:
+    if request.algorithm in INFORMED_ALGORITHMS and request.heuristic not in HEURISTICS:
         raise HTTPException(
             status_code=400,
             detail=f"Unknown heuristic: {request.heuristic}. Available: {list(HEURISTICS.keys())}"
         )
     
-    # Validate initial state
-    try:
-        initial_tuple = matrix_to_tuple(request.initial)
-        if len(initial_tuple) != 9 or set(initial_tuple) != set(range(9)):
-            raise ValueError("Invalid state")
-    except Exception:
+    if request.tie_break not in TIE_BREAKS:
         raise HTTPException(
             status_code=400,
-            detail="Initial state must be a 3x3 matrix with numbers 0-8 exactly once"
+            detail=f"Unknown tie_break: {request.tie_break}. Available: {list(TIE_BREAKS)}"
         )
     
-    # Create problem instance
-    problem = EightPuzzle(initial_tuple)
+    if request.timeout_ms is not None and request.timeout_ms <= 0:
+        raise HTTPException(status_code=400, detail="timeout_ms must be positive")
     
-    # Get algorithm function
-    algorithm_func = ALGORITHMS[request.algorithm]
+    if request.beam_width is not None and not 1 <= request.beam_width <= MAX_BEAM_WIDTH:
+        raise HTTPException(status_code=400, detail=f"beam_width must be between 1 and {MAX_BEAM_WIDTH}")
     
-    # Prepare heuristic function for informed algorithms
-    heuristic_func = None
-    if request.algorithm in ["greedy", "astar", "ida"]:
-        heuristic_func = lambda state: HEURISTICS[request.heuristic](state, GOAL)
+    try:
+        problem = parse_board(request.initial, request.goal)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    # Measure execution time
-    start_time = time.time()
+    # Parity check: unsolvable boards would otherwise exhaust half the state space
+    if not is_solvable(problem.initial, problem.width, problem.goal):
+        raise HTTPException(
+            status_code=400,
+            detail="Board is not solvable: its inversion parity cannot reach the goal"
+        )
+    
+    if request.algorithm == "auto" and limit:
+        try:
+            choose_plan(problem, optimal=request.optimal)
+        except TooHard as e:
+            raise HTTPException(status_code=400, detail=too_hard_message(e))
+    return problem
+
+@app.post("/api/solve", response_model=SolveResponse)
+async def solve_puzzle(request: SolveRequest, http_request: Request, response: Response):
+    """Solve the 8-puzzle with specified algorithm and heuristic"""
+    request_start = time.perf_counter()
+    problem = validate_request(request)
     
+    key = solve_key(request, problem)
     try:
-        # Call the algorithm
-        if heuristic_func:
-            result = algorithm_func(problem, heuristic_func)
-        else:
-            result = algorithm_func(problem)
-        
-        end_time = time.time()
-        execution_time = (end_time - start_time) * 1000  # Convert to milliseconds
-        
-        # Check if solution was found
-        if not result.get('success'):
-            return SolveResponse(
-                success=False,
-                message=result.get('message', 'No solution found'),
-                steps=None,
-                metrics=None
+        result, timings = await until_disconnected(
+            http_request,
+            solve_flight.do(key, lambda cancel: run_solve(request, problem, cancel))
+        )
+        timings = dict(timings, total=time.perf_counter() - request_start)
+        response.headers["Server-Timing"] = server_timing(timings)
+        return result
+    except ProfilerBusy:
+        raise HTTPException(status_code=429, detail="Another profiled solve is running; retry shortly",
+                            headers={"Retry-After": "1"})
+    except ClientDisconnected:
+        # Nobody is listening any more; 499 is the conventional "client closed request"
+        return Response(status_code=499)
+
+# GET /api/solve/{board}: the same solve as POST, but cacheable by browsers and
+# proxies. Solutions are a deterministic function of the request, so the ETag is
+# derived from solve_key (plus RESPONSE_VERSION and the content coding) and a matching
+# If-None-Match is answered with 304 before any search runs. Wall-clock fields
+# (and whether the solution came from the store) are left out of the body so
+# that equal ETags always mean equal bytes.
+# Part of every ETag: bump RESPONSE_VERSION whenever solver output or the
+# response schema can change, or caches keep revalidating stale bodies with
+# 304. SOURCE_REVISION (the git commit, set at build time; Render provides
+# RENDER_GIT_COMMIT) also changes the tags on every deploy.
+RESPONSE_VERSION = 1
+SOURCE_REVISION = os.environ.get("SOURCE_REVISION", os.environ.get("RENDER_GIT_COMMIT", ""))
+SOLVE_CACHE_CONTROL = f"public, max-age={int(os.environ.get('SOLVE_CACHE_MAX_AGE', '86400'))}"
+SOLVE_CACHE_ENTRIES = int(os.environ.get("SOLVE_CACHE_ENTRIES", "1024"))
+COMPRESS_MIN_BYTES = 1024  # smaller bodies are sent uncompressed
+CACHEABLE_CODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# (solve_key, negotiated coding) -> (body, applied coding); only touched from the event loop
+solve_cache: "OrderedDict[tuple, Tuple[bytes, Optional[str]]]" = OrderedDict()
+
+def decode_board(encoded: str) -> List[List[int]]:
+    """Board matrix from its URL form: rows separated by "_", tiles by "-"
+    ("1-2-3_4-5-6_7-0-8"); a row without "-" has one hex digit per tile ("123_456_708")
+    """
+    rows = []
+    for row in encoded.split("_"):
+        try:
+            rows.append([int(t) for t in row.split("-")] if "-" in row else [int(c, 16) for c in row])
+        except ValueError:
+            raise ValueError(f"Invalid board row {row!r}: use tiles separated by '-' or hex digits")
+    return rows
+
+def negotiate_coding(accept_encoding: str) -> Optional[str]:
+    """Preferred compression the client accepts (None = identity)"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.strip())
+    for coding in CACHEABLE_CODINGS:
+        if coding in accepted or "*" in accepted:
+            return coding
+    return None
+
+def solution_etag(key: tuple, coding: Optional[str]) -> str:
+    """Strong ETag of a solve response; each content coding is its own representation"""
+    digest = hashlib.sha256(repr((RESPONSE_VERSION, SOURCE_REVISION, key)).encode()).hexdigest()[:32]
+    return f'"{digest}-{coding}"' if coding else f'"{digest}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses weak comparison (RFC 9110 13.1.2)"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+def encode_body(payload: Dict[str, Any], coding: Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """JSON body compressed with `coding` when large enough; returns (body, coding applied)"""
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    if coding is None or len(body) < COMPRESS_MIN_BYTES:
+        return body, None
+    if coding == "br":
+        return brotli.compress(body, quality=5), coding
+    # mtime=0: same bytes on every run, as the strong ETag promises
+    return gzip.compress(body, compresslevel=6, mtime=0), coding
+
+@app.get("/api/solve/{encoded}", response_model=SolveResponse)
+async def solve_cacheable(encoded: str, http_request: Request, algorithm: str = "astar",
+                          heuristic: str = "manhattan", goal: Optional[str] = None, mode: str = "steps",
+                          optimal: bool = True, tie_break: str = "fifo", beam_width: Optional[int] = None):
+    """Cacheable solve: /api/solve/1-2-3_4-5-6_7-0-8?algorithm=astar&heuristic=manhattan"""
+    request_start = time.perf_counter()
+    if algorithm == "ara":
+        raise HTTPException(status_code=400, detail="ara depends on wall-clock time; use POST /api/solve")
+    try:
+        request = SolveRequest(algorithm=algorithm, heuristic=heuristic, initial=decode_board(encoded),
+                               goal=decode_board(goal) if goal else None, mode=mode, optimal=optimal,
+                               tie_break=tie_break, beam_width=beam_width)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    problem = validate_request(request)
+
+    key = solve_key(request, problem)
+    coding = negotiate_coding(http_request.headers.get("accept-encoding", ""))
+    headers = {"ETag": solution_etag(key, coding), "Cache-Control": SOLVE_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if etag_matches(http_request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=304, headers=headers)
+
+    cached = solve_cache.get((key, coding))
+    if cached is not None:
+        body, applied = cached
+        solve_cache.move_to_end((key, coding))
+        timings = {}
+    else:
+        try:
+            result, timings = await until_disconnected(
+                http_request,
+                solve_flight.do(key, lambda cancel: run_solve(request, problem, cancel))
             )
-        
-        # Generate steps
-        steps = reconstruct_solution_steps(problem, result, heuristic_func)
-        
-        # Prepare metrics
-        metrics = {
-            "moves": result.get('depth', 0),
-            "time": execution_time,
-            "nodes_explored": result.get('nodes_explored', 0),
-            "cost": result.get('cost', 0),
-            "algorithm": request.algorithm,
-            "heuristic": request.heuristic if heuristic_func else None
+        except ClientDisconnected:
+            return Response(status_code=499)
+        payload = result.model_dump()
+        if payload["metrics"]:
+            payload["metrics"] = {k: v for k, v in payload["metrics"].items() if k not in ("time", "stored")}
+        body, applied = encode_body(payload, coding)
+        if result.success:
+            solve_cache[(key, coding)] = (body, applied)
+            while len(solve_cache) > SOLVE_CACHE_ENTRIES:
+                solve_cache.popitem(last=False)
+        else:
+            # Failures (memory limit, errors) may not repeat: never cache them
+            headers = {"Cache-Control": "no-store", "Vary": "Accept-Encoding"}
+    if applied is not None:
+        headers["Content-Encoding"] = applied
+    headers["Server-Timing"] = server_timing(dict(timings, total=time.perf_counter() - request_start))
+    return Response(content=body, media_type="application/json", headers=headers)
+
+@app.post("/api/solve/stream")
+async def solve_stream(request: SolveRequest):
+    """Solve and stream NDJSON: one {"type": "solution"} line per improved
+    anytime answer (algorithm "ara"), then a {"type": "result"} line with the
+    full response. Other algorithms only produce the final line.
+    """
+    problem = validate_request(request)
+    loop = asyncio.get_running_loop()
+    updates: asyncio.Queue = asyncio.Queue()
+    cancel = threading.Event()
+
+    def on_solution(solution):
+        loop.call_soon_threadsafe(updates.put_nowait, solution)
+
+    async def lines():
+        # Not coalesced: every stream follows its own search
+        task = loop.run_in_executor(None, run_solve, request, problem, cancel, on_solution)
+        try:
+            while True:
+                getter = asyncio.ensure_future(updates.get())
+                done, _ = await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter in done:
+                    solution = getter.result()
+                    yield json.dumps(dict(solution, type="solution", time=solution["time"] * 1000)) + "\n"
+                    continue
+                getter.cancel()
+                while not updates.empty():
+                    solution = updates.get_nowait()
+                    yield json.dumps(dict(solution, type="solution", time=solution["time"] * 1000)) + "\n"
+                try:
+                    result, _ = task.result()
+                except ProfilerBusy:
+                    result = SolveResponse(success=False, message="Another profiled solve is running; retry shortly")
+                yield json.dumps({"type": "result", **result.model_dump()}) + "\n"
+                return
+        finally:
+            # Client went away (or we are done): stop the search
+            cancel.set()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+# Jobs: long solves that outlive any HTTP timeout. POST /api/jobs queues the
+# request in a SQLite file (see jobs.py) and returns its id; local worker threads
+# run jobs by priority under an optional deadline, and GET /api/jobs/{id} reports
+# status, progress and finally the same body POST /api/solve would have returned.
+JOB_DB_PATH = os.environ.get("JOB_DB_PATH", os.path.join(solver.tables.DATA_DIR, "jobs.sqlite"))
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "1"))
+JOB_RESULTS_MAX_BYTES = int(float(os.environ.get("JOB_RESULTS_MAX_MB", "64")) * 1024 * 1024)
+# Jobs exist for searches too big for a request, so they get their own cap; 0 disables it
+JOB_MEMORY_LIMIT = int(float(os.environ.get("JOB_MEMORY_LIMIT_MB", "2048")) * 1024 * 1024) or None
+JOB_PROGRESS_SECONDS = 1.0
+job_queue: Optional[jobs.JobQueue] = None
+
+class JobRequest(SolveRequest):
+    priority: int = 0                   # higher runs first
+    deadline_ms: Optional[int] = None   # from submission; queued or running jobs past it expire
+
+class JobResponse(BaseModel):
+    id: str
+    status: str  # queued, running, done, failed, cancelled, expired
+    priority: int = 0
+    position: Optional[int] = None  # jobs ahead of this one while queued
+    progress: Optional[Dict[str, Any]] = None
+    message: str = ""
+    created: Optional[float] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[SolveResponse] = None
+
+class JobProgress(SearchObserver):
+    """Reports expansions to the job store about once a second"""
+    def __init__(self, report):
+        self.report = report
+        self.expanded = 0
+        self.generated = 0
+        self.start = time.perf_counter()
+        self.last = self.start
+
+    def on_generate(self, node):
+        self.generated += 1
+
+    def on_expand(self, node):
+        self.expanded += 1
+        if self.expanded & 1023 == 0:
+            now = time.perf_counter()
+            if now - self.last >= JOB_PROGRESS_SECONDS:
+                self.last = now
+                self.report({"expanded": self.expanded, "generated": self.generated,
+                             "elapsed_ms": (now - self.start) * 1000})
+
+def run_job(job: Dict[str, Any], cancel: jobs.JobCancel, progress) -> Tuple[str, Optional[Dict[str, Any]], str]:
+    """Run one queued job (in a job worker thread)"""
+    request = SolveRequest(**job["request"])
+    problem = parse_board(request.initial, request.goal)
+    progress({"expanded": 0, "generated": 0, "elapsed_ms": 0})
+    result, _ = run_solve(request, problem, cancel, observer=JobProgress(progress),
+                          limit=False, memory_limit=JOB_MEMORY_LIMIT, profile_wait=True)
+    if result.success:
+        return jobs.DONE, result.model_dump(), result.message
+    return (jobs.CANCELLED if cancel.cancelled else jobs.FAILED), result.model_dump(), result.message
+
+@app.on_event("startup")
+async def start_jobs():
+    global job_queue
+    os.makedirs(os.path.dirname(os.path.abspath(JOB_DB_PATH)), exist_ok=True)
+    store = jobs.JobStore(JOB_DB_PATH, max_result_bytes=JOB_RESULTS_MAX_BYTES)
+    job_queue = jobs.JobQueue(store, run_job, workers=JOB_WORKERS)
+    job_queue.start()
+
+@app.on_event("shutdown")
+async def stop_jobs():
+    if job_queue is not None:
+        stopped = await asyncio.get_running_loop().run_in_executor(None, job_queue.stop)
+        if stopped:
+            job_queue.store.close()
+        # else a worker still running would write to a closed store; the process
+        # exit closes it, and the job is claimed again once its lease expires
+
+def job_response(job: Dict[str, Any]) -> JobResponse:
+    return JobResponse(
+        id=job["id"], status=job["status"], priority=job["priority"],
+        position=job_queue.store.position(job["id"]) if job["status"] == jobs.QUEUED else None,
+        progress=job["progress"], message=job["message"] or "", created=job["created"],
+        started=job["started"], finished=job["finished"], result=job["result"],
+    )
+
+@app.post("/api/jobs", response_model=JobResponse, status_code=202)
+async def submit_job(request: JobRequest, response: Response):
+    """Queue a solve and return its id immediately"""
+    problem = validate_request(request, limit=False)
+    if request.deadline_ms is not None and request.deadline_ms <= 0:
+        raise HTTPException(status_code=400, detail="deadline_ms must be positive")
+    deadline = time.time() + request.deadline_ms / 1000 if request.deadline_ms is not None else None
+    solve = SolveRequest(**request.model_dump(exclude={"priority", "deadline_ms"}))
+    loop = asyncio.get_running_loop()
+    job_id = await loop.run_in_executor(None, job_queue.submit, solve.model_dump(), request.priority, deadline)
+    response.headers["Location"] = f"/api/jobs/{job_id}"
+    return job_response(await loop.run_in_executor(None, job_queue.store.get, job_id))
+
+@app.get("/api/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    """Status, progress and (once done) the result of a job"""
+    job = await asyncio.get_running_loop().run_in_executor(None, job_queue.store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job (or its result was evicted)")
+    return job_response(job)
+
+@app.delete("/api/jobs/{job_id}", response_model=JobResponse)
+async def cancel_job(job_id: str):
+    """Cancel a queued or running job"""
+    store = job_queue.store
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, store.cancel, job_id)
+    job = await loop.run_in_executor(None, store.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job (or its result was evicted)")
+    return job_response(job)
+
+# Hints use LRTA*: a bounded lookahead per move plus a table of learned h values
+# shared by every request and kept on disk, so repeated traffic on similar
+# boards converges toward optimal moves with less search each time.
+MAX_HINT_LOOKAHEAD = 6
+HINT_TABLE_PATH = os.environ.get("HINT_TABLE_PATH", os.path.join(solver.tables.DATA_DIR, "learned_h.sqlite"))
+HINT_TABLE_ROWS = int(os.environ.get("HINT_TABLE_ROWS", "1000000"))
+_hint_table: Optional[LearnedTable] = None
+_hint_table_lock = threading.Lock()
+
+def hint_table() -> LearnedTable:
+    """Open the learned heuristic table on first use"""
+    global _hint_table
+    with _hint_table_lock:
+        if _hint_table is None:
+            os.makedirs(os.path.dirname(os.path.abspath(HINT_TABLE_PATH)), exist_ok=True)
+            _hint_table = LearnedTable(HINT_TABLE_PATH, db_capacity=HINT_TABLE_ROWS)
+        return _hint_table
+
+def run_hint(request: HintRequest, problem: SlidingPuzzle) -> HintResponse:
+    """Pick one move (in a worker thread) and persist what was learned"""
+    start_time = time.perf_counter()
+    table = hint_table()
+    stats = SearchStats()
+    h = heuristic_function(request.heuristic, problem)
+    action, next_state, info = choose_move(problem, problem.initial, h, table, request.lookahead, stats=stats)
+    table.flush()
+    return HintResponse(
+        success=True,
+        message="Hint found",
+        move=get_move_description(problem.initial, next_state, problem.width),
+        action=action,
+        board=tuple_to_matrix(next_state, problem.width),
+        metrics={
+            **info,
+            "heuristic": request.heuristic,
+            "expanded": stats.expanded,
+            "generated": stats.generated,
+            "time": (time.perf_counter() - start_time) * 1000,
         }
-        
-        return SolveResponse(
-            success=True,
-            message="Solution found successfully",
-            steps=steps,
-            metrics=metrics
+    )
+
+@app.post("/api/hint", response_model=HintResponse)
+async def hint(request: HintRequest):
+    """Suggest the next move with bounded per-move work (real-time search)"""
+    if request.heuristic not in HEURISTICS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown heuristic: {request.heuristic}. Available: {list(HEURISTICS.keys())}"
         )
-        
-    except Exception as e:
-        return SolveResponse(
-            success=False,
-            message=f"Error during solving: {str(e)}",
-            steps=None,
-            metrics=None
+    if not 1 <= request.lookahead <= MAX_HINT_LOOKAHEAD:
+        raise HTTPException(status_code=400, detail=f"lookahead must be between 1 and {MAX_HINT_LOOKAHEAD}")
+    try:
+        problem = parse_board(request.initial, request.goal)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not is_solvable(problem.initial, problem.width, problem.goal):
+        raise HTTPException(
+            status_code=400,
+            detail="Board is not solvable: its inversion parity cannot reach the goal"
         )
+    if problem.is_goal(problem.initial):
+        return HintResponse(success=False, message="Board is already solved")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, run_hint, request, problem)
 
 if __name__ == "__main__":
     import uvicorn
-    print("Starting 8-Puzzle Solver API...")
-    print("Available at: http://localhost:8000")
-    print("Docs at: http://localhost:8000/docs")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    port = int(os.environ.get("PORT", 8000))
+    host = os.environ.get("HOST", "0.0.0.0")
+    
+    print(f"🚀 Starting 8-Puzzle API Server on {host}:{port}")
+    print(f"📚 API Documentation: http://{host}:{port}/docs")
+    
+    uvicorn.run(app, host=host, port=port)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Bulk tools for the persistent solution store (solution_store.py).
+
+``solve`` runs the API's own solve path over a board corpus and writes one
+JSON line per solution (the batch solver output); ``load`` validates such
+lines and inserts them in large transactions, so a fresh deployment starts
+with every known board answered without search.
+
+Usage:
+    (cd .. && python -m solver.generator build --width 3 --per-stratum 200 -o corpus_3x3.bin)
+    python preload.py solve ../corpus_3x3.bin --algorithm astar --heuristic manhattan -o astar.jsonl
+    python preload.py load astar.jsonl [--db ../solver/data/solutions.sqlite]
+
+Each line holds the SolveRequest fields (initial, goal, algorithm, heuristic,
+tie_break, optimal, beam_width) plus ``moves`` (one letter per move, "UDLR")
+and ``metrics``. Lines whose moves do not reach the goal are rejected, and so
+are lines of optimal algorithms (bfs, ucs, astar, ida, auto with optimal) whose
+moves are longer than the optimum: 3x3 boards are checked against the exact
+distance table, other boards are re-solved with IDA* (slow on hard 4x4 and up).
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import main
+import solution_store
+from solver import generator, tables
+from solver.planner import heuristic_function
+from solver.search import ida_star
+
+BATCH = 10_000
+REQUEST_FIELDS = ("initial", "goal", "algorithm", "heuristic", "tie_break", "optimal", "beam_width")
+# Their stored answers are served as optimal, so any valid walk is not enough
+OPTIMAL_ALGORITHMS = ("bfs", "ucs", "astar", "ida")
+
+def solve_corpus(path: str, options: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """One record per solved board of the corpus, through main.run_solve (store bypassed)"""
+    corpus = generator.load(path)
+    for board in corpus.boards:
+        request = main.SolveRequest(initial=main.tuple_to_matrix(board.state, corpus.width), **options)
+        problem = main.validate_request(request)
+        result, _ = main.run_solve(request, problem, threading.Event())
+        if not result.success:
+            print(f"  ✗ {board.state}: {result.message}", file=sys.stderr)
+            continue
+        moves = "".join(solution_store.MOVES[step_action(problem, a.board, b.board)]
+                        for a, b in zip(result.steps, result.steps[1:]))
+        metrics = {k: v for k, v in result.metrics.items() if k not in ("time", "profile", "stored")}
+        yield dict(request.model_dump(include=set(REQUEST_FIELDS)), moves=moves, metrics=metrics)
+
+def step_action(problem, before: List[List[int]], after: List[List[int]]) -> str:
+    """Action that turns one step's board into the next"""
+    state, following = main.matrix_to_tuple(before), main.matrix_to_tuple(after)
+    for action in problem.actions(state):
+        if problem.result(state, action) == following:
+            return action
+    raise ValueError("Consecutive steps are not one move apart")
+
+def parse_record(record: Dict[str, Any]) -> Tuple[solution_store.Key, str, Dict[str, Any]]:
+    """Validate one line and build its store row (raises ValueError)"""
+    fields = {name: record[name] for name in REQUEST_FIELDS if record.get(name) is not None}
+    request = main.SolveRequest(**fields)
+    problem = main.parse_board(request.initial, request.goal)
+    key = main.stored_solution_key(request, problem)
+    if key is None:
+        raise ValueError(f"{request.algorithm} answers are not stored")
+    state = problem.initial
+    for action in solution_store.decode_moves(record["moves"]):
+        if action not in problem.actions(state):
+            raise ValueError(f"illegal move {action!r}")
+        state = problem.result(state, action)
+    if not problem.is_goal(state):
+        raise ValueError("moves do not reach the goal")
+    if request.algorithm in OPTIMAL_ALGORITHMS or (request.algorithm == "auto" and request.optimal):
+        best = optimal_length(problem)
+        if len(record["moves"]) > best:
+            raise ValueError(f"{len(record['moves'])} moves but the optimum is {best}; "
+                             f"{request.algorithm} answers must be optimal")
+    return key, record["moves"], record.get("metrics") or {}
+
+def optimal_length(problem) -> int:
+    """Moves of a shortest solution: exact table on 3x3 (blank last in the goal), else IDA* (Manhattan)"""
+    if problem.width == 3 and problem.height == 3 and problem.goal[-1] == 0:
+        # Moves depend only on positions: relabel tiles so the goal is GOAL_3x3
+        relabel = {tile: target for tile, target in zip(problem.goal, tables.GOAL_3x3)}
+        return tables.distance_3x3(tuple(relabel[tile] for tile in problem.initial))
+    result = ida_star(problem, heuristic_function("manhattan", problem))
+    if not result["success"]:
+        raise ValueError("could not verify the optimum")
+    return result["depth"]
+
+def load(paths: List[str], store: solution_store.SolutionStore) -> Tuple[int, int]:
+    loaded = rejected = 0
+    rows = []
+    for path in paths:
+        with open(path) as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(parse_record(json.loads(line)))
+                except (ValueError, KeyError) as e:
+                    rejected += 1
+                    print(f"  ✗ {path}:{number}: {e}", file=sys.stderr)
+                if len(rows) >= BATCH:
+                    loaded += store.put_many(rows)
+                    rows = []
+    if rows:
+        loaded += store.put_many(rows)
+    return loaded, rejected
+
+def main_cli() -> int:
+    parser = argparse.ArgumentParser(description="Seed the persistent solution store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    solve = sub.add_parser("solve", help="solve a board corpus and write JSON lines")
+    solve.add_argument("corpus", help="board corpus from `python -m solver.generator build`")
+    solve.add_argument("--algorithm", default="astar")
+    solve.add_argument("--heuristic", default="manhattan")
+    solve.add_argument("--tie-break", default="fifo")
+    solve.add_argument("-o", "--output", required=True)
+    load_cmd = sub.add_parser("load", help="insert JSON lines into the store")
+    load_cmd.add_argument("files", nargs="+")
+    load_cmd.add_argument("--db", default=main.SOLUTION_STORE_PATH or None, help="store file (SOLUTION_STORE_PATH)")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    if args.command == "solve":
+        main.SOLUTION_STORE_PATH = ""  # measure and record real searches
+        options = {"algorithm": args.algorithm, "heuristic": args.heuristic, "tie_break": args.tie_break}
+        count = 0
+        with open(args.output, "w") as f:
+            for record in solve_corpus(args.corpus, options):
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+                count += 1
+        print(f"✅ {count} solutions in {time.perf_counter() - t0:.1f}s -> {args.output}")
+        return 0
+
+    if not args.db:
+        parser.error("no store path: pass --db or set SOLUTION_STORE_PATH")
+    os.makedirs(os.path.dirname(os.path.abspath(args.db)), exist_ok=True)
+    store = solution_store.SolutionStore(args.db)
+    loaded, rejected = load(args.files, store)
+    print(f"✅ {loaded} solutions loaded ({rejected} rejected) in {time.perf_counter() - t0:.1f}s; "
+          f"{len(store)} in {args.db}")
+    store.close()
+    return 1 if rejected and not loaded else 0
+
+if __name__ == "__main__":
+    sys.exit(main_cli())
@@ -0,0 +1,82 @@
+"""
+Single-flight coalescing of identical concurrent computations.
+
+Concurrent callers that ask for the same key attach to one running
+computation and all receive its result. The computation runs in a worker
+thread and receives a ``threading.Event`` that is set only when every
+waiter has gone away (reference-counted cancellation).
+"""
+
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("future", "cancel", "waiters")
+
+    def __init__(self, future: "asyncio.Future", cancel: threading.Event):
+        self.future = future
+        self.cancel = cancel
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self.started = 0
+        self.joined = 0
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[threading.Event], Any]) -> Any:
+        """Run ``fn(cancel)`` once per key, sharing the result with every concurrent caller"""
+        call = self._calls.get(key)
+        if call is None:
+            cancel = threading.Event()
+            future = asyncio.get_running_loop().run_in_executor(None, fn, cancel)
+            call = _Call(future, cancel)
+            self._calls[key] = call
+            future.add_done_callback(lambda _: self._forget(key, call))
+            self.started += 1
+        else:
+            self.joined += 1
+
+        call.waiters += 1
+        try:
+            # shield: a waiter being cancelled must not cancel the shared future
+            return await asyncio.shield(call.future)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.future.done():
+                call.cancel.set()
+                # New arrivals start a fresh computation instead of joining a cancelled one
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call):
+        if self._calls.get(key) is call:
+            del self._calls[key]
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+async def until_disconnected(request, awaitable, poll_interval: float = 0.25) -> Any:
+    """Await ``awaitable`` but give up (cancelling it) if the HTTP client disconnects"""
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                raise ClientDisconnected()
+    finally:
+        if not task.done():
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
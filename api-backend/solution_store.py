@@ -0,0 +1,115 @@
+"""Persistent solution store shared by every uvicorn worker and across restarts.
+
+One SQLite file in WAL mode, keyed by the packed board (width, start and goal
+tiles) plus algorithm, heuristic and the options that change the answer. A row
+holds the solution as a compact move string (one letter per move, see MOVES)
+and the response metrics without wall-clock fields. In WAL mode readers never
+wait for writers: each thread gets its own connection, reads take no Python
+lock, and the hot pages are served from a shared memory map (mmap_size).
+Writes are rare (one per new solve) and wait on SQLite's busy timeout.
+
+Seed it in bulk with ``python preload.py`` from batch solver output.
+"""
+import json
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MOVES = {"up": "U", "down": "D", "left": "L", "right": "R"}
+ACTIONS = {letter: action for action, letter in MOVES.items()}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS solutions (
+    board BLOB NOT NULL,        -- pack_board(initial, goal, width)
+    algorithm TEXT NOT NULL,
+    heuristic TEXT NOT NULL,    -- '' for uninformed algorithms
+    options TEXT NOT NULL,      -- optimal/tie_break/beam_width where they apply
+    moves TEXT NOT NULL,        -- encode_moves(actions)
+    metrics TEXT NOT NULL,      -- JSON
+    PRIMARY KEY (board, algorithm, heuristic, options)
+) WITHOUT ROWID;
+"""
+
+Key = Tuple[bytes, str, str, str]
+
+def pack_board(initial: Sequence[int], goal: Sequence[int], width: int) -> bytes:
+    """Width, then start and goal tiles: two per byte up to 16 cells, one per byte above"""
+    tiles = list(initial) + list(goal)
+    if len(initial) <= 16:
+        if len(tiles) % 2:
+            tiles.append(0)
+        return bytes([width]) + bytes(tiles[i] << 4 | tiles[i + 1] for i in range(0, len(tiles), 2))
+    return bytes([width]) + bytes(tiles)
+
+def solution_key(initial: Sequence[int], goal: Sequence[int], width: int, algorithm: str,
+                 heuristic: Optional[str] = None, optimal: Optional[bool] = None,
+                 tie_break: Optional[str] = None, beam_width: Optional[int] = None) -> Key:
+    """Store key; pass None for options that do not apply to the algorithm"""
+    options = ",".join(f"{name}={value}" for name, value in
+                       (("optimal", optimal), ("tie_break", tie_break), ("beam_width", beam_width))
+                       if value is not None)
+    return pack_board(initial, goal, width), algorithm, heuristic or "", options
+
+def encode_moves(actions: Iterable[str]) -> str:
+    return "".join(MOVES[action] for action in actions)
+
+def decode_moves(moves: str) -> List[str]:
+    return [ACTIONS[letter] for letter in moves]
+
+class SolutionStore:
+    """Key/value store of solutions in SQLite (WAL); safe across threads and processes"""
+    def __init__(self, path: str, mmap_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.mmap_bytes = mmap_bytes
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        db = self._connection()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (opened on first use)"""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(f"PRAGMA mmap_size={self.mmap_bytes}")
+            self._local.db = db
+            with self._connections_lock:
+                self._connections.append(db)
+        return db
+
+    def get(self, key: Key) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(moves, metrics) or None"""
+        row = self._connection().execute(
+            "SELECT moves, metrics FROM solutions WHERE board = ? AND algorithm = ? AND heuristic = ? AND options = ?",
+            key).fetchone()
+        return (row[0], json.loads(row[1])) if row is not None else None
+
+    def put(self, key: Key, moves: str, metrics: Dict[str, Any]) -> None:
+        self.put_many([(key, moves, metrics)])
+
+    def put_many(self, rows: Iterable[Tuple[Key, str, Dict[str, Any]]]) -> int:
+        """Insert or replace rows in one transaction; returns how many"""
+        records = [(*key, moves, json.dumps(metrics, separators=(",", ":"))) for key, moves, metrics in rows]
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany("INSERT OR REPLACE INTO solutions (board, algorithm, heuristic, options, moves, metrics) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", records)
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return len(records)
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT count(*) FROM solutions").fetchone()[0]
+
+    def close(self) -> None:
+        with self._connections_lock:
+            for db in self._connections:
+                db.close()
+            self._connections.clear()
+        self._local = threading.local()
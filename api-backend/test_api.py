@@ -0,0 +1,401 @@
+"""Tests for the API backend and the stores behind it.
+
+Run from api-backend/: python -m pytest test_api.py
+"""
+import asyncio
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+os.environ.setdefault("SOLUTION_STORE_PATH", "")  # tests never read or write the deployment's store
+
+import jobs
+import main
+import preload
+import solution_store
+from singleflight import ClientDisconnected, SingleFlight, until_disconnected
+from Heuristics import manhattan_distance
+from solver.generator import generate
+from solver.planner import ASTAR_MAX_ESTIMATE, IDA_MAX_ESTIMATE, TooHard, choose
+from solver.problem import SlidingPuzzle
+from solver.realtime import LearnedTable, lrta_star
+
+client = TestClient(main.app)
+
+HARD_3X3 = (8, 3, 1, 2, 4, 5, 7, 6, 0)  # optimal: 20 moves
+
+def board_with_estimate(width: int, estimate: int) -> SlidingPuzzle:
+    """A solvable board whose Manhattan distance is exactly ``estimate``"""
+    state = generate(width, per_stratum=1, strata=[estimate], seed=estimate).boards[0].state
+    problem = SlidingPuzzle(state, width=width)
+    assert manhattan_distance(state, problem.goal, width) == estimate
+    return problem
+
+def as_matrix(problem: SlidingPuzzle):
+    return [list(problem.initial[i:i + problem.width]) for i in range(0, len(problem.initial), problem.width)]
+
+# "auto" plans: routed by the Manhattan estimate
+
+@pytest.mark.parametrize("width", [4, 5])
+def test_auto_routes_by_estimate(width):
+    astar_max, ida_max = ASTAR_MAX_ESTIMATE[width * width], IDA_MAX_ESTIMATE[width * width]
+    assert choose(board_with_estimate(width, astar_max)).algorithm == "astar"
+    assert choose(board_with_estimate(width, astar_max + 1)).algorithm == "ida"
+    assert choose(board_with_estimate(width, ida_max)).algorithm == "ida"
+    hard = board_with_estimate(width, ida_max + 1)
+    with pytest.raises(TooHard):
+        choose(hard)
+    assert choose(hard, limit=False).algorithm == "ida"
+    assert choose(hard, optimal=False).algorithm == ("beam" if width == 4 else "bounded")
+
+def test_auto_small_boards_use_astar():
+    assert choose(SlidingPuzzle(HARD_3X3)).algorithm == "astar"
+
+def test_api_rejects_too_hard_optimal_auto_before_searching():
+    hard = board_with_estimate(4, IDA_MAX_ESTIMATE[16] + 1)
+    response = client.post("/api/solve", json={"initial": as_matrix(hard), "algorithm": "auto"})
+    assert response.status_code == 400
+    assert "too hard" in response.json()["detail"]
+
+# Cacheable GET /api/solve/{board}: ETag, 304 and content coding
+
+HARD_3X3_URL = "/api/solve/831_245_760"  # HARD_3X3: its 21 steps make a body over 1 KB
+
+def test_get_solve_revalidates_with_its_etag():
+    first = client.get(HARD_3X3_URL, headers={"Accept-Encoding": "identity"})
+    assert first.status_code == 200 and first.json()["metrics"]["moves"] == 20
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    assert first.headers["Vary"] == "Accept-Encoding"
+    assert "time" not in first.json()["metrics"]
+    again = client.get(HARD_3X3_URL, headers={"Accept-Encoding": "identity", "If-None-Match": f'W/{etag}, "other"'})
+    assert again.status_code == 304 and again.headers["ETag"] == etag and again.content == b""
+    assert client.get(HARD_3X3_URL, headers={"Accept-Encoding": "identity"}).content == first.content
+
+def test_get_solve_etag_changes_with_the_response_version(monkeypatch):
+    etag = client.get(HARD_3X3_URL, headers={"Accept-Encoding": "identity"}).headers["ETag"]
+    monkeypatch.setattr(main, "RESPONSE_VERSION", main.RESPONSE_VERSION + 1)
+    response = client.get(HARD_3X3_URL, headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert response.status_code == 200 and response.headers["ETag"] != etag
+    monkeypatch.setattr(main, "SOURCE_REVISION", "abc123")
+    assert client.get(HARD_3X3_URL, headers={"Accept-Encoding": "identity"}).headers["ETag"] != response.headers["ETag"]
+
+def test_get_solve_compresses_large_bodies(monkeypatch):
+    monkeypatch.setattr(main, "CACHEABLE_CODINGS", ("gzip",))
+    plain = client.get(HARD_3X3_URL, headers={"Accept-Encoding": "identity"})
+    packed = client.get(HARD_3X3_URL, headers={"Accept-Encoding": "gzip, br;q=0"})
+    assert "Content-Encoding" not in plain.headers
+    assert packed.headers["Content-Encoding"] == "gzip"
+    assert packed.headers["ETag"] != plain.headers["ETag"]  # each coding is its own representation
+    assert packed.content == plain.content  # the client decompressed it
+    small = client.get("/api/solve/123_456_708", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in small.headers and small.headers["ETag"].endswith('-gzip"')
+
+def test_get_solve_does_not_cache_failures(monkeypatch):
+    failure = main.SolveResponse(success=False, message="Search stopped: memory limit of 1 MB exceeded")
+    monkeypatch.setattr(main, "run_solve", lambda request, problem, cancel: (failure, {}))
+    url = "/api/solve/123_456_078?algorithm=bfs"
+    for _ in range(2):
+        response = client.get(url)
+        assert response.status_code == 200 and not response.json()["success"]
+        assert response.headers["Cache-Control"] == "no-store"
+
+# Learned heuristic table (hints): several uvicorn workers share one SQLite file
+
+def test_learned_table_refreshes_values_learned_by_other_workers(tmp_path):
+    path = str(tmp_path / "learned.sqlite")
+    problem = SlidingPuzzle(HARD_3X3)
+    a, b = LearnedTable(path), LearnedTable(path)
+    a.update(problem.goal, problem.initial, 10)
+    a.flush()
+    assert b.get(problem.goal, problem.initial) == 10  # now warm in b's cache
+    a.update(problem.goal, problem.initial, 14)
+    a.flush()
+    b.flush()
+    assert b.get(problem.goal, problem.initial) == 14
+    # A lower write never lowers the shared value, in the file or in the writer's cache
+    b.update(problem.goal, problem.initial, 12)
+    b.flush()
+    assert b.get(problem.goal, problem.initial) == 14
+    assert LearnedTable(path).get(problem.goal, problem.initial) == 14
+
+def test_learned_table_converges_across_workers(tmp_path):
+    path = str(tmp_path / "learned.sqlite")
+    problem = SlidingPuzzle(HARD_3X3)
+    h = lambda s: manhattan_distance(s, problem.goal, 3)
+    workers = (LearnedTable(path), LearnedTable(path))
+    depths = []
+    for trial in range(300):
+        table = workers[trial % 2]
+        result = lrta_star(problem, h, table, lookahead=2, max_moves=100_000)
+        table.flush()
+        assert result["success"]
+        depths.append(result["depth"])
+    assert depths[-10:] == [20] * 10
+    assert [table.get(problem.goal, problem.initial) for table in workers] == [20, 20]
+
+# Jobs: SQLite queue plus worker threads
+
+def wait_for(predicate, timeout: float = 10.0):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        value = predicate()
+        if value:
+            return value
+        time.sleep(0.02)
+    raise AssertionError("condition not reached in time")
+
+def test_jobs_are_claimed_by_priority_then_age(tmp_path):
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite"))
+    low = store.submit({"n": 1})
+    high = store.submit({"n": 2}, priority=5)
+    later = store.submit({"n": 3})
+    assert store.position(low) == 1 and store.position(later) == 2
+    assert [store.claim()["id"] for _ in range(3)] == [high, low, later]
+    assert store.claim() is None
+
+def test_job_of_a_crashed_worker_is_claimed_again_after_the_lease(tmp_path):
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite"), lease=0.2)
+    job_id = store.submit({"n": 1})
+    assert store.claim()["id"] == job_id  # its worker dies without heartbeats
+    assert store.claim() is None
+    time.sleep(0.3)
+    job = store.claim()
+    assert job["id"] == job_id and job["status"] == jobs.RUNNING and job["attempts"] == 2
+
+def test_writes_of_a_worker_that_lost_its_claim_are_ignored(tmp_path):
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite"), lease=0.2)
+    job_id = store.submit({"n": 1})
+    stale = store.claim()["token"]
+    time.sleep(0.3)
+    fresh = store.claim()["token"]
+    assert not store.heartbeat(job_id, stale)
+    assert not store.progress(job_id, stale, {"expanded": 1})
+    assert not store.finish(job_id, stale, jobs.DONE, {"from": "stale"})
+    assert store.finish(job_id, fresh, jobs.DONE, {"from": "fresh"})
+    assert store.get(job_id)["result"] == {"from": "fresh"}
+
+def test_job_without_progress_outlives_the_lease(tmp_path):
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite"), lease=0.3)
+    runs = []
+
+    def run(job, cancel, progress):
+        runs.append(job["id"])
+        time.sleep(1.0)  # no progress calls: only the heartbeat timer keeps the claim
+        return jobs.DONE, {"ok": True}, ""
+
+    queue = jobs.JobQueue(store, run, workers=2, poll=0.05)
+    queue.start()
+    try:
+        job_id = queue.submit({"n": 1})
+        job = wait_for(lambda: (lambda j: j if j["finished"] else None)(store.get(job_id)))
+    finally:
+        assert queue.stop()
+    assert job["status"] == jobs.DONE and job["attempts"] == 1
+    assert runs == [job_id]
+    store.close()
+
+def test_finished_results_are_evicted_oldest_first_by_size(tmp_path):
+    result = {"payload": os.urandom(600).hex()}
+    row = len(zlib.compress(json.dumps(result).encode()))
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite"), max_result_bytes=2 * row + row // 2)
+    ids = []
+    for n in range(4):
+        ids.append(store.submit({"n": n}))
+        store.finish(ids[-1], store.claim()["token"], jobs.DONE, result)
+    assert store.counts()["result_bytes"] == 2 * row
+    assert [store.get(job_id) is not None for job_id in ids] == [False, False, True, True]
+
+def test_queued_job_past_its_deadline_expires(tmp_path):
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite"))
+    job_id = store.submit({"n": 1}, deadline=time.time() - 1)
+    assert store.claim() is None
+    assert store.get(job_id)["status"] == jobs.EXPIRED
+
+def test_running_job_past_its_deadline_expires(tmp_path):
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite"))
+
+    def run(job, cancel, progress):
+        while not cancel.is_set():
+            time.sleep(0.01)
+        return jobs.FAILED, None, "Search cancelled"
+
+    queue = jobs.JobQueue(store, run, workers=1, poll=0.05)
+    queue.start()
+    try:
+        job_id = queue.submit({"n": 1}, deadline=time.time() + 0.3)
+        job = wait_for(lambda: (lambda j: j if j["finished"] else None)(store.get(job_id)))
+        assert job["status"] == jobs.EXPIRED and job["message"] == "Deadline exceeded"
+    finally:
+        assert queue.stop()
+    store.close()
+
+def test_stop_reports_workers_still_running(tmp_path):
+    store = jobs.JobStore(str(tmp_path / "jobs.sqlite"))
+    release = threading.Event()
+
+    def run(job, cancel, progress):
+        release.wait()  # ignores its cancel token
+        return jobs.DONE, {}, ""
+
+    queue = jobs.JobQueue(store, run, workers=1, poll=0.05)
+    queue.start()
+    job_id = queue.submit({"n": 1})
+    wait_for(lambda: store.get(job_id)["status"] == jobs.RUNNING)
+    assert not queue.stop(timeout=0.1)
+    release.set()
+    assert queue.stop(timeout=5)
+    assert store.get(job_id)["status"] == jobs.QUEUED  # released for the next start
+    store.close()
+
+def test_job_endpoints_run_a_solve(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "JOB_DB_PATH", str(tmp_path / "jobs.sqlite"))
+    with TestClient(main.app) as api:
+        response = api.post("/api/jobs", json={"initial": [[1, 2, 3], [4, 5, 6], [0, 7, 8]], "algorithm": "astar"})
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+        assert response.headers["Location"] == f"/api/jobs/{job_id}"
+        job = wait_for(lambda: (lambda j: j if j["status"] == jobs.DONE else None)(api.get(f"/api/jobs/{job_id}").json()))
+        assert job["result"]["success"] and job["result"]["metrics"]["moves"] == 2
+        assert api.get("/api/jobs/unknown").status_code == 404
+
+# Persistent solution store and its bulk loader
+
+NEAR_GOAL = [[1, 2, 3], [4, 5, 6], [0, 7, 8]]  # solved by moving the blank right twice
+
+def test_solution_store_round_trip(tmp_path):
+    store = solution_store.SolutionStore(str(tmp_path / "solutions.sqlite"))
+    goal = tuple(range(1, 9)) + (0,)
+    rows = [(solution_store.solution_key(HARD_3X3, goal, 3, "astar", "manhattan", tie_break="fifo"),
+             "UDLR", {"moves": 4}),
+            (solution_store.solution_key(HARD_3X3, goal, 3, "bfs"), "RR", {"moves": 2})]
+    assert store.put_many(rows) == 2 and len(store) == 2
+    for key, moves, metrics in rows:
+        assert store.get(key) == (moves, metrics)
+    assert store.get(solution_store.solution_key(HARD_3X3, goal, 3, "astar", "misplaced", tie_break="fifo")) is None
+    assert solution_store.decode_moves("UDLR") == ["up", "down", "left", "right"]
+    # Read from another thread (own connection) and reopen from disk
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(store.get(rows[1][0])))
+    thread.start()
+    thread.join()
+    assert seen == [("RR", {"moves": 2})]
+    store.close()
+    assert solution_store.SolutionStore(str(tmp_path / "solutions.sqlite")).get(rows[0][0]) == ("UDLR", {"moves": 4})
+
+def test_preload_rejects_moves_that_do_not_solve_the_board(tmp_path):
+    lines = [{"initial": NEAR_GOAL, "algorithm": "astar", "heuristic": "manhattan", "moves": "RR", "metrics": {"moves": 2}},
+             {"initial": NEAR_GOAL, "algorithm": "bfs", "moves": "LL"},   # illegal: the blank is on the left edge
+             {"initial": NEAR_GOAL, "algorithm": "dfs", "moves": "R"},    # legal but short of the goal
+             {"initial": NEAR_GOAL, "algorithm": "ucs", "moves": "RX"}]   # not a move letter
+    path = tmp_path / "solutions.jsonl"
+    path.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+    store = solution_store.SolutionStore(str(tmp_path / "solutions.sqlite"))
+    assert preload.load([str(path)], store) == (1, 3)
+    with pytest.raises(ValueError, match="illegal move"):
+        preload.parse_record(lines[1])
+    with pytest.raises(ValueError, match="do not reach the goal"):
+        preload.parse_record(lines[2])
+    request = main.SolveRequest(initial=NEAR_GOAL, algorithm="astar", heuristic="manhattan")
+    key = main.stored_solution_key(request, main.parse_board(request.initial, request.goal))
+    assert store.get(key) == ("RR", {"moves": 2})
+    store.close()
+
+def test_preload_rejects_non_optimal_answers_of_optimal_algorithms():
+    detour = "RRLLRR"  # valid, but the optimum is "RR"
+    for algorithm in ("astar", "bfs", "ucs", "ida"):
+        with pytest.raises(ValueError, match="optimum is 2"):
+            preload.parse_record({"initial": NEAR_GOAL, "algorithm": algorithm, "moves": detour})
+    with pytest.raises(ValueError, match="optimum is 2"):
+        preload.parse_record({"initial": NEAR_GOAL, "algorithm": "auto", "optimal": True, "moves": detour})
+    for algorithm in ("greedy", "beam", "bounded", "dfs"):
+        assert preload.parse_record({"initial": NEAR_GOAL, "algorithm": algorithm, "moves": detour})[1] == detour
+    assert preload.parse_record({"initial": NEAR_GOAL, "algorithm": "auto", "optimal": False, "moves": detour})[1] == detour
+    # Other goals on 3x3 (relabelled for the exact table, or re-solved) and a 4x4 board (re-solved)
+    relabelled_goal = [[8, 7, 6], [5, 4, 3], [2, 1, 0]]
+    relabelled_start = [[8, 7, 6], [5, 4, 3], [0, 2, 1]]
+    with pytest.raises(ValueError, match="optimum is 2"):
+        preload.parse_record({"initial": relabelled_start, "goal": relabelled_goal, "algorithm": "astar", "moves": "RRLLRR"})
+    goal = [[0, 1, 2], [3, 4, 5], [6, 7, 8]]
+    start = [[1, 2, 0], [3, 4, 5], [6, 7, 8]]
+    assert preload.parse_record({"initial": start, "goal": goal, "algorithm": "astar", "moves": "LL"})[1] == "LL"
+    with pytest.raises(ValueError, match="optimum is 2"):
+        preload.parse_record({"initial": start, "goal": goal, "algorithm": "astar", "moves": "LLRRLL"})
+    near_4x4 = [[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [13, 14, 0, 15]]
+    assert preload.parse_record({"initial": near_4x4, "algorithm": "ida", "moves": "R"})[1] == "R"
+    with pytest.raises(ValueError, match="optimum is 1"):
+        preload.parse_record({"initial": near_4x4, "algorithm": "ida", "moves": "RLR"})
+
+# Single-flight: identical concurrent solves share one search
+
+def test_singleflight_runs_once_for_concurrent_callers():
+    flight, calls, release = SingleFlight(), [], threading.Event()
+
+    def solve(cancel):
+        calls.append(cancel)
+        release.wait(5)
+        return "solution"
+
+    async def scenario():
+        waiters = [asyncio.ensure_future(flight.do("board", solve)) for _ in range(20)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(scenario()) == ["solution"] * 20
+    assert len(calls) == 1 and not calls[0].is_set()
+    assert (flight.started, flight.joined, flight.in_flight()) == (1, 19, 0)
+
+def test_singleflight_cancels_only_when_the_last_waiter_leaves():
+    flight, calls = SingleFlight(), []
+
+    def solve(cancel):
+        calls.append(cancel)
+        return "cancelled" if cancel.wait(5) else "solution"
+
+    async def scenario():
+        waiters = [asyncio.ensure_future(flight.do("board", solve)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        for waiter in waiters[:2]:
+            waiter.cancel()
+        await asyncio.sleep(0.05)
+        assert not calls[0].is_set()  # one caller is still waiting
+        waiters[2].cancel()
+        await asyncio.sleep(0.05)
+        assert calls[0].is_set()
+        # The cancelled search is not joined: a new caller starts over
+        fresh = asyncio.ensure_future(flight.do("board", solve))
+        await asyncio.sleep(0.05)
+        assert len(calls) == 2 and flight.started == 2
+        calls[1].set()
+        return await fresh
+
+    assert asyncio.run(scenario()) == "cancelled"
+
+def test_disconnected_client_cancels_its_solve():
+    flight, calls = SingleFlight(), []
+
+    class Gone:
+        async def is_disconnected(self):
+            return True
+
+    def solve(cancel):
+        calls.append(cancel)
+        cancel.wait(5)
+
+    async def scenario():
+        with pytest.raises(ClientDisconnected):
+            await until_disconnected(Gone(), flight.do("board", solve), poll_interval=0.01)
+
+    asyncio.run(scenario())
+    assert calls[0].is_set()
@@ -0,0 +1,109 @@
+"""Benchmark de arranque en frío.
+
+Cada repetición lanza un intérprete nuevo y mide por fases cuánto tarda en
+quedar listo para resolver: importar el paquete, cargar los módulos de
+búsqueda, dejar disponibles las tablas precalculadas y resolver un primer
+tablero. Se comparan las tablas mapeadas desde disco contra reconstruirlas.
+
+Uso:
+    python -m benchmarks.cold_start [--repeat N] [--json salida.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+import solver
+t1 = time.perf_counter()
+from solver import EightPuzzle, astar
+from Heuristics import HEURISTICS, GOAL
+t2 = time.perf_counter()
+solver.tables.preload()
+t3 = time.perf_counter()
+res = astar(EightPuzzle((7,2,4,5,0,6,8,3,1)), lambda s: HEURISTICS["manhattan"](s, GOAL))
+t4 = time.perf_counter()
+assert res["success"]
+print(json.dumps({{"import_package": t1 - t0, "import_modules": t2 - t1,
+                  "tables": t3 - t2, "first_solve": t4 - t3}}))
+"""
+
+API_CHILD = r"""
+import asyncio, json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {api_dir!r})
+import main
+t1 = time.perf_counter()
+# Solo las tablas: start_jobs abriría la cola y lanzaría workers que nunca se detienen
+asyncio.run(main.load_tables())
+t2 = time.perf_counter()
+print(json.dumps({{"import_api": t1 - t0, "load_tables": t2 - t1}}))
+"""
+
+def run_child(code: str, env: dict) -> dict:
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT,
+                         capture_output=True, text=True, check=True)
+    phases = json.loads(out.stdout.strip().splitlines()[-1])
+    phases["process_total"] = time.perf_counter() - t0
+    return phases
+
+def measure(name: str, code: str, env: dict, repeat: int) -> dict:
+    runs = [run_child(code, env) for _ in range(repeat)]
+    phases = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+    return {"scenario": name, "repeat": repeat, "median_s": phases,
+            "min_total_s": min(r["process_total"] for r in runs)}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque en frío")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="guardar resultados en este archivo")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    # Asegurar que las tablas existen antes de medir el escenario mapeado
+    subprocess.run([sys.executable, "-m", "solver.tables", "build"], cwd=ROOT, env=env,
+                   check=True, capture_output=True)
+
+    results = [measure("tablas mapeadas", CHILD.format(root=ROOT), env, args.repeat)]
+    with tempfile.TemporaryDirectory() as empty:
+        # Directorio vacío + ninguna caché: cada arranque reconstruye las tablas
+        rebuild_env = dict(env, SOLVER_DATA_DIR=empty)
+        code = CHILD.format(root=ROOT).replace("solver.tables.preload()",
+                                               "solver.tables.preload(); __import__('shutil').rmtree(solver.tables.DATA_DIR)")
+        results.append(measure("tablas recalculadas", code, rebuild_env, args.repeat))
+
+    try:
+        import fastapi  # noqa: F401
+        api_dir = os.path.join(ROOT, "api-backend")
+        with tempfile.TemporaryDirectory() as scratch:
+            # Por si algo abre los archivos de estado: nunca los del despliegue
+            api_env = dict(env, JOB_DB_PATH=os.path.join(scratch, "jobs.sqlite"), SOLUTION_STORE_PATH="",
+                           HINT_TABLE_PATH=os.path.join(scratch, "learned_h.sqlite"))
+            results.append(measure("api (import + tablas)", API_CHILD.format(api_dir=api_dir), api_env, args.repeat))
+    except ImportError:
+        print("ℹ️  fastapi no instalado: se omite el escenario de la API")
+
+    print(f"{'Escenario':<26} {'Fase':<16} {'Mediana (ms)':>12}")
+    print("-" * 56)
+    for r in results:
+        for phase, seconds in r["median_s"].items():
+            print(f"{r['scenario']:<26} {phase:<16} {seconds * 1000:>12.1f}")
+        print("-" * 56)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+        print(f"💾 Resultados guardados en {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Conjuntos curados de instancias para los benchmarks.
+
+Los tableros 3x3 se eligieron (semilla 2024) por su distancia óptima exacta
+según la tabla precalculada; los 4x4 son caminatas aleatorias resueltas con
+IDA*(manhattan). La profundidad óptima acompaña a cada instancia.
+"""
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+class Instance(NamedTuple):
+    name: str
+    state: Tuple[int, ...]
+    width: int
+    depth: Optional[int]  # largo de la solución óptima (None si no se conoce)
+
+def _digits(s: str) -> Tuple[int, ...]:
+    return tuple(int(c) for c in s)
+
+def _csv(s: str) -> Tuple[int, ...]:
+    return tuple(int(c) for c in s.split(","))
+
+def _set_3x3(prefix: str, by_depth: Dict[int, List[str]]) -> List[Instance]:
+    return [Instance(f"{prefix}-d{d}-{i}", _digits(s), 3, d)
+            for d, boards in by_depth.items() for i, s in enumerate(boards)]
+
+INSTANCE_SETS: Dict[str, List[Instance]] = {
+    "3x3-shallow": _set_3x3("3x3", {
+        4: ["152403786", "013426758", "123745086"],
+        8: ["236158470", "130428765", "120853476"],
+    }),
+    "3x3-medium": _set_3x3("3x3", {
+        12: ["813256470", "250463718", "743105826"],
+        16: ["253847016", "815402736", "238146570"],
+    }),
+    "3x3-deep": _set_3x3("3x3", {
+        20: ["831245760", "520817643", "642803715"],
+        24: ["650813427", "873526041", "760248531"],
+        28: ["147285360", "320675841", "627815340"],
+    }),
+    "4x4": [
+        Instance("4x4-d15", _csv("6,10,2,4,1,9,3,8,5,14,7,11,13,15,0,12"), 4, 15),
+        Instance("4x4-d16", _csv("1,2,3,7,5,6,8,4,13,9,10,12,14,0,11,15"), 4, 16),
+        Instance("4x4-d17", _csv("5,0,2,3,6,1,8,7,9,10,12,4,13,14,11,15"), 4, 17),
+        Instance("4x4-d18", _csv("1,2,0,8,5,6,7,3,13,9,12,4,10,14,11,15"), 4, 18),
+        Instance("4x4-d21", _csv("2,5,12,3,1,6,0,4,9,10,15,7,13,14,8,11"), 4, 21),
+        Instance("4x4-d22", _csv("5,1,4,8,2,6,3,12,0,14,10,11,9,13,15,7"), 4, 22),
+        Instance("4x4-d26", _csv("5,2,1,3,13,9,7,4,0,10,6,15,14,11,8,12"), 4, 26),
+        Instance("4x4-d29", _csv("2,4,6,11,1,5,0,10,9,14,7,3,13,8,15,12"), 4, 29),
+    ],
+}
+
+# Algoritmos que tiene sentido correr en cada conjunto (BFS/UCS/DFS no escalan a 4x4;
+# ARA*, beam y bounded son aproximados y se miden donde la diferencia con A* se nota)
+SET_ALGORITHMS: Dict[str, List[str]] = {
+    "3x3-shallow": ["bfs", "bfs-layered", "dfs", "ucs", "greedy", "astar", "ida"],
+    "3x3-medium": ["bfs", "bfs-layered", "dfs", "ucs", "greedy", "astar", "ida"],
+    "3x3-deep": ["bfs", "bfs-layered", "ucs", "greedy", "astar", "ida", "ara", "beam", "bounded"],
+    "4x4": ["greedy", "astar", "ida", "ara", "beam", "bounded"],
+}
+
+def corpus_instances(path: str) -> Tuple[str, List[Instance]]:
+    """Conjunto de instancias desde un corpus de solver.generator.
+
+    Devuelve (nombre del conjunto, instancias); la profundidad óptima solo se
+    conoce en corpus exactos (3x3), en los demás queda en None.
+    """
+    from solver.generator import load
+    corpus = load(path)
+    set_name = os.path.splitext(os.path.basename(path))[0]
+    prefix = f"{corpus.width}x{corpus.height}"
+    instances = [Instance(f"{prefix}-{'d' if corpus.exact else 'h'}{b.depth}-{i}", b.state, corpus.width,
+                          b.depth if corpus.exact else None)
+                 for i, b in enumerate(corpus.boards)]
+    SET_ALGORITHMS.setdefault(set_name, SET_ALGORITHMS["3x3-deep" if corpus.width * corpus.height <= 9 else "4x4"])
+    return set_name, instances
@@ -0,0 +1,235 @@
+"""Suite de benchmarks reproducible con comparación de regresiones.
+
+Uso:
+    python -m benchmarks.suite run [--sets 3x3-medium 4x4] [--algorithms astar ida]
+                                   [--heuristics manhattan] [--repeat 5] [--warmup 1]
+                                   [--timeout 30] [--corpus corpus.bin ...] [-o resultados.json]
+                                   [--tie-breaks fifo lifo high_g low_h]
+    python -m benchmarks.suite compare base.json nuevo.json [--threshold 0.10]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from solver import search
+from solver.problem import SlidingPuzzle
+from Heuristics import HEURISTICS, compile_heuristic
+from Strucure import TIE_BREAKS
+from benchmarks.instances import INSTANCE_SETS, SET_ALGORITHMS, corpus_instances
+
+ENGINES = {
+    "bfs": search.bfs,
+    "bfs-layered": lambda p, cancel=None: search.bfs(p, cancel=cancel, layered=True),
+    "dfs": lambda p, cancel=None: search.dfs(p, depth_limit=50, cancel=cancel),
+    "ucs": search.ucs,
+    "greedy": search.greedy,
+    "astar": search.astar,
+    "ida": search.ida_star,
+    "ara": search.ara_star,
+    "beam": search.beam_search,
+    "bounded": search.bounded_best_first,
+}
+INFORMED = ("greedy", "astar", "ida", "ara", "beam", "bounded")
+# Algoritmos con cola de prioridad: aceptan tie_break
+PRIORITY = ("ucs", "greedy", "astar", "ara", "bounded")
+# Contadores deterministas que reportan los algoritmos (ver solver/stats.py)
+COUNTERS = ("expanded", "generated", "duplicates", "reopened", "pruned", "max_frontier", "max_closed", "ebf")
+
+def make_heuristic(name: Optional[str], problem: SlidingPuzzle):
+    if name is None:
+        return None
+    return compile_heuristic(name, problem.goal, problem.width)
+
+def run_once(algorithm: str, heuristic: Optional[str], instance, timeout: float,
+             trace_memory: bool = False, tie_break: Optional[str] = None) -> Dict[str, Any]:
+    problem = SlidingPuzzle(instance.state, width=instance.width)
+    h = make_heuristic(heuristic, problem)
+    options = {"cancel": threading.Event()}
+    if tie_break is not None:
+        options["tie_break"] = tie_break
+    cancel = options["cancel"]
+    timer = threading.Timer(timeout, cancel.set)
+    timer.start()
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        t0 = time.perf_counter()
+        if h is None:
+            res = ENGINES[algorithm](problem, **options)
+        else:
+            res = ENGINES[algorithm](problem, h, **options)
+        wall = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        timer.cancel()
+    status = "timeout" if res.get("status") == search.CANCELLED else res.get("status")
+    record = {"status": status, "cost": res["cost"], "time": wall, "peak_bytes": peak}
+    record.update({key: res.get(key) for key in COUNTERS})
+    return record
+
+def run_case(algorithm, heuristic, instance, repeat, warmup, timeout, tie_break=None) -> Dict[str, Any]:
+    for _ in range(warmup):
+        first = run_once(algorithm, heuristic, instance, timeout, tie_break=tie_break)
+        if first["status"] == "timeout":
+            break
+    runs = [run_once(algorithm, heuristic, instance, timeout, tie_break=tie_break) for _ in range(repeat)]
+    last = runs[-1]
+    record = {
+        "instance": instance.name, "optimal_depth": instance.depth,
+        "algorithm": algorithm, "heuristic": heuristic, "tie_break": tie_break,
+        "status": last["status"], "cost": last["cost"],
+        "time": {"median": statistics.median(r["time"] for r in runs),
+                 "min": min(r["time"] for r in runs),
+                 "runs": [r["time"] for r in runs]},
+    }
+    record.update({key: last[key] for key in COUNTERS})
+    if last["status"] != "timeout":
+        # Memoria en una corrida aparte: tracemalloc distorsiona los tiempos
+        record["peak_bytes"] = run_once(algorithm, heuristic, instance, timeout, trace_memory=True,
+                                        tie_break=tie_break)["peak_bytes"]
+    return record
+
+def git_revision() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def cmd_run(args) -> int:
+    sets = args.sets or ([] if args.corpus else list(INSTANCE_SETS))
+    for path in args.corpus or ():
+        # Corpus generados con `python -m solver.generator build`
+        set_name, instances = corpus_instances(path)
+        INSTANCE_SETS[set_name] = instances
+        sets.append(set_name)
+    results: List[Dict[str, Any]] = []
+    print(f"{'Instancia':<16} {'Algoritmo':<24} {'Estado':<9} {'Expandidos':>10} {'Generados':>10} {'Mediana(s)':>10} {'Pico(KB)':>9}")
+    print("-" * 94)
+    for set_name in sets:
+        algorithms = [a for a in SET_ALGORITHMS[set_name] if not args.algorithms or a in args.algorithms]
+        for instance in INSTANCE_SETS[set_name]:
+            for algorithm in algorithms:
+                heuristics = [h for h in HEURISTICS if not args.heuristics or h in args.heuristics] \
+                    if algorithm in INFORMED else [None]
+                tie_breaks = args.tie_breaks if algorithm in PRIORITY else [None]
+                for heuristic in heuristics:
+                    for tie_break in tie_breaks:
+                        rec = run_case(algorithm, heuristic, instance, args.repeat, args.warmup, args.timeout,
+                                       tie_break)
+                        rec["set"] = set_name
+                        results.append(rec)
+                        label = f"{algorithm}({heuristic})" if heuristic else algorithm
+                        if tie_break is not None and len(tie_breaks) > 1:
+                            label += f"/{tie_break}"
+                        peak = f"{rec['peak_bytes'] / 1024:.0f}" if rec.get("peak_bytes") is not None else "-"
+                        print(f"{instance.name:<16} {label:<24} {rec['status']:<9} {rec['expanded']:>10} "
+                              f"{rec['generated']:>10} {rec['time']['median']:>10.4f} {peak:>9}")
+    doc = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "repeat": args.repeat, "warmup": args.warmup, "timeout": args.timeout,
+            "corpus": args.corpus, "tie_breaks": args.tie_breaks,
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(doc, f, indent=2)
+    print(f"\n💾 {len(results)} resultados guardados en {args.output}")
+    return 0
+
+def _key(rec) -> tuple:
+    # Resultados anteriores a tie_break equivalen a 'fifo' (el desempate original)
+    tie_break = rec.get("tie_break", "fifo" if rec["algorithm"] in PRIORITY else None)
+    return (rec["set"], rec["instance"], rec["algorithm"], rec["heuristic"], tie_break)
+
+def _ratio(new, old) -> Optional[float]:
+    if new is None or old is None or old == 0:
+        return None
+    return new / old
+
+def cmd_compare(args) -> int:
+    with open(args.base) as f:
+        base = {_key(r): r for r in json.load(f)["results"]}
+    with open(args.new) as f:
+        new = {_key(r): r for r in json.load(f)["results"]}
+
+    regressions, improvements = [], []
+    for key in sorted(set(base) & set(new), key=str):
+        b, n = base[key], new[key]
+        label = f"{key[1]} {key[2]}" + (f"({key[3]})" if key[3] else "") + (f"/{key[4]}" if key[4] else "")
+        if b["status"] != n["status"]:
+            (regressions if n["status"] == "timeout" else improvements).append(
+                (label, "estado", b["status"], n["status"], None))
+            continue
+        # Tiempo con umbral relativo (ruido); contadores deterministas sin tolerancia extra
+        metrics = [("tiempo", b["time"]["median"], n["time"]["median"], args.threshold),
+                   ("expandidos", b["expanded"], n["expanded"], 0.0),
+                   ("generados", b["generated"], n["generated"], 0.0),
+                   ("memoria", b.get("peak_bytes"), n.get("peak_bytes"), args.threshold)]
+        for name, old, cur, tol in metrics:
+            r = _ratio(cur, old)
+            if r is None:
+                continue
+            if r > 1 + tol:
+                regressions.append((label, name, old, cur, r))
+            elif r < 1 - max(tol, 1e-9):
+                improvements.append((label, name, old, cur, r))
+
+    def show(title, rows):
+        print(f"\n{title} ({len(rows)})")
+        for label, name, old, cur, r in rows:
+            change = f"{(r - 1) * 100:+.1f}%" if r is not None else ""
+            print(f"  {label:<36} {name:<10} {old} → {cur} {change}")
+
+    show("🔴 Regresiones", regressions)
+    show("🟢 Mejoras", improvements)
+    missing = set(base) ^ set(new)
+    if missing:
+        print(f"\nℹ️  {len(missing)} casos presentes en un solo archivo (ignorados)")
+    return 1 if regressions else 0
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de búsqueda")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="ejecutar la suite y guardar JSON")
+    run.add_argument("--sets", nargs="*", choices=list(INSTANCE_SETS))
+    run.add_argument("--algorithms", nargs="*", choices=list(ENGINES))
+    run.add_argument("--heuristics", nargs="*", choices=list(HEURISTICS))
+    run.add_argument("--repeat", type=int, default=3)
+    run.add_argument("--warmup", type=int, default=1)
+    run.add_argument("--timeout", type=float, default=30.0, help="segundos por corrida")
+    run.add_argument("--tie-breaks", nargs="+", choices=TIE_BREAKS, default=["fifo"],
+                     help="desempates a comparar en ucs/greedy/astar")
+    run.add_argument("--corpus", nargs="*", help="corpus de solver.generator (reemplazan a los conjuntos curados salvo --sets)")
+    run.add_argument("-o", "--output", default="bench_results.json")
+
+    cmp = sub.add_parser("compare", help="comparar dos archivos de resultados")
+    cmp.add_argument("base")
+    cmp.add_argument("new")
+    cmp.add_argument("--threshold", type=float, default=0.10, help="tolerancia relativa de tiempo/memoria")
+
+    args = parser.parse_args()
+    return cmd_run(args) if args.command == "run" else cmd_compare(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,38 +2,17 @@
 import time
 import sys
 import os
-import importlib.util
+from contextlib import nullcontext
 
-# Agregar paths para imports
-current_dir = os.path.dirname(__file__)
-sys.path.append(current_dir)
-sys.path.append(os.path.join(current_dir, 'Problems'))
-sys.path.append(os.path.join(current_dir, 'Search-algoritms'))
+# Agregar la raíz del proyecto al path para importar el paquete solver
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
 
-# Importar módulos usando importlib para evitar problemas con nombres de archivo
 try:
-    # Importar N-8-Problem
-    n8_path = os.path.join(current_dir, 'Problems', 'N-8-Problem.py')
-    spec = importlib.util.spec_from_file_location("n8_mod", n8_path)
-    n8_mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(n8_mod)
-    EightPuzzle = n8_mod.EightPuzzle
-    
-    from Heuristics import HEURISTICS, GOAL
-    
-    # Importar algoritmos desde archivo con nombre complejo
-    algos_path = os.path.join(current_dir, 'Search-algoritms', 'BFS - DFS - Uniform Cost - Greedy - A - IDA.py')
-    spec = importlib.util.spec_from_file_location("algos_mod", algos_path)
-    algos_mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(algos_mod)
-
-    bfs = algos_mod.bfs
-    dfs = algos_mod.dfs
-    ucs = algos_mod.ucs
-    greedy = algos_mod.greedy
-    astar = algos_mod.astar
-    ida_star = algos_mod.ida_star
-    
+    from solver import EightPuzzle, bfs, dfs, ucs, greedy, astar, ida_star
+    from solver.problem import is_solvable as problem_is_solvable
+    from solver.profiling import PhaseProfile, format_phases
+    from Heuristics import GOAL, compile_heuristic
 except ImportError as e:
     print(f"Error al importar módulos: {e}")
     sys.exit(1)
@@ -65,18 +44,9 @@ def validate_state(state):
 
 def is_solvable(state):
     """Verifica si el estado es resoluble usando la paridad de inversiones"""
-    # Contar inversiones (excluyendo el 0)
-    tiles = [x for x in state if x != 0]
-    inversions = 0
-    for i in range(len(tiles)):
-        for j in range(i+1, len(tiles)):
-            if tiles[i] > tiles[j]:
-                inversions += 1
-    
-    # Para el 8-puzzle, es resoluble si el número de inversiones es par
-    return inversions % 2 == 0
+    return problem_is_solvable(state, 3, GOAL)
 
-def run_cli():
+def run_cli(profile=False, dump_prefix=None, memory=None):
     print("╔══════════════════════════════════════════════════════════╗")
     print("║              8-PUZZLE BUSCADORES (FASE 1)                ║")
     print("╚══════════════════════════════════════════════════════════╝")
@@ -174,27 +144,43 @@ def run_cli():
     print(f"\n⚡ Ejecutando {alg.upper()}{'(' + hname + ')' if hname else ''}...")
     print("   Por favor espera...")
     
+    prof = PhaseProfile() if profile else None
     try:
-        if alg == "bfs":
-            res = bfs(problem)
-        elif alg == "dfs":
-            res = dfs(problem, depth_limit=50)
-        elif alg == "ucs":
-            res = ucs(problem)
-        elif alg == "greedy":
-            h_func = lambda s: HEURISTICS[hname](s, GOAL)
-            res = greedy(problem, h_func)
-        elif alg == "astar":
-            h_func = lambda s: HEURISTICS[hname](s, GOAL)
-            res = astar(problem, h_func)
-        elif alg == "ida":
-            h_func = lambda s: HEURISTICS[hname](s, GOAL)
-            res = ida_star(problem, h_func)
+        with prof or nullcontext():
+            res = _run_algorithm(alg, hname, problem, memory=memory)
     except Exception as e:
         print(f"❌ Error durante la ejecución: {e}")
         return
     
-    # Mostrar resultados
+    if prof is not None:
+        print("\n⏱️  Perfil por fases (tiempos bajo cProfile):")
+        print(format_phases(prof.phases()))
+        if dump_prefix:
+            prof.dump_pstats(f"{dump_prefix}.prof")
+            prof.dump_collapsed(f"{dump_prefix}.folded")
+            print(f"💾 Perfil guardado en {dump_prefix}.prof y {dump_prefix}.folded")
+    
+    _show_results(res, alg, hname)
+
+def _run_algorithm(alg, hname, problem, memory=None):
+    """Ejecuta el algoritmo elegido sobre el problema"""
+    if alg == "bfs":
+        return bfs(problem, memory=memory)
+    elif alg == "dfs":
+        return dfs(problem, depth_limit=50, memory=memory)
+    elif alg == "ucs":
+        return ucs(problem, memory=memory)
+    h_func = compile_heuristic(hname, problem.goal, problem.width)
+    if alg == "greedy":
+        return greedy(problem, h_func, memory=memory)
+    elif alg == "astar":
+        return astar(problem, h_func, memory=memory)
+    elif alg == "ida":
+        return ida_star(problem, h_func, memory=memory)
+    raise ValueError(f"Algoritmo no reconocido: {alg}")
+
+def _show_results(res, alg, hname):
+    """Muestra los resultados de la búsqueda"""
     print("\n" + "="*60)
     print(f"📊 RESULTADOS")
     print("="*60)
@@ -207,7 +193,13 @@ def run_cli():
         print(f"📏 Profundidad: {res['depth']}")
         print(f"💰 Costo: {res['cost']}")
         print(f"🔍 Nodos expandidos: {res['expanded']}")
+        print(f"🌱 Nodos generados: {res['generated']} (duplicados: {res['duplicates']}, reabiertos: {res['reopened']}, podados: {res['pruned']})")
+        print(f"📚 Frontera máx.: {res['max_frontier']} | Cerrados máx.: {res['max_closed']}")
+        print(f"🌿 Factor de ramificación efectivo: {res['ebf']}")
         print(f"⏱️  Tiempo: {res['time']:.6f} segundos")
+        if res.get('peak_memory') is not None:
+            print(f"🧠 Memoria pico ({res['memory_mode']}): {res['peak_memory'] / 1024:.1f} KB "
+                  f"(~{res['bytes_per_node']} bytes/nodo)")
         if res['actions']:
             print(f"🗺️  Pasos (acciones): {' → '.join(res['actions'])}")
         
@@ -250,13 +242,13 @@ def run_batch_test():
         ("BFS", lambda: bfs(problem)),
         ("DFS", lambda: dfs(problem, depth_limit=10)),
         ("UCS", lambda: ucs(problem)),
-        ("Greedy(manhattan)", lambda: greedy(problem, lambda s: HEURISTICS["manhattan"](s, GOAL))),
-        ("A*(manhattan)", lambda: astar(problem, lambda s: HEURISTICS["manhattan"](s, GOAL))),
-        ("A*(misplaced)", lambda: astar(problem, lambda s: HEURISTICS["misplaced"](s, GOAL))),
+        ("Greedy(manhattan)", lambda: greedy(problem, compile_heuristic("manhattan", problem.goal))),
+        ("A*(manhattan)", lambda: astar(problem, compile_heuristic("manhattan", problem.goal))),
+        ("A*(misplaced)", lambda: astar(problem, compile_heuristic("misplaced", problem.goal))),
     ]
     
-    print(f"{'Algoritmo':<20} {'Éxito':<6} {'Prof.':<5} {'Costo':<6} {'Expandidos':<10} {'Tiempo(s)':<10}")
-    print("-" * 65)
+    print(f"{'Algoritmo':<20} {'Éxito':<6} {'Prof.':<5} {'Costo':<6} {'Expandidos':<10} {'Generados':<10} {'Tiempo(s)':<10}")
+    print("-" * 76)
     
     for name, algo_func in algorithms:
         try:
@@ -265,9 +257,10 @@ def run_batch_test():
             depth = result['depth'] if result['depth'] is not None else "N/A"
             cost = result['cost'] if result['cost'] is not None else "N/A"
             expanded = result['expanded']
+            generated = result['generated']
             time_taken = f"{result['time']:.4f}"
             
-            print(f"{name:<20} {success:<6} {depth:<5} {cost:<6} {expanded:<10} {time_taken:<10}")
+            print(f"{name:<20} {success:<6} {depth:<5} {cost:<6} {expanded:<10} {generated:<10} {time_taken:<10}")
         except Exception as e:
             print(f"{name:<20} ❌     N/A   N/A    N/A        Error")
 
@@ -278,9 +271,17 @@ if __name__ == "__main__":
             print("💡 Usa main_UI.py para la interfaz gráfica básica")
         elif sys.argv[1] == "--test":
             run_batch_test()
+        elif sys.argv[1] == "--profile":
+            run_cli(profile=True, dump_prefix=sys.argv[2] if len(sys.argv) > 2 else None)
+        elif sys.argv[1] == "--memory":
+            run_cli(memory=sys.argv[2] if len(sys.argv) > 2 else "tracemalloc")
         else:
             print("Opciones disponibles:")
             print("  --mobile  : Interfaz móvil (no implementado)")
             print("  --test    : Prueba rápida de algoritmos")
+            print("  --profile [PREFIJO] : Menú interactivo con perfil por fases")
+            print("                        (PREFIJO.prof / PREFIJO.folded para flamegraphs)")
+            print("  --memory [MODO]     : Menú interactivo midiendo memoria pico")
+            print("                        (MODO: tracemalloc | estimate)")
     else:
         run_cli()
\ No newline at end of file
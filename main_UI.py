@@ -1,43 +1,60 @@
 # main_UI.py (FASE 1: mínimo)
 import tkinter as tk
 from tkinter import ttk, messagebox
+import multiprocessing as mp
+import queue
 import sys
 import os
-import importlib.util
 
-# Agregar paths para imports
-current_dir = os.path.dirname(__file__)
-sys.path.append(current_dir)
-sys.path.append(os.path.join(current_dir, 'Problems'))
-sys.path.append(os.path.join(current_dir, 'Search-algoritms'))
+# Agregar la raíz del proyecto al path para importar el paquete solver
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
 
 try:
-    # Importar N-8-Problem usando importlib
-    n8_path = os.path.join(current_dir, 'Problems', 'N-8-Problem.py')
-    spec = importlib.util.spec_from_file_location("n8_mod", n8_path)
-    n8_mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(n8_mod)
-    EightPuzzle = n8_mod.EightPuzzle
-    
-    from Heuristics import HEURISTICS, GOAL
-    
-    # Importar algoritmos desde archivo con nombre complejo
-    algos_path = os.path.join(current_dir, 'Search-algoritms', 'BFS - DFS - Uniform Cost - Greedy - A - IDA.py')
-    spec = importlib.util.spec_from_file_location("algos_mod", algos_path)
-    algos_mod = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(algos_mod)
-
-    bfs = algos_mod.bfs
-    dfs = algos_mod.dfs
-    ucs = algos_mod.ucs
-    greedy = algos_mod.greedy
-    astar = algos_mod.astar
-    ida_star = algos_mod.ida_star
-    
+    from solver import EightPuzzle, bfs, dfs, ucs, greedy, astar, ida_star
+    from solver.stats import SearchObserver
+    from Heuristics import GOAL, compile_heuristic
 except ImportError as e:
     print(f"Error al importar módulos: {e}")
     sys.exit(1)
 
+POLL_MS = 100          # cada cuánto la ventana consulta al proceso de búsqueda
+PROGRESS_EVERY = 4096  # expansiones entre publicaciones del progreso
+CANCEL_GRACE_MS = 2000 # si el proceso no responde a Cancelar en este tiempo, se termina
+REPLAY_CHUNK = 25      # tableros del recorrido dibujados por tick de la ventana
+
+class _ProgressObserver(SearchObserver):
+    """Publica los nodos expandidos en un contador compartido (sin lock, solo lo escribe el hijo)"""
+    def __init__(self, counter):
+        self.counter = counter
+        self.expanded = 0
+
+    def on_expand(self, node):
+        self.expanded += 1
+        if self.expanded % PROGRESS_EVERY == 0:
+            self.counter.value = self.expanded
+
+def _solve_worker(initial_state, alg, hname, cancel, counter, results):
+    """Corre en otro proceso: resuelve y deja ('ok', resultado) o ('error', mensaje) en `results`"""
+    try:
+        problem = EightPuzzle(initial_state)
+        kwargs = {'cancel': cancel, 'observer': _ProgressObserver(counter)}
+        if alg == "bfs":
+            res = bfs(problem, **kwargs)
+        elif alg == "dfs":
+            res = dfs(problem, depth_limit=50, **kwargs)
+        elif alg == "ucs":
+            res = ucs(problem, **kwargs)
+        elif alg in ("greedy", "astar", "ida"):
+            h_func = compile_heuristic(hname, problem.goal)
+            algorithm = {"greedy": greedy, "astar": astar, "ida": ida_star}[alg]
+            res = algorithm(problem, h_func, **kwargs)
+        else:
+            raise ValueError("Algoritmo no reconocido")
+        results.put(('ok', res))
+    except Exception as e:
+        results.put(('error', str(e)))
+
 class PuzzleGUI:
     def __init__(self, root):
         self.root = root
@@ -50,7 +67,19 @@ class PuzzleGUI:
         self.h_var = tk.StringVar(value="manhattan")
         self.result_var = tk.StringVar(value="Listo para resolver...")
         
+        # Búsqueda en curso (proceso aparte para no congelar la ventana)
+        self._ctx = mp.get_context("spawn")
+        self.process = None
+        self.cancel_event = None
+        self.counter = None
+        self.results = None
+        self.job = None          # (algoritmo, heurística)
+        self._poll_id = None
+        self._kill_id = None
+        self._replay_id = None
+        
         self.setup_ui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
     def setup_ui(self):
         # Título
@@ -121,11 +150,20 @@ class PuzzleGUI:
                            command=lambda s=state: self.set_state(s))
             btn.pack(side="left", padx=5)
         
-        # Botón resolver
-        solve_btn = tk.Button(main_frame, text="🔍 Resolver", command=self.solve,
-                             bg="#4CAF50", fg="white", font=("Arial", 12, "bold"),
-                             pady=10)
-        solve_btn.pack(pady=20)
+        # Botones resolver / cancelar
+        buttons_frame = tk.Frame(main_frame)
+        buttons_frame.pack(pady=10)
+        
+        self.solve_btn = tk.Button(buttons_frame, text="🔍 Resolver", command=self.solve,
+                                   bg="#4CAF50", fg="white", font=("Arial", 12, "bold"),
+                                   pady=10)
+        self.solve_btn.pack(side="left", padx=5)
+        
+        self.cancel_btn = tk.Button(buttons_frame, text="⏹ Cancelar", command=self.cancel,
+                                    font=("Arial", 12), pady=10, state=tk.DISABLED)
+        self.cancel_btn.pack(side="left", padx=5)
+        
+        tk.Label(main_frame, textvariable=self.result_var, font=("Arial", 10)).pack()
         
         # Resultados
         result_frame = tk.LabelFrame(main_frame, text="Resultados", padx=10, pady=10)
@@ -168,55 +206,115 @@ class PuzzleGUI:
             return False, "Formato inválido. Use números separados por espacios"
     
     def solve(self):
-        """Ejecuta el algoritmo seleccionado"""
-        try:
-            # Validar entrada
-            input_str = self.entry.get().strip()
-            valid, result = self.validate_input(input_str)
-            
-            if not valid:
-                messagebox.showerror("Error", result)
-                return
-                
-            initial_state = result
-            
-            # Crear problema
-            problem = EightPuzzle(initial_state)
-            
-            # Obtener algoritmo y heurística
-            alg = self.alg_var.get()
-            hname = self.h_var.get()
-            
-            # Actualizar interfaz
-            self.result_text.delete(1.0, tk.END)
-            self.result_text.insert(tk.END, f"Ejecutando {alg.upper()}...\n")
-            self.result_text.update()
-            
-            # Ejecutar algoritmo
-            if alg == "bfs":
-                res = bfs(problem)
-            elif alg == "dfs":
-                res = dfs(problem, depth_limit=50)
-            elif alg == "ucs":
-                res = ucs(problem)
-            elif alg == "greedy":
-                h_func = lambda s: HEURISTICS[hname](s, GOAL)
-                res = greedy(problem, h_func)
-            elif alg == "astar":
-                h_func = lambda s: HEURISTICS[hname](s, GOAL)
-                res = astar(problem, h_func)
-            elif alg == "ida":
-                h_func = lambda s: HEURISTICS[hname](s, GOAL)
-                res = ida_star(problem, h_func)
-            else:
-                messagebox.showerror("Error", "Algoritmo no reconocido")
-                return
-            
-            # Mostrar resultados
-            self.display_results(res, alg, hname)
+        """Lanza el algoritmo seleccionado en un proceso aparte"""
+        if self.process is not None:
+            return
+        # Validar entrada
+        input_str = self.entry.get().strip()
+        valid, result = self.validate_input(input_str)
+        
+        if not valid:
+            messagebox.showerror("Error", result)
+            return
             
+        initial_state = result
+        
+        # Obtener algoritmo y heurística
+        alg = self.alg_var.get()
+        hname = self.h_var.get()
+        
+        # Actualizar interfaz
+        self._stop_replay()
+        self.result_text.delete(1.0, tk.END)
+        self.result_text.insert(tk.END, f"Ejecutando {alg.upper()}...\n")
+        self.result_var.set(f"Ejecutando {alg.upper()}...")
+        self.solve_btn.config(state=tk.DISABLED)
+        self.cancel_btn.config(state=tk.NORMAL)
+        
+        # Ejecutar algoritmo en otro proceso; la ventana lo consulta con root.after
+        try:
+            self.cancel_event = self._ctx.Event()
+            self.counter = self._ctx.Value('q', 0, lock=False)
+            self.results = self._ctx.Queue()
+            self.job = (alg, hname)
+            self.process = self._ctx.Process(
+                target=_solve_worker, daemon=True,
+                args=(initial_state, alg, hname, self.cancel_event, self.counter, self.results))
+            self.process.start()
         except Exception as e:
+            self._finish()
             messagebox.showerror("Error", f"Error durante la ejecución:\n{str(e)}")
+            return
+        self._poll_id = self.root.after(POLL_MS, self._poll)
+    
+    def cancel(self):
+        """Pide al proceso que termine; si no responde a tiempo, se termina a la fuerza"""
+        if self.process is None:
+            return
+        self.cancel_event.set()
+        self.cancel_btn.config(state=tk.DISABLED)
+        self.result_var.set("Cancelando...")
+        if self._kill_id is None:
+            self._kill_id = self.root.after(CANCEL_GRACE_MS, self._kill)
+    
+    def _kill(self):
+        self._kill_id = None
+        if self.process is not None and self.process.is_alive():
+            self.process.terminate()
+    
+    def _poll(self):
+        """Consulta progreso y resultado sin bloquear el bucle de Tk"""
+        self._poll_id = None
+        if self.process is None:
+            return
+        try:
+            kind, payload = self.results.get_nowait()
+        except queue.Empty:
+            if self.process.is_alive():
+                expanded = self.counter.value
+                if not self.cancel_event.is_set():
+                    self.result_var.set(f"Ejecutando {self.job[0].upper()}... {expanded:,} nodos expandidos")
+                self._poll_id = self.root.after(POLL_MS, self._poll)
+                return
+            # Terminó sin dejar resultado (terminado a la fuerza o se cayó)
+            kind = 'cancelled' if self.cancel_event.is_set() else 'error'
+            payload = "El proceso de búsqueda terminó inesperadamente"
+        if kind == 'ok' and payload.get('status') == 'cancelled':
+            kind = 'cancelled'
+        alg, hname = self.job
+        self._finish()
+        if kind == 'ok':
+            self.display_results(payload, alg, hname)
+        elif kind == 'cancelled':
+            self.result_text.delete(1.0, tk.END)
+            self.result_text.insert(tk.END, "⏹ Búsqueda cancelada\n")
+            self.result_var.set("Cancelado")
+        else:
+            self.result_var.set("Error")
+            messagebox.showerror("Error", f"Error durante la ejecución:\n{payload}")
+    
+    def _finish(self):
+        """Libera el proceso y deja la interfaz lista para otra búsqueda"""
+        for after_id in (self._poll_id, self._kill_id):
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+        self._poll_id = self._kill_id = None
+        if self.process is not None:
+            self.process.join(timeout=0.5)
+            if self.process.is_alive():
+                self.process.terminate()
+        if self.results is not None:
+            self.results.close()
+        self.process = self.cancel_event = self.counter = self.results = self.job = None
+        self.solve_btn.config(state=tk.NORMAL)
+        self.cancel_btn.config(state=tk.DISABLED)
+    
+    def on_close(self):
+        if self.process is not None:
+            self.cancel_event.set()
+            self.process.terminate()
+            self._finish()
+        self.root.destroy()
     
     def display_results(self, result, algorithm, heuristic):
         """Muestra los resultados en la interfaz"""
@@ -246,13 +344,12 @@ class PuzzleGUI:
                 actions_text = " → ".join(result['actions'])
                 self.result_text.insert(tk.END, f"   {actions_text}\n\n")
             
-            # Mostrar algunos estados clave
+            # Recorrido paso a paso, dibujado por partes para no bloquear la ventana
             if result['path'] and len(result['path']) > 1:
-                self.result_text.insert(tk.END, "📋 Estados clave:\n\n")
+                self.result_text.insert(tk.END, "📋 Recorrido paso a paso:\n\n")
                 self.result_text.insert(tk.END, "Estado inicial:\n")
                 self.display_board(result['path'][0])
-                self.result_text.insert(tk.END, "\nEstado final:\n")
-                self.display_board(result['path'][-1])
+                self._replay_id = self.root.after(0, self._replay, result['path'], result['actions'], 1)
         else:
             self.result_text.insert(tk.END, "❌ No se encontró solución\n\n")
             self.result_text.insert(tk.END, f"🔍 Nodos expandidos: {result['expanded']}\n")
@@ -262,6 +359,25 @@ class PuzzleGUI:
                 self.result_text.insert(tk.END, "💡 Nota: DFS tiene límite de profundidad.\n")
             elif algorithm == "ida":
                 self.result_text.insert(tk.END, "💡 Nota: IDA* alcanzó el límite máximo.\n")
+        self.result_var.set("✅ Resuelto" if result['success'] else "Sin solución")
+    
+    def _replay(self, path, actions, start):
+        """Agrega REPLAY_CHUNK tableros del recorrido y agenda el resto"""
+        end = min(start + REPLAY_CHUNK, len(path))
+        for i in range(start, end):
+            self.result_text.insert(tk.END, f"\nPaso {i}: {actions[i - 1]}\n")
+            self.display_board(path[i])
+        if end < len(path):
+            self.result_var.set(f"Dibujando recorrido... {end}/{len(path) - 1}")
+            self._replay_id = self.root.after(1, self._replay, path, actions, end)
+        else:
+            self._replay_id = None
+            self.result_var.set("✅ Resuelto")
+    
+    def _stop_replay(self):
+        if self._replay_id is not None:
+            self.root.after_cancel(self._replay_id)
+            self._replay_id = None
     
     def display_board(self, state):
         """Muestra un tablero en formato texto"""
@@ -0,0 +1,52 @@
+"""Paquete importable del solucionador del N-puzzle.
+
+Los submódulos se cargan de forma perezosa: ``import solver`` es casi gratis y
+cada módulo se importa la primera vez que se accede a uno de sus nombres.
+"""
+import importlib
+
+_SUBMODULES = ("problem", "search", "ranking", "tables", "planner", "stats", "realtime", "checkpoint",
+               "backward", "arena", "external", "generator", "vectorized", "memory", "profiling")
+
+# nombre público -> submódulo que lo define
+_EXPORTS = {
+    "SlidingPuzzle": "problem",
+    "EightPuzzle": "problem",
+    "Puzzle": "problem",
+    "PuzzleState": "problem",
+    "GOAL": "problem",
+    "is_solvable": "problem",
+    "bfs": "search",
+    "dfs": "search",
+    "ucs": "search",
+    "greedy": "search",
+    "astar": "search",
+    "ida_star": "search",
+    "ara_star": "search",
+    "beam_search": "search",
+    "bounded_best_first": "search",
+    "lrta_star": "realtime",
+    "LearnedTable": "realtime",
+    "Checkpointer": "checkpoint",
+    "BackwardTree": "backward",
+    "SearchObserver": "stats",
+    "rank": "ranking",
+    "unrank": "ranking",
+    "preload": "tables",
+    "choose": "planner",
+}
+
+__all__ = list(_SUBMODULES) + list(_EXPORTS)
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f"{__name__}.{name}")
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
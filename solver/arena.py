@@ -0,0 +1,154 @@
+"""Almacén de nodos por columnas (struct-of-arrays) para búsquedas grandes.
+
+En vez de un objeto Node por hijo generado (~90 bytes + tupla del estado,
+todos vigilados por el recolector de basura), cada nodo es un índice en
+columnas de `array`:
+
+    states   estados empaquetados, `width` bytes por nodo (casillas < 256)
+    parent   índice del padre (-1 en la raíz)
+    action   código de la acción (índice en la tabla de acciones distintas)
+    g, h     costo acumulado y heurística
+
+~30 bytes por nodo en total. Las fronteras guardan índices enteros (bfs en un
+IndexQueue de 4 bytes por entrada) y los cerrados la clave `bytes(estado)` en
+lugar de la tupla.
+
+`ArenaNode` es una vista con la misma interfaz que Abstractions.Node (state,
+parent, action, g, depth, f), así que reconstruct_path / reconstruct_actions
+y los observadores funcionan sin cambios recorriendo las columnas.
+"""
+from array import array
+from typing import Any, Dict, List, Optional, Sequence
+import sys
+
+# Modos del argumento `nodes` de bfs / ucs / astar
+OBJECTS = 'objects'
+ARENA = 'arena'
+NODE_MODES = (OBJECTS, ARENA)
+
+class NodeArena:
+    """Nodos de búsqueda en columnas; `add` devuelve el índice del nodo"""
+    sizes_entries = True  # __sizeof__ ya incluye los nodos (ver MemoryMonitor)
+
+    def __init__(self, width: int):
+        self.width = width
+        self.states = bytearray()
+        self.parent = array('i')
+        self.action = array('B')
+        self.g = array('d')
+        self.h = array('d')
+        self._actions: List[Any] = []
+        self._codes: Dict[Any, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.parent)
+
+    def __sizeof__(self) -> int:
+        return (object.__sizeof__(self) + sys.getsizeof(self.states) + sys.getsizeof(self.parent)
+                + sys.getsizeof(self.action) + sys.getsizeof(self.g) + sys.getsizeof(self.h))
+
+    def add(self, key: bytes, parent: int = -1, action: Any = None, g: float = 0.0, h: float = 0.0) -> int:
+        """Agrega un nodo con el estado ya empaquetado (`key = bytes(estado)`)"""
+        code = self._codes.get(action)
+        if code is None:
+            code = self._codes[action] = len(self._actions)
+            self._actions.append(action)
+        self.states += key
+        self.parent.append(parent)
+        self.action.append(code)
+        self.g.append(g)
+        self.h.append(h)
+        return len(self.parent) - 1
+
+    def state(self, index: int) -> tuple:
+        start = index * self.width
+        return tuple(self.states[start:start + self.width])
+
+    def key(self, index: int) -> bytes:
+        start = index * self.width
+        return bytes(self.states[start:start + self.width])
+
+    def action_of(self, index: int) -> Any:
+        return self._actions[self.action[index]]
+
+    def node(self, index: int) -> 'ArenaNode':
+        return ArenaNode(self, index)
+
+class IndexQueue:
+    """Cola FIFO de índices del arena en un array('i') (4 bytes por entrada)"""
+    sizes_entries = True
+
+    def __init__(self):
+        self._a = array('i')
+        self._head = 0
+
+    def push(self, index: int) -> None:
+        self._a.append(index)
+
+    def pop(self) -> int:
+        if self._head == len(self._a): raise IndexError("pop from empty IndexQueue")
+        index = self._a[self._head]
+        self._head += 1
+        # Compactar cuando la mitad del array ya se consumió (O(1) amortizado)
+        if self._head >= 4096 and self._head * 2 >= len(self._a):
+            del self._a[:self._head]
+            self._head = 0
+        return index
+
+    def is_empty(self) -> bool:
+        return self._head == len(self._a)
+
+    def __len__(self) -> int:
+        return len(self._a) - self._head
+
+    def __sizeof__(self) -> int:
+        return object.__sizeof__(self) + sys.getsizeof(self._a)
+
+def pack(state: Sequence[int]) -> bytes:
+    """Clave compacta del estado (casillas entre 0 y 255)"""
+    return bytes(state)
+
+def entry_size(key: bytes) -> int:
+    """Bytes por entrada de frontera/cerrados en modo arena (clave + g o índice)"""
+    return sys.getsizeof(key) + sys.getsizeof(0.0)
+
+class ArenaNode:
+    """Vista de un nodo del arena con la interfaz de Abstractions.Node"""
+    __slots__ = ("arena", "index")
+
+    def __init__(self, arena: NodeArena, index: int):
+        self.arena = arena
+        self.index = index
+
+    @property
+    def state(self) -> tuple:
+        return self.arena.state(self.index)
+
+    @property
+    def parent(self) -> Optional['ArenaNode']:
+        parent = self.arena.parent[self.index]
+        return ArenaNode(self.arena, parent) if parent >= 0 else None
+
+    @property
+    def action(self) -> Any:
+        return self.arena.action_of(self.index)
+
+    @property
+    def g(self) -> float:
+        return self.arena.g[self.index]
+
+    @property
+    def f(self) -> float:
+        return self.arena.g[self.index] + self.arena.h[self.index]
+
+    @property
+    def depth(self) -> int:
+        depth, parent = 0, self.arena.parent
+        index = parent[self.index]
+        while index >= 0:
+            depth += 1
+            index = parent[index]
+        return depth
+
+    def __repr__(self) -> str:
+        return f"ArenaNode({self.index}, state={self.state}, g={self.g})"
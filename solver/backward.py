@@ -0,0 +1,258 @@
+"""Un objetivo, muchos inicios: árbol BFS hacia atrás compartido.
+
+Para resolver miles de tableros contra la misma meta, en lugar de un A* por
+tablero se hace crecer un solo árbol BFS desde la meta (los movimientos del
+N-puzzle son reversibles y de costo 1, así que la capa d son los estados a
+distancia d). Cada consulta:
+
+    1. si el inicio ya está en el árbol, el camino óptimo es seguir los padres;
+    2. si no, el árbol crece capa por capa (bajo demanda) hasta alcanzarlo;
+    3. si no hay espacio para crecer, o el inicio pudo estar en una región ya
+       desalojada, A* desde el inicio con h = profundidad exacta en el árbol
+       (y la heurística base fuera de él) hasta el primer estado del árbol.
+       Al sacar un estado del árbol su f es exacta y mínima: el camino es óptimo.
+
+La memoria se acota con `max_states`: para hacer lugar se desalojan hojas del
+árbol (nunca las dos últimas capas, que hacen falta para crecer) empezando por
+las que nadie consultó o que se consultaron hace más tiempo. Como solo se
+desalojan hojas, todo estado que queda conserva su cadena de padres hasta la meta.
+
+Uso:
+    python -m solver.generator build --width 3 --per-stratum 16 --seed 7 -o corpus_3x3.bin
+    python -m solver.backward solve-file corpus_3x3.bin --max-states 50000 --verify
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+import heapq
+import time
+
+from Abstractions import Node
+from Heuristics import compile_heuristic
+from .problem import SlidingPuzzle, default_goal, is_solvable
+from .search import SearchResult, astar, _solution, _failure, EXHAUSTED, CANCELLED
+from .stats import SearchStats
+
+State = Tuple[int, ...]
+
+# Origen de cada respuesta (result['source'])
+TREE = 'tree'      # el inicio ya estaba en el árbol
+GROWN = 'grown'    # se alcanzó haciendo crecer el árbol
+SEARCH = 'search'  # A* hasta el árbol
+
+class BackwardTree:
+    """Árbol BFS desde `goal` compartido por todas las consultas (ver el módulo)"""
+    def __init__(self, goal: Optional[State] = None, width: Optional[int] = None, size: Optional[int] = None,
+                 h: Optional[Callable[[State], float]] = None, max_states: int = 2_000_000):
+        if goal is None:
+            goal = default_goal(size or 9)
+        self.goal = tuple(goal)
+        self.problem = SlidingPuzzle(self.goal, self.goal, width, pruning=False)
+        self.width = self.problem.width
+        self.h = h or compile_heuristic("manhattan", self.goal, self.width)
+        self.max_states = max_states
+        self.depth = 0                 # profundidad de la última capa completa
+        self.evicted = 0
+        self._nodes: Dict[State, Tuple[Optional[State], int]] = {self.goal: (None, 0)}  # estado -> (padre, d)
+        self._children: Dict[State, int] = {}   # hijos en el árbol (solo si tiene alguno)
+        self._used: Dict[State, int] = {}       # última consulta que pasó por el estado
+        self._tick = 0
+        self._cold: List[Tuple[int, State]] = []  # hojas candidatas a desalojo (montículo por _used)
+        self._previous: List[State] = []
+        self._layer: List[State] = [self.goal]
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, state: State) -> bool:
+        return state in self._nodes
+
+    def distance(self, state: State) -> Optional[int]:
+        """Distancia exacta a la meta si el estado está en el árbol"""
+        entry = self._nodes.get(state)
+        return entry[1] if entry is not None else None
+
+    # -- crecimiento y desalojo ---------------------------------------------
+
+    def _grow(self, stats: SearchStats) -> bool:
+        """Agrega la capa siguiente; False si el árbol está completo o no hay lugar"""
+        if not self._layer:
+            return False
+        # Cota gruesa de la capa nueva (el 8-puzzle ramifica < 2 sin contar al padre)
+        room = len(self._nodes) + 2 * len(self._layer) - self.max_states
+        if room > 0 and self._evict(room) < room:
+            return False
+        nodes, children = self._nodes, self._children
+        depth = self.depth + 1
+        following = []
+        for state in self._layer:
+            stats.expanded += 1
+            for _, child, _ in self.problem.successors(state):
+                stats.generated += 1
+                if child in nodes:
+                    stats.duplicates += 1
+                    continue
+                nodes[child] = (state, depth)
+                children[state] = children.get(state, 0) + 1
+                following.append(child)
+        # La capa d-1 deja de hacer falta para crecer: sus hojas ya se pueden desalojar
+        for state in self._previous:
+            if state not in children and state in nodes:
+                heapq.heappush(self._cold, (self._used.get(state, 0), state))
+        self._previous, self._layer = self._layer, following
+        self.depth = depth if following else self.depth
+        if len(following) > stats.max_frontier: stats.max_frontier = len(following)
+        return bool(following)
+
+    def _evict(self, count: int) -> int:
+        """Desaloja hasta `count` hojas frías; devuelve cuántas"""
+        nodes, children, used = self._nodes, self._children, self._used
+        removed = 0
+        while removed < count and self._cold:
+            tick, state = heapq.heappop(self._cold)
+            entry = nodes.get(state)
+            # Entradas viejas: ya desalojado, ganó hijos o se consultó después
+            if entry is None or state in children or used.get(state, 0) != tick:
+                continue
+            parent, _ = entry
+            del nodes[state]
+            used.pop(state, None)
+            removed += 1
+            remaining = children[parent] - 1
+            if remaining:
+                children[parent] = remaining
+            else:
+                del children[parent]
+                if parent != self.goal:
+                    heapq.heappush(self._cold, (used.get(parent, 0), parent))
+        self.evicted += removed
+        return removed
+
+    def _chain(self, state: State) -> List[State]:
+        """Estados desde `state` hasta la meta siguiendo los padres (y los marca como usados)"""
+        self._tick += 1
+        chain = []
+        while state is not None:
+            chain.append(state)
+            self._used[state] = self._tick
+            state = self._nodes[state][0]
+        if chain[0] not in self._children and self._nodes[chain[0]][1] < self.depth - 1:
+            heapq.heappush(self._cold, (self._tick, chain[0]))
+        return chain
+
+    # -- consultas -----------------------------------------------------------
+
+    def _result(self, path: List[State], stats: SearchStats, start_time: float, source: str) -> SearchResult:
+        node = Node(path[0])
+        for state in path[1:]:
+            for action, child, cost in self.problem.successors(node.state):
+                if child == state:
+                    node = Node(child, node, action, cost)
+                    break
+        result = _solution(node, stats, start_time)
+        result['source'] = source
+        result['tree_states'] = len(self._nodes)
+        return result
+
+    def solve(self, start: Iterable[int], cancel=None) -> SearchResult:
+        """Camino óptimo de `start` a la meta, reutilizando (y ampliando) el árbol"""
+        start_time = time.perf_counter()
+        start = tuple(start)
+        stats = SearchStats()
+        if len(start) != len(self.goal) or not is_solvable(start, self.width, self.goal):
+            return _failure(stats, start_time)
+        source = TREE
+        while start not in self._nodes:
+            # Con desalojos, un inicio no más profundo que el árbol pudo haber estado en él
+            if self.evicted and self.h(start) <= self.depth:
+                break
+            if cancel is not None and cancel.is_set():
+                return _failure(stats, start_time, CANCELLED)
+            if not self._grow(stats):
+                break
+            source = GROWN
+        if start in self._nodes:
+            return self._result(self._chain(start), stats, start_time, source)
+
+        nodes, base = self._nodes, self.h
+        def h(state):
+            entry = nodes.get(state)
+            return entry[1] if entry is not None else base(state)
+        found = astar(_TowardTree(start, self), h, cancel=cancel)
+        for name in ('expanded', 'generated', 'duplicates', 'reopened'):
+            setattr(stats, name, getattr(stats, name) + found[name])
+        if not found['success']:
+            return _failure(stats, start_time, found['status'])
+        path = found['path'][:-1] + self._chain(found['path'][-1])
+        return self._result(path, stats, start_time, SEARCH)
+
+    def solve_many(self, starts: Iterable[Iterable[int]], cancel=None) -> List[SearchResult]:
+        """solve para cada inicio (los menos profundos primero, así el árbol crece una vez)"""
+        starts = [tuple(s) for s in starts]
+        order = sorted(range(len(starts)), key=lambda i: self.h(starts[i]))
+        results: List[Optional[SearchResult]] = [None] * len(starts)
+        for i in order:
+            results[i] = self.solve(starts[i], cancel)
+        return results
+
+    def info(self) -> Dict[str, Any]:
+        return {'states': len(self._nodes), 'depth': self.depth, 'frontier': len(self._layer),
+                'complete': not self._layer, 'evicted': self.evicted, 'max_states': self.max_states}
+
+class _TowardTree(SlidingPuzzle):
+    """Problema auxiliar: cualquier estado del árbol es meta"""
+    def __init__(self, initial: State, tree: BackwardTree):
+        super().__init__(initial, tree.goal, tree.width)
+        self.tree = tree
+
+    def is_goal(self, state: State) -> bool:
+        return state in self.tree._nodes
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    from .generator import load
+    parser = argparse.ArgumentParser(prog="python -m solver.backward",
+                                     description="Resolver un corpus de tableros con un árbol BFS compartido")
+    sub = parser.add_subparsers(dest="command", required=True)
+    f = sub.add_parser("solve-file", help="resolver todos los tableros de un corpus (solver.generator)")
+    f.add_argument("path")
+    f.add_argument("--max-states", type=int, default=2_000_000, help="estados como máximo en el árbol")
+    f.add_argument("--verify", action="store_true", help="comparar cada largo con un A* independiente")
+    args = parser.parse_args(argv)
+
+    corpus = load(args.path)
+    starts = [board.state for board in corpus.boards]
+    tree = BackwardTree(size=corpus.width * corpus.height, width=corpus.width, max_states=args.max_states)
+    t0 = time.perf_counter()
+    results = tree.solve_many(starts)
+    elapsed = time.perf_counter() - t0
+    sources: Dict[str, int] = {}
+    wrong = 0
+    for board, result in zip(corpus.boards, results):
+        if not result['success']:
+            print(f"  ✗ {board.state}: {result['status']}")
+            wrong += 1
+            continue
+        sources[result['source']] = sources.get(result['source'], 0) + 1
+        # Corpus exacto: el largo guardado es el óptimo; si no, Manhattan es una cota inferior
+        if result['depth'] != board.depth if corpus.exact else result['depth'] < board.depth:
+            print(f"  ✗ {board.state}: {result['depth']} movimientos, el corpus dice {board.depth}")
+            wrong += 1
+    print(f"{len(starts)} tableros {corpus.width}x{corpus.height} en {elapsed:.2f}s  "
+          f"{' '.join(f'{k}={v}' for k, v in sorted(sources.items()))}  {tree.info()}")
+    if args.verify:
+        h = compile_heuristic("manhattan", tree.goal, tree.width)
+        t0 = time.perf_counter()
+        for start, result in zip(starts, results):
+            independent = astar(SlidingPuzzle(start, tree.goal, tree.width), h)
+            if result['success'] and independent['depth'] != result['depth']:
+                print(f"  ✗ {start}: árbol {result['depth']}, A* {independent['depth']}")
+                wrong += 1
+        print(f"A* independiente: {time.perf_counter() - t0:.2f}s")
+    if wrong:
+        print(f"❌ {wrong} tableros con respuestas incorrectas")
+        return 1
+    print("✅ Todas las respuestas son óptimas" if corpus.exact or args.verify else "✅ Todos resueltos")
+    return 0
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(_main(sys.argv[1:]))
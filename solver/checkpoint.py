@@ -0,0 +1,167 @@
+"""Checkpoints de búsquedas largas: instantánea periódica en disco y reanudación.
+
+ida_star y astar aceptan `checkpoint` (ruta o Checkpointer) y
+`checkpoint_interval` (segundos). Cada intervalo guardan su estado completo:
+
+    ida_star  cota actual y pila DFS (por nivel: siguiente hijo y mínimo f
+              podado); unos pocos bytes por nivel
+    astar     lista abierta (el arreglo del montículo tal cual, con su
+              contador de desempate), cerrados (best_g) y los nodos vivos
+
+El checkpoint queda ligado al algoritmo, al tablero (y su ancho), a la meta, a
+la heurística (heuristic_name) y a los parámetros. Si el archivo existe al empezar, la
+búsqueda continúa desde él y termina con el mismo resultado (camino y
+contadores) que una corrida sin interrupciones.
+Al cancelar se guarda una última instantánea; al terminar, el archivo se borra.
+El resultado incluye result['checkpoint'] con escrituras, bytes y tiempo gastado.
+
+Formato: MAGIC + versión + pickle comprimido con zlib. Solo deben cargarse
+checkpoints escritos por este mismo proceso o por otro de confianza (pickle).
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import pickle
+import time
+import zlib
+
+from Abstractions import Node
+
+MAGIC = b"NPZK"
+VERSION = 3  # 2: la meta incluye la heurística; 3: y el ancho del tablero
+
+class Checkpointer:
+    """Guarda y recupera instantáneas de una búsqueda en `path`"""
+    def __init__(self, path: str, interval: float = 60.0, check_every: int = 256):
+        self.path = path
+        self.interval = interval
+        self.check_every = check_every  # consultar el reloj cada tantas llamadas a due()
+        self.writes = 0
+        self.bytes = 0
+        self.write_time = 0.0
+        self.resumed = False
+        self._meta: Dict[str, Any] = {}
+        self._calls = 0
+        self._last = time.perf_counter()
+
+    def bind(self, algorithm: str, problem, **params) -> Optional[Dict[str, Any]]:
+        """Asocia el checkpoint a una búsqueda; devuelve la instantánea previa si existe"""
+        self._meta = dict(params, algorithm=algorithm, initial=problem.initial_state(),
+                          goal=getattr(problem, "goal", None), width=getattr(problem, "width", None))
+        self._last = time.perf_counter()
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        if data[:4] != MAGIC or data[4] != VERSION:
+            raise ValueError(f"{self.path} no es un checkpoint de búsqueda (versión {VERSION})")
+        snapshot = pickle.loads(zlib.decompress(data[5:]))
+        if snapshot["meta"] != self._meta:
+            raise ValueError(f"{self.path} es de otra búsqueda: {snapshot['meta']}")
+        self.resumed = True
+        return snapshot["state"]
+
+    def due(self) -> bool:
+        """True cuando pasó el intervalo desde la última escritura"""
+        self._calls += 1
+        if self._calls < self.check_every:
+            return False
+        self._calls = 0
+        return time.perf_counter() - self._last >= self.interval
+
+    def save(self, state: Dict[str, Any]) -> None:
+        """Escribe la instantánea de forma atómica (archivo temporal + rename)"""
+        t0 = time.perf_counter()
+        payload = zlib.compress(pickle.dumps({"meta": self._meta, "state": state}, pickle.HIGHEST_PROTOCOL), 1)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + bytes([VERSION]) + payload)
+        os.replace(tmp, self.path)
+        self.writes += 1
+        self.bytes = len(payload) + 5
+        self._last = time.perf_counter()
+        self.write_time += self._last - t0
+
+    def discard(self) -> None:
+        """La búsqueda terminó: el checkpoint ya no sirve"""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'interval': self.interval,
+            'resumed': self.resumed,
+            'writes': self.writes,
+            'bytes': self.bytes,  # tamaño de la última instantánea
+            'write_time': self.write_time,
+        }
+
+def heuristic_name(h) -> str:
+    """Identidad de una heurística que se mantiene entre procesos (no id(h))
+
+    Las compiladas por Heuristics.compile_heuristic se llaman como la heurística
+    (la meta ya está en la meta del checkpoint); otras funciones, por módulo y
+    nombre calificado; los objetos invocables pueden definir `heuristic_name`.
+    """
+    name = getattr(h, "heuristic_name", None)
+    if name:
+        return name
+    func = getattr(h, "__func__", h)
+    qualname = getattr(func, "__qualname__", None) or type(h).__qualname__
+    module = getattr(func, "__module__", None) or type(h).__module__
+    return f"{module}.{qualname}"
+
+def checkpointer(checkpoint=None, interval: float = 60.0) -> Optional[Checkpointer]:
+    """Checkpointer para los argumentos `checkpoint`/`checkpoint_interval` (ruta o instancia)"""
+    if checkpoint is None or isinstance(checkpoint, Checkpointer):
+        return checkpoint
+    return Checkpointer(checkpoint, interval)
+
+def stats_state(stats) -> Dict[str, Any]:
+    return {name: getattr(stats, name) for name in stats.__slots__}
+
+def restore_stats(stats, state: Dict[str, Any]) -> None:
+    for name, value in state.items():
+        setattr(stats, name, value)
+
+def flatten_nodes(nodes) -> Tuple[List[tuple], Dict[int, int]]:
+    """Registros (estado, padre, acción, g, profundidad, f) de los nodos y sus ancestros
+
+    Devuelve también id(nodo) -> índice; los padres siempre preceden a los hijos.
+    """
+    index: Dict[int, int] = {}
+    records: List[tuple] = []
+    for node in nodes:
+        chain = []
+        while node is not None and id(node) not in index:
+            chain.append(node)
+            node = node.parent
+        for n in reversed(chain):
+            parent = index[id(n.parent)] if n.parent is not None else -1
+            index[id(n)] = len(records)
+            records.append((n.state, parent, n.action, n.g, n.depth, n.f))
+    return records, index
+
+def rebuild_nodes(records: List[tuple]) -> List[Node]:
+    """Inversa de flatten_nodes"""
+    nodes: List[Node] = []
+    for state, parent, action, g, depth, f in records:
+        node = Node.__new__(Node)
+        node.state, node.action, node.g, node.depth, node.f = state, action, g, depth, f
+        node.parent = nodes[parent] if parent >= 0 else None
+        nodes.append(node)
+    return nodes
+
+def heap_state(heap) -> Dict[str, Any]:
+    """Instantánea de un MinHeap de nodos (entradas con índices en lugar de nodos)"""
+    entries, counter = heap.snapshot()
+    records, index = flatten_nodes(entry[2] for entry in entries)
+    return {'entries': [(priority, key, index[id(node)]) for priority, key, node in entries],
+            'counter': counter, 'nodes': records}
+
+def restore_heap(heap, state: Dict[str, Any]) -> None:
+    nodes = rebuild_nodes(state['nodes'])
+    heap.restore([(priority, key, nodes[i]) for priority, key, i in state['entries']], state['counter'])
@@ -0,0 +1,288 @@
+"""BFS en memoria externa con detección diferida de duplicados (Korf, 2008).
+
+Para enumerar espacios completos que no caben en un set (3x4 y 2x6: 239
+millones de estados alcanzables) cada capa vive en disco como un archivo de
+estados empaquetados, ordenados y sin repetir:
+
+    1. se expande la capa d en bloques de `buffer` hijos; cada bloque se ordena,
+       se deduplica y se escribe como una corrida (run) ordenada;
+    2. las corridas se mezclan (k-way merge) descartando repetidos y los estados
+       de las capas d y d-1 (en un grafo no dirigido no hay otros vecinos), y el
+       resultado es la capa d+1.
+
+La memoria queda acotada por `buffer`. Cada capa terminada se anota en
+manifest.json, así que una corrida interrumpida continúa desde la última capa
+completa. Opcionalmente se escribe una tabla de distancias por rango de
+permutación con el formato de solver/tables.py (mapeable con mmap).
+
+Uso:
+    python -m solver.external run --width 4 --height 3 --dir /tmp/bfs_3x4 --table distance_3x4.bin
+    python -m solver.external info --dir /tmp/bfs_3x4
+"""
+from typing import Callable, Iterable, Iterator, List, Optional
+import glob
+import heapq
+import json
+import mmap
+import os
+import sys
+import time
+
+from .problem import default_goal
+from .ranking import num_permutations, rank
+from . import tables
+
+MANIFEST = "manifest.json"
+READ_RECORDS = 1 << 16  # registros por lectura al recorrer una capa o corrida
+
+# Estados empaquetados: 4 bits por casilla en un entero; en big-endian el orden
+# de los bytes coincide con el orden numérico (los archivos quedan ordenados).
+
+def pack(state: Iterable[int]) -> int:
+    value = 0
+    for tile in state:
+        value = (value << 4) | tile
+    return value
+
+def unpack(value: int, n: int) -> tuple:
+    return tuple((value >> (4 * (n - 1 - i))) & 0xF for i in range(n))
+
+def record_size(n: int) -> int:
+    return (4 * n + 7) // 8
+
+def _read(path: str, size: int) -> Iterator[int]:
+    """Recorre un archivo de estados empaquetados en orden"""
+    from_bytes = int.from_bytes
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(size * READ_RECORDS)
+            if not block:
+                return
+            for offset in range(0, len(block), size):
+                yield from_bytes(block[offset:offset + size], "big")
+
+def _write(path: str, values: Iterable[int], size: int) -> int:
+    """Escribe los estados (ya ordenados) de forma atómica; devuelve cuántos"""
+    count = 0
+    chunk: List[bytes] = []
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        for value in values:
+            chunk.append(value.to_bytes(size, "big"))
+            if len(chunk) >= READ_RECORDS:
+                f.write(b"".join(chunk))
+                count += len(chunk)
+                chunk.clear()
+        f.write(b"".join(chunk))
+        count += len(chunk)
+    os.replace(tmp, path)
+    return count
+
+def _subtract(values: Iterator[int], *excluded: Iterator[int]) -> Iterator[int]:
+    """Valores únicos de `values` (ordenados) que no están en ningún `excluded` (ordenados)"""
+    heads = [next(it, None) for it in excluded]
+    last = None
+    for value in values:
+        if value == last:
+            continue
+        last = value
+        seen = False
+        for k, it in enumerate(excluded):
+            head = heads[k]
+            while head is not None and head < value:
+                head = next(it, None)
+            heads[k] = head
+            if head == value:
+                seen = True
+        if not seen:
+            yield value
+
+class ExternalBFS:
+    """BFS por capas en disco desde `start` (por defecto la meta canónica)"""
+    def __init__(self, directory: str, width: int, height: int, start: Optional[tuple] = None,
+                 buffer: int = 1 << 20):
+        self.directory = directory
+        self.width = width
+        self.height = height
+        self.n = width * height
+        if self.n > 16:
+            raise ValueError("El empaquetado de 4 bits por casilla admite hasta 16 casillas")
+        self.start = tuple(start) if start is not None else default_goal(self.n)
+        self.buffer = buffer
+        self.size = record_size(self.n)
+        self.counts: List[int] = []
+        self.complete = False
+        os.makedirs(directory, exist_ok=True)
+        self._load_manifest()
+
+    # -- archivos ----------------------------------------------------------
+
+    def layer_path(self, depth: int) -> str:
+        return os.path.join(self.directory, f"layer_{depth:04d}.bin")
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.directory, MANIFEST)
+
+    def _load_manifest(self) -> None:
+        try:
+            with open(self._manifest_path()) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return
+        if (manifest["width"], manifest["height"], tuple(manifest["start"])) != (self.width, self.height, self.start):
+            raise ValueError(f"{self.directory} tiene otra búsqueda ({manifest['width']}x{manifest['height']}, "
+                             f"inicio {manifest['start']}); usa otro directorio")
+        self.counts = manifest["layers"]
+        self.complete = manifest["complete"]
+
+    def _save_manifest(self) -> None:
+        manifest = {"width": self.width, "height": self.height, "start": list(self.start),
+                    "layers": self.counts, "complete": self.complete}
+        tmp = self._manifest_path() + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self._manifest_path())
+
+    def layer(self, depth: int) -> Iterator[tuple]:
+        """Estados de la capa `depth` (desempaquetados, en orden)"""
+        for value in _read(self.layer_path(depth), self.size):
+            yield unpack(value, self.n)
+
+    # -- búsqueda ----------------------------------------------------------
+
+    def _children(self) -> Callable[[int], List[int]]:
+        """Vecinos de un estado empaquetado (mover el hueco = sumar/restar la ficha desplazada)"""
+        n = self.n
+        shifts = [4 * (n - 1 - i) for i in range(n)]
+        neighbors = tables._neighbors(self.width, self.height)
+
+        def children(value: int) -> List[int]:
+            i = 0
+            while (value >> shifts[i]) & 0xF:
+                i += 1
+            result = []
+            for j in neighbors[i]:
+                tile = (value >> shifts[j]) & 0xF
+                result.append(value + (tile << shifts[i]) - (tile << shifts[j]))
+            return result
+        return children
+
+    def _expand(self, depth: int) -> List[str]:
+        """Hijos de la capa `depth` en corridas ordenadas y sin repetidos"""
+        children = self._children()
+        runs: List[str] = []
+        block: List[int] = []
+
+        def flush():
+            path = os.path.join(self.directory, f"run_{depth + 1:04d}_{len(runs):05d}.run")
+            _write(path, sorted(set(block)), self.size)
+            runs.append(path)
+            block.clear()
+
+        for value in _read(self.layer_path(depth), self.size):
+            block.extend(children(value))
+            if len(block) >= self.buffer:
+                flush()
+        if block:
+            flush()
+        return runs
+
+    def run(self, cancel=None, progress: Optional[Callable[[int, int, float], None]] = None) -> List[int]:
+        """Completa la enumeración (o la retoma); devuelve los estados por capa
+
+        `progress(profundidad, estados, segundos)` se llama al cerrar cada capa.
+        """
+        # Restos de una corrida interrumpida a mitad de capa
+        for leftover in glob.glob(os.path.join(self.directory, "*.run")) + \
+                glob.glob(os.path.join(self.directory, "*.tmp")):
+            os.remove(leftover)
+        if not self.counts:
+            self.counts = [_write(self.layer_path(0), [pack(self.start)], self.size)]
+            self._save_manifest()
+        while not self.complete:
+            if cancel is not None and cancel.is_set():
+                break
+            t0 = time.perf_counter()
+            depth = len(self.counts) - 1
+            runs = self._expand(depth)
+            merged = heapq.merge(*(_read(path, self.size) for path in runs))
+            excluded = [_read(self.layer_path(depth), self.size)]
+            if depth > 0:
+                excluded.append(_read(self.layer_path(depth - 1), self.size))
+            count = _write(self.layer_path(depth + 1), _subtract(merged, *excluded), self.size)
+            for path in runs:
+                os.remove(path)
+            if count == 0:
+                os.remove(self.layer_path(depth + 1))
+                self.complete = True
+            else:
+                self.counts.append(count)
+            self._save_manifest()
+            if progress is not None and count:
+                progress(depth + 1, count, time.perf_counter() - t0)
+        return self.counts
+
+    def write_table(self, path: str) -> str:
+        """Tabla de distancias por rango (formato de solver/tables.py, 255 = inalcanzable)"""
+        if not self.complete:
+            raise RuntimeError("La enumeración no terminó: ejecuta run() antes de escribir la tabla")
+        length = num_permutations(self.n)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(tables.HEADER.pack(tables.MAGIC, tables.VERSION, length))
+            block = bytes([tables.UNREACHABLE]) * min(length, 1 << 20)
+            for offset in range(0, length, len(block)):
+                f.write(block[:length - offset])
+        with open(tmp, "r+b") as f, mmap.mmap(f.fileno(), 0) as mm:
+            # Escrituras dispersas sobre el archivo mapeado: la tabla no pasa por la RAM del proceso
+            base = tables.HEADER.size
+            for depth in range(len(self.counts)):
+                for state in self.layer(depth):
+                    mm[base + rank(state)] = depth
+            mm.flush()
+        os.replace(tmp, path)
+        return path
+
+def load_table(path: str) -> memoryview:
+    """Mapea una tabla escrita por write_table (o por solver/tables.py)"""
+    table = tables._map(path)
+    if table is None:
+        raise ValueError(f"{path} no es una tabla válida")
+    return table
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m solver.external",
+                                     description="BFS en memoria externa del espacio completo de un N-puzzle")
+    sub = parser.add_subparsers(dest="command", required=True)
+    r = sub.add_parser("run", help="enumerar (o retomar) por capas")
+    r.add_argument("--width", type=int, required=True)
+    r.add_argument("--height", type=int, required=True)
+    r.add_argument("--dir", required=True, help="directorio de trabajo (capas y manifest.json)")
+    r.add_argument("--buffer", type=int, default=1 << 20, help="hijos por corrida ordenada en memoria")
+    r.add_argument("--table", help="escribir la tabla de distancias por rango en este archivo")
+    i = sub.add_parser("info", help="capas completadas de un directorio")
+    i.add_argument("--dir", required=True)
+    args = parser.parse_args(argv)
+
+    if args.command == "info":
+        with open(os.path.join(args.dir, MANIFEST)) as f:
+            manifest = json.load(f)
+        print(f"{manifest['width']}x{manifest['height']}, {'completa' if manifest['complete'] else 'en curso'}")
+        for depth, count in enumerate(manifest["layers"]):
+            print(f"  {depth:>3}: {count}")
+        print(f"  total: {sum(manifest['layers'])}")
+        return 0
+
+    engine = ExternalBFS(args.dir, args.width, args.height, buffer=args.buffer)
+    if engine.counts:
+        print(f"↻ Retomando desde la capa {len(engine.counts) - 1}")
+    counts = engine.run(progress=lambda d, c, s: print(f"  capa {d:>3}: {c:>12} estados  {s:8.2f}s"))
+    print(f"✅ {sum(counts)} estados alcanzables, profundidad máxima {len(counts) - 1}")
+    if args.table:
+        engine.write_table(args.table)
+        print(f"💾 Tabla de distancias en {args.table}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,212 @@
+"""Generador reproducible de corpus de tableros resolubles por dificultad.
+
+Los tableros 3x3 se estratifican por su distancia óptima exacta (tabla
+distance_3x3); los demás tamaños, por la distancia Manhattan, alcanzada con
+caminatas aleatorias desde la meta (así siempre son resolubles).
+
+Los corpus se guardan compactos: cabecera + (rango de la permutación en el
+mínimo de bytes necesarios, profundidad en 1 byte) por tablero.
+
+Uso:
+    python -m solver.generator build --width 3 --per-stratum 50 --seed 7 -o corpus_3x3.bin
+    python -m solver.generator build --width 4 --strata 20-40:5 --per-stratum 20 -o corpus_4x4.bin
+    python -m solver.generator info corpus_3x3.bin
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import random
+import statistics
+import struct
+import sys
+
+from Heuristics import manhattan_distance
+from .problem import default_goal
+from .ranking import num_permutations, rank, unrank
+from . import tables
+
+MAGIC = b"NPZC"
+VERSION = 1
+# magic, versión, ancho, alto, exacto, bytes por rango, cantidad, semilla
+HEADER = struct.Struct("<4sBBBBBIQ")
+
+State = Tuple[int, ...]
+
+class Board(NamedTuple):
+    state: State
+    depth: int  # distancia óptima (corpus exacto) o estimación Manhattan
+
+class Corpus(NamedTuple):
+    width: int
+    height: int
+    exact: bool  # True: depth es el largo óptimo de la solución
+    seed: int
+    boards: List[Board]
+
+def rank_bytes(n: int) -> int:
+    """Bytes necesarios para el rango de una permutación de n casillas"""
+    return max(1, ((num_permutations(n) - 1).bit_length() + 7) // 8)
+
+# ---------------------------------------------------------------------------
+# Generación
+
+def _exact_buckets(strata: Iterable[int]) -> Dict[int, List[int]]:
+    """Rangos de los estados 3x3 agrupados por distancia óptima"""
+    wanted = set(strata)
+    buckets: Dict[int, List[int]] = {d: [] for d in wanted}
+    for r, d in enumerate(tables.load("distance_3x3")):
+        if d in wanted:
+            buckets[d].append(r)
+    return buckets
+
+def _walk_to(rng: random.Random, goal: State, width: int, neighbors, target: int,
+             max_steps: int) -> Optional[State]:
+    """Caminata aleatoria sin retrocesos hasta que Manhattan == target"""
+    state = list(goal)
+    blank = state.index(0)
+    previous = -1
+    for _ in range(max_steps):
+        options = [p for p in neighbors[blank] if p != previous]
+        nxt = rng.choice(options)
+        state[blank], state[nxt] = state[nxt], state[blank]
+        previous, blank = blank, nxt
+        if manhattan_distance(state, goal, width) == target:
+            return tuple(state)
+    return None
+
+def default_strata(width: int, height: int, seed: int = 0) -> List[int]:
+    """3x3: todas las distancias 1..31; otros: ~10 niveles hasta la Manhattan mediana"""
+    if (width, height) == (3, 3):
+        return list(range(1, 32))
+    rng = random.Random(seed)
+    goal = default_goal(width * height)
+    neighbors = tables._neighbors(width, height)
+    # Caminatas largas ~ tableros uniformes: su mediana marca la dificultad "típica"
+    samples = []
+    state = list(goal)
+    blank, previous = state.index(0), -1
+    for _ in range(200):
+        for _ in range(10 * width * height):
+            nxt = rng.choice([p for p in neighbors[blank] if p != previous])
+            state[blank], state[nxt] = state[nxt], state[blank]
+            previous, blank = blank, nxt
+        samples.append(manhattan_distance(state, goal, width))
+    top = int(statistics.median(samples))
+    step = max(1, top // 10)
+    return list(range(step, top + 1, step))
+
+def generate(width: int = 3, per_stratum: int = 10, strata: Optional[Iterable[int]] = None,
+             seed: int = 0, height: Optional[int] = None, max_attempts: int = 200) -> Corpus:
+    """Corpus reproducible con `per_stratum` tableros distintos por nivel de dificultad"""
+    if not 0 <= seed < 1 << 64:
+        raise ValueError(f"La semilla debe estar entre 0 y 2**64 - 1 (se guarda en el encabezado): {seed}")
+    height = height or width
+    goal = default_goal(width * height)
+    strata = sorted(set(strata)) if strata is not None else default_strata(width, height, seed)
+    rng = random.Random(seed)
+    boards: List[Board] = []
+    exact = (width, height) == (3, 3)
+
+    if exact:
+        buckets = _exact_buckets(strata)
+        for depth in strata:
+            bucket = buckets[depth]
+            if not bucket:
+                raise ValueError(f"No hay tableros 3x3 a distancia {depth} (máximo 31)")
+            chosen = rng.sample(bucket, min(per_stratum, len(bucket)))
+            boards.extend(Board(unrank(r, 9), depth) for r in sorted(chosen))
+        return Corpus(width, height, exact, seed, boards)
+
+    neighbors = tables._neighbors(width, height)
+    for target in strata:
+        found = set()
+        for _ in range(max_attempts * per_stratum):
+            if len(found) == per_stratum:
+                break
+            state = _walk_to(rng, goal, width, neighbors, target, 20 * target + 100)
+            if state is not None:
+                found.add(state)
+        if len(found) < per_stratum:
+            raise ValueError(f"Solo {len(found)}/{per_stratum} tableros con Manhattan {target}; "
+                             "usa estratos más bajos o más intentos")
+        boards.extend(Board(s, target) for s in sorted(found))
+    return Corpus(width, height, exact, seed, boards)
+
+# ---------------------------------------------------------------------------
+# Almacenamiento
+
+def save(path: str, corpus: Corpus) -> int:
+    """Escribe el corpus; devuelve el tamaño en bytes"""
+    n = corpus.width * corpus.height
+    size = rank_bytes(n)
+    out = bytearray(HEADER.pack(MAGIC, VERSION, corpus.width, corpus.height, int(corpus.exact),
+                                size, len(corpus.boards), corpus.seed))
+    for board in corpus.boards:
+        out += rank(board.state).to_bytes(size, "little")
+        out.append(board.depth)
+    with open(path, "wb") as f:
+        f.write(out)
+    return len(out)
+
+def load(path: str) -> Corpus:
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version, width, height, exact, size, count, seed = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} no es un corpus de tableros (versión {VERSION})")
+    n = width * height
+    record = size + 1
+    boards = []
+    for offset in range(HEADER.size, HEADER.size + count * record, record):
+        r = int.from_bytes(data[offset:offset + size], "little")
+        boards.append(Board(unrank(r, n), data[offset + size]))
+    return Corpus(width, height, bool(exact), seed, boards)
+
+def parse_strata(text: str) -> List[int]:
+    """'10,12,20-30' o '20-40:5' (rango con paso) -> lista de niveles"""
+    strata = []
+    for part in text.split(","):
+        span, _, step = part.partition(":")
+        lo, _, hi = span.partition("-")
+        strata.extend(range(int(lo), int(hi or lo) + 1, int(step or 1)))
+    return strata
+
+def parse_seed(text: str) -> int:
+    """Semilla para argparse: entero sin signo de 64 bits (campo Q del encabezado)"""
+    import argparse
+    seed = int(text)
+    if not 0 <= seed < 1 << 64:
+        raise argparse.ArgumentTypeError(f"la semilla debe estar entre 0 y 2**64 - 1: {seed}")
+    return seed
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m solver.generator",
+                                     description="Corpus reproducibles de tableros por dificultad")
+    sub = parser.add_subparsers(dest="command", required=True)
+    b = sub.add_parser("build", help="generar y guardar un corpus")
+    b.add_argument("--width", type=int, default=3)
+    b.add_argument("--height", type=int)
+    b.add_argument("--per-stratum", type=int, default=10)
+    b.add_argument("--strata", type=parse_strata, help="p. ej. 10-20 o 20-40:5")
+    b.add_argument("--seed", type=parse_seed, default=0)
+    b.add_argument("-o", "--output", required=True)
+    i = sub.add_parser("info", help="resumen de un corpus")
+    i.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        corpus = generate(args.width, args.per_stratum, args.strata, args.seed, args.height)
+        size = save(args.output, corpus)
+        print(f"💾 {len(corpus.boards)} tableros {corpus.width}x{corpus.height} en {args.output} ({size} bytes)")
+        return 0
+    corpus = load(args.path)
+    kind = "distancia óptima" if corpus.exact else "estimación Manhattan"
+    print(f"{corpus.width}x{corpus.height}, {len(corpus.boards)} tableros, semilla {corpus.seed}, por {kind}")
+    counts: Dict[int, int] = {}
+    for board in corpus.boards:
+        counts[board.depth] = counts.get(board.depth, 0) + 1
+    for depth, count in sorted(counts.items()):
+        print(f"  {depth:>3}: {count}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
@@ -0,0 +1,115 @@
+"""Medición de memoria pico por búsqueda y tope de memoria.
+
+Dos modos de medición:
+    tracemalloc  bytes asignados según tracemalloc (exacto, pero ~2x más lento
+                 y global al proceso: no usar con varias búsquedas en hilos)
+    estimate     sys.getsizeof de la frontera y los cerrados + nodos vivos por
+                 el tamaño de un nodo de muestra (barato, apto para la API)
+Ambos se evalúan cada `interval` expansiones; si hay `limit` (bytes) y se
+supera, el algoritmo termina con status 'memory_limit'.
+"""
+from typing import Any, Dict, Optional
+import sys
+import tracemalloc
+import weakref
+
+TRACEMALLOC = 'tracemalloc'
+ESTIMATE = 'estimate'
+MODES = (TRACEMALLOC, ESTIMATE)
+
+def node_size(node) -> int:
+    """Bytes de un nodo con su estado y su g (las acciones son cadenas compartidas)"""
+    return sys.getsizeof(node) + sys.getsizeof(node.state) + sys.getsizeof(node.g)
+
+class MemoryMonitor:
+    """Mide la memoria de una búsqueda y avisa si supera `limit` bytes"""
+    def __init__(self, mode: str = ESTIMATE, limit: Optional[int] = None, interval: int = 1024):
+        if mode not in MODES:
+            raise ValueError(f"Modo de memoria desconocido: {mode!r} (opciones: {', '.join(MODES)})")
+        self.mode = mode
+        self.limit = limit
+        self.interval = interval
+        self.peak = 0
+        self._ticks = 0
+        self._stats = None
+        self._containers = ()
+        self._node_bytes = 0
+        self._baseline = 0
+        self._stop_tracing = None
+
+    def start(self, stats, root, *containers, node_bytes: Optional[int] = None) -> 'MemoryMonitor':
+        """Empieza a medir; `containers` son la frontera y los cerrados del algoritmo
+
+        `node_bytes` reemplaza el tamaño medido en `root` (p. ej. con NodeArena,
+        donde las entradas son índices y claves, no nodos).
+        """
+        self._stats = stats
+        self._containers = containers
+        self._node_bytes = node_bytes if node_bytes is not None else node_size(root)
+        if self.mode == TRACEMALLOC:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                # Si la búsqueda termina con una excepción, se detiene al liberar el monitor
+                self._stop_tracing = weakref.finalize(self, tracemalloc.stop)
+            self._baseline = tracemalloc.get_traced_memory()[0]
+        return self
+
+    def watch(self, *containers) -> None:
+        """Cambia los contenedores medidos (algoritmos que los reemplazan)"""
+        self._containers = containers
+
+    def current(self) -> int:
+        """Bytes en uso por la búsqueda en este momento"""
+        if self.mode == TRACEMALLOC:
+            return max(0, tracemalloc.get_traced_memory()[0] - self._baseline)
+        if self._containers:
+            # Los contenedores con sizes_entries (NodeArena, IndexQueue) ya los cuentan en __sizeof__
+            nodes = sum(len(c) for c in self._containers if not getattr(c, 'sizes_entries', False))
+        else:
+            nodes = self._stats.max_frontier  # IDA*: solo el camino actual
+        return sum(sys.getsizeof(c) for c in self._containers) + nodes * self._node_bytes
+
+    def check(self) -> bool:
+        """Actualiza el pico; True si se superó el tope"""
+        used = self.current()
+        if used > self.peak:
+            self.peak = used
+        return self.limit is not None and used > self.limit
+
+    def tick(self) -> bool:
+        """Llamar una vez por expansión; mide cada `interval` llamadas"""
+        self._ticks += 1
+        if self._ticks < self.interval:
+            return False
+        self._ticks = 0
+        return self.check()
+
+    def finish(self) -> Dict[str, Any]:
+        """Última medición; devuelve las claves que se agregan al resultado"""
+        self.check()
+        if self._stop_tracing is not None:
+            # Con tracemalloc propio el pico es exacto (no solo en los muestreos)
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] - self._baseline)
+            self._stop_tracing()
+            self._stop_tracing = None
+        stored = self._stats.max_frontier + self._stats.max_closed
+        return {
+            'memory_mode': self.mode,
+            'peak_memory': self.peak,
+            'bytes_per_node': round(self.peak / stored, 1) if stored else None,
+            'memory_limit': self.limit,
+        }
+
+def memory_monitor(memory=None, memory_limit: Optional[int] = None) -> Optional[MemoryMonitor]:
+    """Monitor para los argumentos `memory`/`memory_limit` de los algoritmos.
+
+    `memory` es un modo ('tracemalloc' | 'estimate') o un MemoryMonitor ya
+    configurado; con solo `memory_limit` se usa 'estimate'. Sin ninguno, None.
+    """
+    if isinstance(memory, MemoryMonitor):
+        if memory_limit is not None:
+            memory.limit = memory_limit
+        return memory
+    if memory is None and memory_limit is None:
+        return None
+    return MemoryMonitor(memory or ESTIMATE, memory_limit)
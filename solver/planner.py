@@ -0,0 +1,78 @@
+"""Selección automática de algoritmo (``algorithm: "auto"``).
+
+Estima la dificultad con el valor heurístico y el tamaño del tablero y elige
+el motor más barato que cumple con la optimalidad pedida.
+"""
+from typing import Callable, Dict, NamedTuple, Optional
+
+from Heuristics import compile_heuristic
+from .problem import SlidingPuzzle
+from . import tables
+
+class Plan(NamedTuple):
+    algorithm: str            # nombre del algoritmo (bfs, astar, ida, greedy, ...)
+    heuristic: Optional[str]  # nombre de la heurística ('exact' = tabla de distancias)
+    estimate: int             # estimación del largo de la solución
+    exact: bool               # True si estimate es el largo óptimo
+    reason: str
+
+def heuristic_function(name: str, problem: SlidingPuzzle) -> Callable:
+    """Heurística por nombre para un problema; 'exact' usa la tabla 3x3 precalculada"""
+    if name == "exact":
+        return tables.distance_3x3
+    return compile_heuristic(name, problem.goal, problem.width)
+
+def has_exact_table(problem: SlidingPuzzle) -> bool:
+    return problem.width == 3 and problem.height == 3 and problem.goal == tables.GOAL_3x3
+
+# Umbrales sobre la estimación Manhattan, por tamaño (se usa el primero con
+# casillas >= n). Medidos con corpus de solver.generator y un tope de 256 MB:
+#   4x4  h <= 16: A* < 0.1 s; h 20-30: A* llega al tope de memoria, IDA* 0.1-6 s;
+#        h > 30: IDA* pasa de 10 s en casi todos
+#   5x5  h <= 20: ambos instantáneos; h 30: A* ya llega al tope en algunos
+ASTAR_MAX_ESTIMATE = {16: 16, 25: 20}
+IDA_MAX_ESTIMATE = {16: 30, 25: 30}
+
+class TooHard(ValueError):
+    """Tablero demasiado difícil para una solución óptima interactiva"""
+    def __init__(self, size: str, estimate: int, limit: int):
+        super().__init__(f"{size} con estimación {estimate} > {limit}: demasiado difícil para una "
+                         "solución óptima interactiva (usar optimal=False o un trabajo en segundo plano)")
+        self.size, self.estimate, self.limit = size, estimate, limit
+
+def _threshold(table: Dict[int, int], n: int) -> int:
+    for cells in sorted(table):
+        if n <= cells:
+            return table[cells]
+    return table[max(table)]
+
+def choose(problem: SlidingPuzzle, optimal: bool = True, limit: bool = True) -> Plan:
+    """Elige (algoritmo, heurística) para el estado inicial del problema
+
+    Con `optimal` y una estimación mayor que IDA_MAX_ESTIMATE lanza TooHard,
+    salvo con `limit=False` (trabajos en segundo plano), que sigue con IDA*.
+    """
+    state = problem.initial_state()
+    if has_exact_table(problem):
+        d = tables.distance_3x3(state)
+        # A* con la distancia exacta solo expande el camino óptimo
+        return Plan("astar", "exact", d, True, "3x3: distancia exacta precalculada")
+
+    estimate = heuristic_function("manhattan", problem)(state)
+    n = len(state)
+    if n <= 9:
+        return Plan("astar", "manhattan", estimate, False, "tablero pequeño: A* cabe en memoria")
+    size = f"{problem.height}x{problem.width}"
+    astar_max, ida_max = _threshold(ASTAR_MAX_ESTIMATE, n), _threshold(IDA_MAX_ESTIMATE, n)
+    if estimate <= astar_max:
+        # Óptimo de todos modos y más rápido que las alternativas
+        return Plan("astar", "manhattan", estimate, False, f"{size} con h={estimate} <= {astar_max}: A*")
+    if not optimal:
+        if n > 16:
+            # En 5x5 el haz falla en ~4 de cada 10 tableros; bounded siempre llega
+            return Plan("bounded", "manhattan", estimate, False, f"{size} sin optimalidad: best-first acotado")
+        return Plan("beam", "manhattan", estimate, False, f"{size} sin optimalidad: beam search")
+    if estimate > ida_max and limit:
+        raise TooHard(size, estimate, ida_max)
+    # En tableros grandes A* agota la memoria; IDA* usa memoria lineal
+    return Plan("ida", "manhattan", estimate, False, f"{size} óptimo con h={estimate}: IDA*")
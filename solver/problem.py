@@ -0,0 +1,187 @@
+from typing import List, Optional, Tuple, Iterable
+from math import isqrt
+
+from Abstractions import Problem
+
+Action = str
+State = Tuple[int, ...]  # largo width*height (9 para el 8-puzzle)
+
+GOAL = (1,2,3,4,5,6,7,8,0)
+
+def board_width(n: int) -> int:
+    """Ancho de un tablero cuadrado de n casillas"""
+    width = isqrt(n)
+    if width * width != n:
+        raise ValueError(f"Un tablero de {n} casillas no es cuadrado; indica el ancho")
+    return width
+
+def default_goal(n: int) -> State:
+    """Meta canónica: 1..n-1 en orden y el hueco al final"""
+    return tuple(range(1, n)) + (0,)
+
+def inversions(state: State) -> int:
+    """Número de pares de fichas invertidas (excluye el hueco 0)"""
+    tiles = [x for x in state if x != 0]
+    count = 0
+    for i in range(len(tiles)):
+        for j in range(i+1, len(tiles)):
+            if tiles[i] > tiles[j]:
+                count += 1
+    return count
+
+def _parity(state: State, width: int) -> int:
+    # Invariante de los movimientos: con ancho impar, la paridad de inversiones;
+    # con ancho par, inversiones + fila del hueco.
+    p = inversions(state)
+    if width % 2 == 0:
+        p += state.index(0) // width
+    return p % 2
+
+def is_solvable(state: State, width: Optional[int] = None, goal: Optional[State] = None) -> bool:
+    """Verifica si la meta es alcanzable desde el estado (paridad de inversiones)"""
+    width = width or board_width(len(state))
+    goal = goal if goal is not None else default_goal(len(state))
+    return _parity(tuple(state), width) == _parity(tuple(goal), width)
+
+class SlidingPuzzle(Problem):
+    """N-puzzle rectangular; el ancho se deduce si el tablero es cuadrado
+
+    Cada movimiento del hueco tiene un inverso y ningún par conmuta, así que la
+    poda descarta exactamente un hijo por expansión (salvo en la raíz).
+    """
+    INVERSE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+    def __init__(self, initial: State, goal: Optional[State] = None, width: Optional[int] = None,
+                 pruning: bool = True):
+        self.initial = initial
+        self.width = width or board_width(len(initial))
+        self.height = len(initial) // self.width
+        self.goal = goal if goal is not None else default_goal(len(initial))
+        self.pruning = pruning
+        
+    def initial_state(self) -> State:
+        return self.initial
+        
+    def is_goal(self, state: State) -> bool:
+        return state == self.goal
+        
+    def actions(self, state: State) -> Iterable[Action]:
+        """Retorna las acciones válidas desde un estado"""
+        i = state.index(0)  # posición del hueco
+        x, y = divmod(i, self.width)  # convertir a coordenadas x,y
+        
+        actions = []
+        if x > 0: actions.append("up")                  # puede mover hacia arriba
+        if x < self.height - 1: actions.append("down")  # puede mover hacia abajo  
+        if y > 0: actions.append("left")                # puede mover hacia izquierda
+        if y < self.width - 1: actions.append("right")  # puede mover hacia derecha
+        
+        return actions
+    
+    def result(self, state: State, action: Action) -> State:
+        """Aplica una acción y retorna el nuevo estado"""
+        i = state.index(0)  # posición del hueco
+        x, y = divmod(i, self.width)
+        
+        # Calcular nueva posición del hueco
+        if action == "up":
+            new_x, new_y = x - 1, y
+        elif action == "down":
+            new_x, new_y = x + 1, y
+        elif action == "left":
+            new_x, new_y = x, y - 1
+        elif action == "right":
+            new_x, new_y = x, y + 1
+        else:
+            raise ValueError(f"Acción inválida: {action}")
+            
+        j = new_x * self.width + new_y  # nueva posición lineal
+        
+        # Intercambiar hueco con la ficha
+        tiles = list(state)
+        tiles[i], tiles[j] = tiles[j], tiles[i]
+        
+        return tuple(tiles)
+    
+    def step_cost(self, state: State, action: Action, next_state: State) -> int:
+        return 1
+        
+    def successors(self, state: State, last_action: Optional[Action] = None,
+                   stats=None) -> Iterable[Tuple[Action, State, int]]:
+        """Retorna (action, next_state, step_cost) para cada acción válida
+
+        Con `last_action` se omite el movimiento que la deshace (y se cuenta en
+        stats.pruned si se pasa `stats`).
+        """
+        undo = self.INVERSE.get(last_action) if self.pruning else None
+        for action in self.actions(state):
+            if action == undo:
+                if stats is not None: stats.pruned += 1
+                continue
+            next_state = self.result(state, action)
+            cost = self.step_cost(state, action, next_state)
+            yield (action, next_state, cost)
+
+# El 8-puzzle es el caso 3x3; se mantiene el nombre histórico
+EightPuzzle = SlidingPuzzle
+
+# Alias para compatibilidad con código existente
+class PuzzleState:
+    def __init__(self, tiles): 
+        self.tiles = tuple(tiles)
+    def key(self): 
+        return self.tiles
+    def __repr__(self): 
+        return f"PuzzleState{self.tiles}"
+
+class Puzzle(Problem):
+    """Clase de compatibilidad con código existente"""
+    def __init__(self, start):
+        if isinstance(start, (list, tuple)):
+            self.start_state = start
+        else:
+            self.start_state = start.tiles if hasattr(start, 'tiles') else start
+        self.puzzle = EightPuzzle(self.start_state)
+        
+    def initial_state(self):
+        return self.start_state
+        
+    def is_goal(self, state):
+        if hasattr(state, 'tiles'):
+            return state.tiles == GOAL
+        return state == GOAL
+        
+    def actions(self, state):
+        if hasattr(state, 'tiles'):
+            state = state.tiles
+        return self.puzzle.actions(state)
+        
+    def result(self, state, action):
+        if hasattr(state, 'tiles'):
+            state = state.tiles
+        return self.puzzle.result(state, action)
+        
+    def successors(self, state, last_action=None, stats=None):
+        if hasattr(state, 'tiles'):
+            state = state.tiles
+        return self.puzzle.successors(state, last_action, stats)
+
+# Ejemplo de uso y pruebas (python -m solver.problem)
+if __name__ == "__main__":
+    # Estados de prueba
+    easy = (1,2,3,4,5,6,7,0,8)
+    medium = (1,2,3,4,5,6,0,7,8) 
+    hard = (7,2,4,5,0,6,8,3,1)
+    
+    puzzle = EightPuzzle(easy)
+    print(f"Estado inicial: {puzzle.initial_state()}")
+    print(f"¿Es meta?: {puzzle.is_goal(puzzle.initial_state())}")
+    print(f"Acciones válidas: {list(puzzle.actions(puzzle.initial_state()))}")
+    
+    # Probar una acción
+    if puzzle.actions(puzzle.initial_state()):
+        action = list(puzzle.actions(puzzle.initial_state()))[0]
+        new_state = puzzle.result(puzzle.initial_state(), action)
+        print(f"Después de '{action}': {new_state}")
+        
+    print("Pruebas del 8-puzzle completadas.")
\ No newline at end of file
@@ -0,0 +1,187 @@
+"""Perfilado por fases de una búsqueda (cProfile).
+
+Clasifica el tiempo propio de cada función en fases:
+    heuristic   funciones de Heuristics.py y tablas (solver/tables.py, ranking.py)
+    successors  métodos del problema (successors, actions, result, ...)
+    nodes       creación de nodos (Abstractions.Node) y reconstrucción de caminos
+    queue       estructuras de datos (Strucure.py: MinHeap, Queue, Stack)
+    search      el propio bucle del algoritmo (incluye el dict best_g / set explored)
+    other       todo lo demás
+Las funciones nativas (len, tuple.index, dict.get, ...) se reparten entre las
+fases de sus llamadores según el tiempo que cada uno les dedicó.
+
+cProfile admite un solo perfilador activo por proceso (desde Python 3.12 el
+segundo ``enable`` falla), así que los PhaseProfile se excluyen entre sí: con
+``blocking=False`` el segundo lanza ProfilerBusy en lugar de esperar.
+"""
+from typing import Dict, List, Optional, Tuple
+import cProfile
+import os
+import pstats
+import threading
+import time
+
+PHASES = ("heuristic", "successors", "nodes", "queue", "search", "other")
+
+_HEURISTIC_FILES = ("Heuristics.py", os.path.join("solver", "tables.py"), os.path.join("solver", "ranking.py"))
+_PROBLEM_FILES = (os.path.join("solver", "problem.py"),)
+_PROBLEM_METHODS = ("successors", "actions", "result", "step_cost", "is_goal", "goal_test", "initial_state")
+_NODE_FILES = ("Abstractions.py",)
+_QUEUE_FILES = ("Strucure.py",)
+_SEARCH_FILES = (os.path.join("solver", "search.py"),)
+
+Func = Tuple[str, int, str]  # (archivo, línea, nombre) como en pstats
+
+_active = threading.Lock()  # un perfilador a la vez en todo el proceso
+
+class ProfilerBusy(RuntimeError):
+    """Otro PhaseProfile está activo en el proceso"""
+
+def _classify(func: Func) -> Optional[str]:
+    filename, _, name = func
+    if filename == "~":
+        return None  # nativa: se reparte por llamador
+    if filename.endswith(_HEURISTIC_FILES):
+        return "heuristic"
+    if filename.endswith(_QUEUE_FILES):
+        return "queue"
+    if filename.endswith(_NODE_FILES):
+        return "successors" if name in _PROBLEM_METHODS else "nodes"
+    if filename.endswith(_PROBLEM_FILES) or name in _PROBLEM_METHODS:
+        return "successors"
+    if filename.endswith(_SEARCH_FILES):
+        return "search"
+    return "other"
+
+class PhaseProfile:
+    """Contexto que perfila el bloque y resume el tiempo por fase
+
+        with PhaseProfile() as prof:
+            astar(problem, h)
+        prof.phases()  # {'heuristic': 0.012, 'successors': ..., 'total': ...}
+    """
+    def __init__(self, blocking: bool = True):
+        self.profiler = cProfile.Profile()
+        self.blocking = blocking
+        self.wall = 0.0
+        self._stats: Optional[pstats.Stats] = None
+
+    def __enter__(self):
+        if not _active.acquire(blocking=self.blocking):
+            raise ProfilerBusy("ya hay otra búsqueda perfilándose en este proceso")
+        try:
+            self.profiler.enable()
+        except BaseException:
+            _active.release()
+            raise
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.disable()
+        self.wall = time.perf_counter() - self._t0
+        _active.release()
+        return False
+
+    @property
+    def stats(self) -> pstats.Stats:
+        if self._stats is None:
+            self._stats = pstats.Stats(self.profiler)
+        return self._stats
+
+    def _phase_of(self, func: Func, seen=()) -> str:
+        phase = _classify(func)
+        if phase is not None:
+            return phase
+        # Nativas y lambdas: heredan la fase del llamador dominante
+        callers = self.stats.stats[func][4]
+        if not callers or func in seen:
+            return "other"
+        caller = max(callers, key=lambda c: callers[c][2])
+        return self._phase_of(caller, seen + (func,))
+
+    def phases(self) -> Dict[str, float]:
+        """Segundos de tiempo propio por fase (bajo el perfilador) y el total real"""
+        totals = {phase: 0.0 for phase in PHASES}
+        for func, (cc, nc, tt, ct, callers) in self.stats.stats.items():
+            if _classify(func) is None and callers:
+                # Repartir la nativa según el tiempo que le dedicó cada llamador
+                for caller, edge in callers.items():
+                    totals[self._phase_of(caller)] += edge[2]
+            else:
+                totals[self._phase_of(func)] += tt
+        # Lambdas que envuelven la heurística: cuentan como heurística
+        for func, (cc, nc, tt, ct, callers) in self.stats.stats.items():
+            if func[2] == "<lambda>" and self._calls_heuristic(func):
+                phase = self._phase_of(func)
+                if phase != "heuristic":
+                    totals[phase] -= tt
+                    totals["heuristic"] += tt
+        totals["total"] = self.wall
+        return totals
+
+    def _calls_heuristic(self, func: Func) -> bool:
+        for callee, (cc, nc, tt, ct, callers) in self.stats.stats.items():
+            if func in callers and _classify(callee) == "heuristic":
+                return True
+        return False
+
+    def dump_pstats(self, path: str) -> None:
+        """Archivo .prof de cProfile (snakeviz, gprof2dot, flameprof, ...)"""
+        self.stats.dump_stats(path)
+
+    def collapsed_stacks(self, max_depth: int = 64) -> List[str]:
+        """Pilas colapsadas ("a;b;c microsegundos") para flamegraph.pl / speedscope.
+
+        cProfile solo guarda aristas llamador→llamado, así que las pilas se
+        reconstruyen repartiendo el tiempo de cada función entre sus llamadores
+        en proporción al tiempo acumulado de cada arista (aproximación).
+        """
+        raw = self.stats.stats
+        callees: Dict[Func, Dict[Func, tuple]] = {}
+        for func, (cc, nc, tt, ct, callers) in raw.items():
+            for caller, edge in callers.items():
+                callees.setdefault(caller, {})[func] = edge
+        roots = [f for f, v in raw.items() if not v[4]]
+        lines: Dict[str, float] = {}
+
+        def label(func: Func) -> str:
+            filename, line, name = func
+            return name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+
+        def walk(func: Func, path: Tuple[str, ...], share: float, on_path: frozenset):
+            cc, nc, tt, ct, _ = raw[func]
+            if ct <= 0 or share <= 0:
+                return
+            fraction = min(1.0, share / ct)
+            path = path + (label(func),)
+            key = ";".join(path)
+            lines[key] = lines.get(key, 0.0) + tt * fraction
+            if len(path) >= max_depth:
+                return
+            for callee, edge in callees.get(func, {}).items():
+                if callee not in on_path:
+                    walk(callee, path, edge[3] * fraction, on_path | {callee})
+
+        for root in roots:
+            walk(root, (), raw[root][3], frozenset([root]))
+        return [f"{k} {int(v * 1e6)}" for k, v in sorted(lines.items()) if int(v * 1e6) > 0]
+
+    def dump_collapsed(self, path: str) -> None:
+        with open(path, "w") as f:
+            f.write("\n".join(self.collapsed_stacks()) + "\n")
+
+def format_phases(phases: Dict[str, float]) -> str:
+    """Tabla de texto con ms y porcentaje por fase"""
+    profiled = sum(v for k, v in phases.items() if k != "total") or 1.0
+    rows = [f"{'Fase':<12} {'ms':>10} {'%':>6}", "-" * 30]
+    for phase in PHASES:
+        seconds = phases.get(phase, 0.0)
+        rows.append(f"{phase:<12} {seconds * 1000:>10.2f} {seconds / profiled * 100:>5.1f}%")
+    rows.append("-" * 30)
+    rows.append(f"{'total real':<12} {phases.get('total', 0.0) * 1000:>10.2f}")
+    return "\n".join(rows)
+
+def server_timing(phases: Dict[str, float]) -> str:
+    """Valor de la cabecera HTTP Server-Timing (duraciones en ms)"""
+    return ", ".join(f"{name};dur={seconds * 1000:.2f}" for name, seconds in phases.items())
@@ -0,0 +1,59 @@
+from typing import Sequence, Tuple
+
+# Factoriales precalculados hasta 25! (tableros de hasta 5x5)
+FACTORIALS = [1]
+for _i in range(1, 26):
+    FACTORIALS.append(FACTORIALS[-1] * _i)
+
+def rank(perm: Sequence[int]) -> int:
+    """Rango lexicográfico (código de Lehmer) de una permutación de 0..n-1"""
+    n = len(perm)
+    r = 0
+    for i in range(n):
+        v = perm[i]
+        smaller = 0
+        for j in range(i + 1, n):
+            if perm[j] < v:
+                smaller += 1
+        r += smaller * FACTORIALS[n - 1 - i]
+    return r
+
+def unrank(r: int, n: int) -> Tuple[int, ...]:
+    """Inversa de rank: permutación de 0..n-1 con rango r"""
+    pool = list(range(n))
+    perm = []
+    for i in range(n - 1, -1, -1):
+        q, r = divmod(r, FACTORIALS[i])
+        perm.append(pool.pop(q))
+    return tuple(perm)
+
+def num_permutations(n: int) -> int:
+    return FACTORIALS[n]
+
+def rank_partial(positions: Sequence[int], n: int) -> int:
+    """Rango de k posiciones distintas de 0..n-1 (en orden) entre las n!/(n-k)! posibles
+
+    Con k = n coincide con rank. Indexa las bases de datos de patrones (solver/vectorized.py).
+    """
+    k = len(positions)
+    r = 0
+    for i, p in enumerate(positions):
+        c = p
+        for j in range(i):
+            if positions[j] < p:
+                c -= 1
+        r += c * (FACTORIALS[n - 1 - i] // FACTORIALS[n - k])
+    return r
+
+def num_partial(n: int, k: int) -> int:
+    return FACTORIALS[n] // FACTORIALS[n - k]
+
+# Tests rápidos
+if __name__ == "__main__":
+    assert rank((0, 1, 2, 3)) == 0 and rank((3, 2, 1, 0)) == 23
+    for r in range(num_permutations(5)):
+        assert rank(unrank(r, 5)) == r
+    from itertools import permutations
+    assert [rank_partial(p, 5) for p in permutations(range(5), 3)] == list(range(num_partial(5, 3)))
+    assert rank_partial((3, 1, 2, 0), 4) == rank((3, 1, 2, 0))
+    print("Ranking OK")
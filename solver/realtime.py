@@ -0,0 +1,246 @@
+"""Búsqueda en tiempo real: LRTA* con tabla de heurística aprendida.
+
+En lugar de planear el camino completo, el agente elige cada movimiento con
+una búsqueda de profundidad fija (`lookahead`) y actualiza el valor del estado
+actual: h(s) <- max(h(s), min_a [c(s, a) + h(s')]) (Korf, 1990). Los valores
+aprendidos siguen siendo admisibles y, con tráfico repetido sobre tableros
+parecidos, convergen a la distancia real: cada vez basta menos profundidad.
+
+La tabla vive en memoria con desalojo LRU y, si se indica un archivo, se
+persiste en SQLite (compartida entre procesos y reinicios).
+"""
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import sqlite3
+import threading
+import time
+
+from Abstractions import Problem, Node, reconstruct_path, reconstruct_actions
+from .stats import SearchObserver, SearchStats
+from .search import SearchResult, SOLVED, EXHAUSTED, CANCELLED
+
+State = Tuple[int, ...]
+
+SYNC_SLACK = 5.0  # segundos de solapamiento al releer: cubre escrituras aún sin confirmar al sincronizar
+
+class LearnedTable:
+    """Valores h aprendidos por (meta, estado); LRU en memoria + SQLite opcional
+
+    `capacity` acota la caché en memoria; `db_capacity` las filas del archivo
+    (al guardar se borran las de uso más antiguo). Es segura entre hilos. Cada
+    `flush` sube además los valores en caché que otros procesos mejoraron en el
+    archivo desde el anterior, así que los workers convergen juntos.
+    """
+    def __init__(self, path: Optional[str] = None, capacity: int = 100_000, db_capacity: int = 1_000_000):
+        self.path = path
+        self.capacity = capacity
+        self.db_capacity = db_capacity
+        self._cache: "OrderedDict[Tuple[State, State], float]" = OrderedDict()
+        self._dirty: Dict[Tuple[State, State], float] = {}
+        self._lock = threading.Lock()
+        self._db = None
+        self._rows = 0
+        self._synced = time.time()  # la caché empieza vacía: nada que refrescar antes
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS learned (goal BLOB, state BLOB, h REAL, used REAL, "
+                             "PRIMARY KEY (goal, state)) WITHOUT ROWID")
+            self._db.execute("CREATE INDEX IF NOT EXISTS learned_used ON learned (used)")
+            self._db.commit()
+            self._rows = self._db.execute("SELECT count(*) FROM learned").fetchone()[0]
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, goal: State, state: State) -> Optional[float]:
+        key = (goal, state)
+        with self._lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+                return value
+            value = self._dirty.get(key)  # desalojado de la caché pero aún sin guardar
+            if value is not None or self._db is None:
+                return value
+            row = self._db.execute("SELECT h FROM learned WHERE goal = ? AND state = ?",
+                                   (bytes(goal), bytes(state))).fetchone()
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+
+    def update(self, goal: State, state: State, value: float) -> None:
+        key = (goal, state)
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._dirty[key] = value
+
+    def _remember(self, key, value) -> None:
+        self._cache[key] = value
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)  # lo pendiente de guardar sigue en _dirty
+
+    def flush(self) -> int:
+        """Guarda los valores nuevos en SQLite, aplica el tope de filas y refresca
+        la caché con lo aprendido por otros procesos; devuelve cuántos guardó"""
+        if self._db is None:
+            return 0
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+            now = time.time()
+            if dirty:
+                self._write(dirty, now)
+            # Después de escribir: también baja el max() a las claves recién guardadas
+            self._refresh(self._synced - SYNC_SLACK)
+            self._synced = now
+            return len(dirty)
+
+    def _write(self, dirty: Dict[Tuple[State, State], float], now: float) -> None:
+        """Guarda `dirty` en el archivo y aplica el tope de filas (lock tomado)"""
+        # max(): otro proceso pudo haber aprendido un valor mayor mientras tanto
+        self._db.executemany(
+            "INSERT INTO learned (goal, state, h, used) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (goal, state) DO UPDATE SET h = max(h, excluded.h), used = excluded.used",
+            [(bytes(g), bytes(s), h, now) for (g, s), h in dirty.items()])
+        # Cota superior (las actualizaciones no agregan filas): contar solo al pasarse
+        self._rows += len(dirty)
+        if self._rows > self.db_capacity:
+            self._rows = self._db.execute("SELECT count(*) FROM learned").fetchone()[0]
+            excess = self._rows - self.db_capacity
+            if excess > 0:
+                self._db.execute("DELETE FROM learned WHERE (goal, state) IN "
+                                 "(SELECT goal, state FROM learned ORDER BY used LIMIT ?)", (excess,))
+                self._rows = self.db_capacity
+        self._db.commit()
+
+    def _refresh(self, since: float) -> None:
+        """Sube los valores en caché que el archivo tiene mayores (filas escritas desde `since`; lock tomado)"""
+        for goal, state, h in self._db.execute("SELECT goal, state, h FROM learned WHERE used >= ?", (since,)):
+            key = (tuple(goal), tuple(state))
+            cached = self._cache.get(key)
+            if cached is not None and h > cached:
+                self._cache[key] = h  # sin move_to_end: no es un uso
+
+    def close(self) -> None:
+        if self._db is not None:
+            self.flush()
+            self._db.close()
+            self._db = None
+
+def _value(problem, h: Callable, table: LearnedTable, state: State) -> float:
+    if problem.is_goal(state):
+        return 0.0
+    learned = table.get(problem.goal, state)
+    base = h(state)
+    return base if learned is None or learned < base else learned
+
+def _lookahead(problem, h, table, state, depth, previous, stats) -> float:
+    """Mínimo de g + h en la frontera de profundidad `depth` (sin deshacer movimientos)"""
+    stats.expanded += 1
+    best = float('inf')
+    for action, child, cost in problem.successors(state):
+        if child == previous:
+            continue
+        stats.generated += 1
+        if depth <= 1 or problem.is_goal(child):
+            value = cost + _value(problem, h, table, child)
+        else:
+            value = cost + _lookahead(problem, h, table, child, depth - 1, state, stats)
+        if value < best:
+            best = value
+    # Pathmax: un subárbol no vale menos que el h aprendido de su raíz (si no, el
+    # agente puede oscilar entre estados ya aprendidos sin actualizar nada)
+    own = _value(problem, h, table, state)
+    return best if best > own else own
+
+def choose_move(problem: Problem, state: State, h: Callable, table: LearnedTable, lookahead: int = 2,
+                adaptive: bool = True, previous: Optional[State] = None,
+                stats: Optional[SearchStats] = None) -> Tuple[Any, State, Dict[str, Any]]:
+    """Un paso de LRTA*: (acción, siguiente estado, info) y actualiza h(state)
+
+    Con `adaptive`, si el estado y todos sus vecinos ya tienen valor aprendido
+    se mira a profundidad 1 (la tabla ya hizo el trabajo de las búsquedas previas).
+    """
+    stats = stats if stats is not None else SearchStats()
+    successors = list(problem.successors(state))
+    depth = lookahead
+    if adaptive and table.get(problem.goal, state) is not None and \
+            all(table.get(problem.goal, child) is not None or problem.is_goal(child) for _, child, _ in successors):
+        depth = 1
+
+    stats.expanded += 1
+    best = None
+    for action, child, cost in successors:
+        stats.generated += 1
+        if depth <= 1 or problem.is_goal(child):
+            value = cost + _value(problem, h, table, child)
+        else:
+            value = cost + _lookahead(problem, h, table, child, depth - 1, state, stats)
+        # Evitar volver atrás salvo que sea estrictamente mejor
+        if best is None or value < best[0] or (value == best[0] and best[2] == previous):
+            best = (value, action, child)
+
+    before = _value(problem, h, table, state)
+    learned = max(before, best[0])
+    if learned > before or table.get(problem.goal, state) is None:
+        table.update(problem.goal, state, learned)
+    return best[1], best[2], {'h_before': before, 'h_learned': learned, 'lookahead': depth}
+
+def lrta_star(problem: Problem, h: Callable, table: Optional[LearnedTable] = None, lookahead: int = 2,
+              max_moves: int = 10_000, adaptive: bool = True, cancel=None,
+              observer: Optional[SearchObserver] = None) -> SearchResult:
+    """Ejecuta el agente LRTA* desde el estado inicial hasta la meta (o max_moves)
+
+    El camino devuelto es el que recorrió el agente (puede no ser óptimo); los
+    contadores cuentan los nodos de todas las búsquedas de anticipación.
+    """
+    start_time = time.perf_counter()
+    table = table if table is not None else LearnedTable()
+    stats = SearchStats()
+    node = Node(problem.initial_state())
+    previous = None
+
+    def result(success: bool, status: str) -> SearchResult:
+        res = {
+            'success': success, 'status': status,
+            'path': reconstruct_path(node) if success else None,
+            'actions': reconstruct_actions(node) if success else None,
+            'cost': node.g if success else None,
+            'depth': node.depth if success else None,
+            'time': time.perf_counter() - start_time,
+        }
+        res.update(stats.as_dict(node.depth if success else None))
+        res['learned'] = len(table)
+        return res
+
+    for _ in range(max_moves):
+        if problem.is_goal(node.state):
+            if observer is not None: observer.on_goal(node)
+            return result(True, SOLVED)
+        if cancel is not None and cancel.is_set():
+            return result(False, CANCELLED)
+        action, next_state, _ = choose_move(problem, node.state, h, table, lookahead, adaptive, previous, stats)
+        if observer is not None: observer.on_expand(node)
+        previous = node.state
+        node = Node(next_state, node, action, problem.step_cost(node.state, action, next_state))
+        if node.depth > stats.max_frontier: stats.max_frontier = node.depth
+    if problem.is_goal(node.state):
+        return result(True, SOLVED)
+    return result(False, EXHAUSTED)
+
+if __name__ == "__main__":
+    import sys
+    sys.path.insert(0, ".")
+    from solver.problem import SlidingPuzzle
+    from Heuristics import manhattan_distance
+    problem = SlidingPuzzle((8, 3, 1, 2, 4, 5, 7, 6, 0))  # óptimo: 20 movimientos
+    h = lambda s: manhattan_distance(s, problem.goal, 3)
+    table = LearnedTable()
+    for trial in range(1, 31):
+        res = lrta_star(problem, h, table, lookahead=2, max_moves=100_000)
+        if trial in (1, 2, 5, 10, 20, 30):
+            moves = res['depth'] if res['success'] else '—'
+            print(f"Prueba {trial:>2}: {moves:>4} movimientos, {res['expanded']:>6} nodos, {res['learned']} aprendidos")
@@ -0,0 +1,936 @@
+from typing import Callable, Dict, List, Optional, Any
+import heapq
+import sys
+import time
+
+from Abstractions import Problem, Node, reconstruct_path, reconstruct_actions
+from Strucure import Stack, Queue, MinHeap, FIFO
+from .stats import SearchObserver, SearchStats
+from .memory import MemoryMonitor, memory_monitor
+from .arena import NodeArena, IndexQueue, OBJECTS, NODE_MODES, pack, entry_size
+from .checkpoint import checkpointer, heuristic_name, stats_state, restore_stats, heap_state, restore_heap
+
+SearchResult = Dict[str, Any]
+
+# Estados de término reportados en result['status']
+SOLVED = 'solved'
+EXHAUSTED = 'exhausted'
+CANCELLED = 'cancelled'
+MEMORY_LIMIT = 'memory_limit'
+DEADLINE = 'deadline'
+
+def _solution(node: Node, stats: SearchStats, start_time: float,
+              monitor: Optional[MemoryMonitor] = None) -> SearchResult:
+    result = {
+        'success': True,
+        'status': SOLVED,
+        'path': reconstruct_path(node),
+        'actions': reconstruct_actions(node),
+        'cost': node.g,
+        'depth': node.depth,
+        'time': time.perf_counter() - start_time
+    }
+    result.update(stats.as_dict(node.depth))
+    if monitor is not None:
+        result.update(monitor.finish())
+    return result
+
+def _failure(stats: SearchStats, start_time: float, status: str = EXHAUSTED,
+             monitor: Optional[MemoryMonitor] = None) -> SearchResult:
+    result = {
+        'success': False,
+        'status': status,
+        'path': None,
+        'actions': None,
+        'cost': None,
+        'depth': None,
+        'time': time.perf_counter() - start_time
+    }
+    result.update(stats.as_dict())
+    if monitor is not None:
+        result.update(monitor.finish())
+    return result
+
+# `cancel` es cualquier objeto con is_set() (threading.Event, multiprocessing.Event);
+# los algoritmos lo consultan en cada expansión y terminan con status CANCELLED.
+# `observer` es un SearchObserver opcional (ver solver/stats.py).
+# `memory` ('tracemalloc' | 'estimate' | MemoryMonitor) agrega peak_memory y
+# bytes_per_node al resultado; con `memory_limit` (bytes) la búsqueda termina con
+# status MEMORY_LIMIT antes de pasarse (ver solver/memory.py).
+# `tie_break` (ucs, greedy, astar) elige cómo desempatar prioridades iguales:
+# 'fifo', 'lifo', 'high_g' (más profundo primero) o 'low_h' (ver Strucure.MinHeap).
+# `nodes` (bfs, ucs, astar): 'objects' (un Node por hijo) o 'arena' (columnas de
+# un NodeArena con índices como punteros al padre, ver solver/arena.py).
+# `checkpoint` (ida_star, astar): ruta de un checkpoint en disco que se escribe cada
+# `checkpoint_interval` segundos y desde el que se reanuda (ver solver/checkpoint.py).
+
+def _checkpointed(result: SearchResult, ckpt) -> SearchResult:
+    """Agrega result['checkpoint']; si la búsqueda terminó, el archivo ya no sirve"""
+    if ckpt is not None:
+        if result['status'] in (SOLVED, EXHAUSTED):
+            ckpt.discard()
+        result['checkpoint'] = ckpt.report()
+    return result
+
+def _check_nodes(nodes: str) -> None:
+    if nodes not in NODE_MODES:
+        raise ValueError(f"Modo de nodos desconocido: {nodes!r} (opciones: {', '.join(NODE_MODES)})")
+
+def bfs(problem: Problem, cancel=None, observer: Optional[SearchObserver] = None,
+        memory=None, memory_limit: Optional[int] = None, nodes: str = OBJECTS,
+        layered: bool = False) -> SearchResult:
+    """Búsqueda en anchura (Breadth-First Search)
+
+    Con `layered=True` es búsqueda de frontera por capas (ver _layered_bfs):
+    memoria proporcional al ancho de capa en vez de a todos los estados vistos.
+    """
+    _check_nodes(nodes)
+    if layered:
+        if nodes != OBJECTS:
+            raise ValueError("layered=True no guarda nodos: no se combina con nodes='arena'")
+        return _layered_bfs(problem, cancel, observer, memory_monitor(memory, memory_limit))
+    if nodes != OBJECTS:
+        return _bfs_arena(problem, cancel, observer, memory_monitor(memory, memory_limit))
+    start_time = time.perf_counter()
+    frontier = Queue()
+    start_node = Node(problem.initial_state())
+    frontier.push(start_node)
+    explored = set()
+    stats = SearchStats()
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node, frontier, explored)
+    
+    while not frontier.is_empty():
+        node = frontier.pop()
+        
+        if problem.is_goal(node.state):
+            if observer is not None: observer.on_goal(node)
+            stats.max_closed = len(explored)
+            return _solution(node, stats, start_time, monitor)
+        
+        if node.state in explored:
+            stats.duplicates += 1
+            if observer is not None: observer.on_duplicate(node)
+            continue
+            
+        if cancel is not None and cancel.is_set():
+            return _failure(stats, start_time, CANCELLED, monitor)
+
+        explored.add(node.state)
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(node)
+        
+        for child in node.expand(problem, stats):
+            stats.generated += 1
+            if observer is not None: observer.on_generate(child)
+            if child.state not in explored:
+                frontier.push(child)
+            else:
+                stats.duplicates += 1
+                if observer is not None: observer.on_duplicate(child)
+        
+        if len(frontier) > stats.max_frontier: stats.max_frontier = len(frontier)
+        if monitor is not None and monitor.tick():
+            stats.max_closed = len(explored)
+            return _failure(stats, start_time, MEMORY_LIMIT, monitor)
+    
+    stats.max_closed = len(explored)
+    return _failure(stats, start_time, monitor=monitor)
+
+def dfs(problem: Problem, depth_limit: Optional[int] = None, cancel=None,
+        observer: Optional[SearchObserver] = None, memory=None,
+        memory_limit: Optional[int] = None) -> SearchResult:
+    """Búsqueda en profundidad (Depth-First Search)"""
+    start_time = time.perf_counter()
+    frontier = Stack()
+    start_node = Node(problem.initial_state())
+    frontier.push(start_node)
+    explored = set()
+    stats = SearchStats()
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node, frontier, explored)
+    
+    while not frontier.is_empty():
+        node = frontier.pop()
+        
+        if problem.is_goal(node.state):
+            if observer is not None: observer.on_goal(node)
+            stats.max_closed = len(explored)
+            return _solution(node, stats, start_time, monitor)
+        
+        if node.state in explored:
+            stats.duplicates += 1
+            if observer is not None: observer.on_duplicate(node)
+            continue
+            
+        if depth_limit is not None and node.depth >= depth_limit:
+            continue
+            
+        if cancel is not None and cancel.is_set():
+            return _failure(stats, start_time, CANCELLED, monitor)
+
+        explored.add(node.state)
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(node)
+        
+        for child in node.expand(problem, stats):
+            stats.generated += 1
+            if observer is not None: observer.on_generate(child)
+            if child.state not in explored:
+                frontier.push(child)
+            else:
+                stats.duplicates += 1
+                if observer is not None: observer.on_duplicate(child)
+        
+        if len(frontier) > stats.max_frontier: stats.max_frontier = len(frontier)
+        if monitor is not None and monitor.tick():
+            stats.max_closed = len(explored)
+            return _failure(stats, start_time, MEMORY_LIMIT, monitor)
+    
+    stats.max_closed = len(explored)
+    return _failure(stats, start_time, monitor=monitor)
+
+def ucs(problem: Problem, cancel=None, observer: Optional[SearchObserver] = None,
+        memory=None, memory_limit: Optional[int] = None, tie_break: str = FIFO,
+        nodes: str = OBJECTS) -> SearchResult:
+    """Búsqueda de costo uniforme (Uniform Cost Search)"""
+    _check_nodes(nodes)
+    if nodes != OBJECTS:
+        return _best_first_arena(problem, None, cancel, observer, memory_monitor(memory, memory_limit), tie_break)
+    start_time = time.perf_counter()
+    frontier = MinHeap(tie_break)
+    start_node = Node(problem.initial_state())
+    frontier.push(start_node, 0.0)
+    best_g = {start_node.state: 0.0}
+    stats = SearchStats()
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node, frontier, best_g)
+    
+    while not frontier.is_empty():
+        _, node = frontier.pop()
+        
+        if problem.is_goal(node.state):
+            if observer is not None: observer.on_goal(node)
+            stats.max_closed = len(best_g)
+            return _solution(node, stats, start_time, monitor)
+        
+        if node.state in best_g and node.g > best_g[node.state]:
+            continue
+            
+        if cancel is not None and cancel.is_set():
+            return _failure(stats, start_time, CANCELLED, monitor)
+
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(node)
+        
+        for child in node.expand(problem, stats):
+            stats.generated += 1
+            if observer is not None: observer.on_generate(child)
+            known = best_g.get(child.state)
+            if known is None or child.g < known:
+                if known is not None:
+                    stats.reopened += 1
+                    if observer is not None: observer.on_reopen(child)
+                best_g[child.state] = child.g
+                frontier.push(child, child.g, child.g)
+            else:
+                stats.duplicates += 1
+                if observer is not None: observer.on_duplicate(child)
+        
+        if len(frontier) > stats.max_frontier: stats.max_frontier = len(frontier)
+        if monitor is not None and monitor.tick():
+            stats.max_closed = len(best_g)
+            return _failure(stats, start_time, MEMORY_LIMIT, monitor)
+    
+    stats.max_closed = len(best_g)
+    return _failure(stats, start_time, monitor=monitor)
+
+def greedy(problem: Problem, h: Callable, cancel=None, observer: Optional[SearchObserver] = None,
+           memory=None, memory_limit: Optional[int] = None, tie_break: str = FIFO) -> SearchResult:
+    """Búsqueda voraz (Greedy Best-First Search)"""
+    start_time = time.perf_counter()
+    frontier = MinHeap(tie_break)
+    start_node = Node(problem.initial_state())
+    h_value = h(start_node.state)
+    frontier.push(start_node, h_value, 0.0, h_value)
+    explored = set()
+    stats = SearchStats()
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node, frontier, explored)
+    
+    while not frontier.is_empty():
+        _, node = frontier.pop()
+        
+        if problem.is_goal(node.state):
+            if observer is not None: observer.on_goal(node)
+            stats.max_closed = len(explored)
+            return _solution(node, stats, start_time, monitor)
+        
+        if node.state in explored:
+            stats.duplicates += 1
+            if observer is not None: observer.on_duplicate(node)
+            continue
+            
+        if cancel is not None and cancel.is_set():
+            return _failure(stats, start_time, CANCELLED, monitor)
+
+        explored.add(node.state)
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(node)
+        
+        for child in node.expand(problem, stats):
+            stats.generated += 1
+            if observer is not None: observer.on_generate(child)
+            if child.state not in explored:
+                h_value = h(child.state)
+                frontier.push(child, h_value, child.g, h_value)
+            else:
+                stats.duplicates += 1
+                if observer is not None: observer.on_duplicate(child)
+        
+        if len(frontier) > stats.max_frontier: stats.max_frontier = len(frontier)
+        if monitor is not None and monitor.tick():
+            stats.max_closed = len(explored)
+            return _failure(stats, start_time, MEMORY_LIMIT, monitor)
+    
+    stats.max_closed = len(explored)
+    return _failure(stats, start_time, monitor=monitor)
+
+def astar(problem: Problem, h: Callable, cancel=None, observer: Optional[SearchObserver] = None,
+          memory=None, memory_limit: Optional[int] = None, tie_break: str = FIFO,
+          nodes: str = OBJECTS, checkpoint=None, checkpoint_interval: float = 60.0) -> SearchResult:
+    """Búsqueda A* (A-Star)
+
+    Con `checkpoint` se guardan abiertos (el montículo tal cual), cerrados y
+    contadores; solo en modo nodes='objects'.
+    """
+    _check_nodes(nodes)
+    ckpt = checkpointer(checkpoint, checkpoint_interval)
+    if nodes != OBJECTS:
+        if ckpt is not None:
+            raise ValueError("checkpoint solo está disponible con nodes='objects'")
+        return _best_first_arena(problem, h, cancel, observer, memory_monitor(memory, memory_limit), tie_break)
+    start_time = time.perf_counter()
+    frontier = MinHeap(tie_break)
+    start_node = Node(problem.initial_state())
+    h_value = h(start_node.state)
+    frontier.push(start_node, start_node.g + h_value, 0.0, h_value)
+    best_g = {start_node.state: 0.0}
+    stats = SearchStats()
+    if ckpt is not None:
+        saved = ckpt.bind('astar', problem, heuristic=heuristic_name(h), tie_break=tie_break)
+        if saved is not None:
+            restore_heap(frontier, saved['frontier'])
+            best_g = saved['best_g']
+            restore_stats(stats, saved['stats'])
+            start_time -= saved['elapsed']
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node, frontier, best_g)
+    
+    while not frontier.is_empty():
+        # Antes de sacar el siguiente nodo abiertos y cerrados están completos
+        cancelled = cancel is not None and cancel.is_set()
+        if ckpt is not None and (cancelled or ckpt.due()):
+            ckpt.save({'frontier': heap_state(frontier), 'best_g': best_g, 'stats': stats_state(stats),
+                       'elapsed': time.perf_counter() - start_time})
+        if cancelled:
+            stats.max_closed = len(best_g)
+            return _checkpointed(_failure(stats, start_time, CANCELLED, monitor), ckpt)
+        
+        _, node = frontier.pop()
+        
+        if problem.is_goal(node.state):
+            if observer is not None: observer.on_goal(node)
+            stats.max_closed = len(best_g)
+            return _checkpointed(_solution(node, stats, start_time, monitor), ckpt)
+        
+        if node.state in best_g and node.g > best_g[node.state]:
+            continue
+
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(node)
+        
+        for child in node.expand(problem, stats):
+            stats.generated += 1
+            if observer is not None: observer.on_generate(child)
+            known = best_g.get(child.state)
+            if known is None or child.g < known:
+                if known is not None:
+                    stats.reopened += 1
+                    if observer is not None: observer.on_reopen(child)
+                best_g[child.state] = child.g
+                h_value = h(child.state)
+                frontier.push(child, child.g + h_value, child.g, h_value)
+            else:
+                stats.duplicates += 1
+                if observer is not None: observer.on_duplicate(child)
+        
+        if len(frontier) > stats.max_frontier: stats.max_frontier = len(frontier)
+        if monitor is not None and monitor.tick():
+            stats.max_closed = len(best_g)
+            return _checkpointed(_failure(stats, start_time, MEMORY_LIMIT, monitor), ckpt)
+    
+    stats.max_closed = len(best_g)
+    return _checkpointed(_failure(stats, start_time, monitor=monitor), ckpt)
+
+def _bfs_arena(problem: Problem, cancel, observer: Optional[SearchObserver],
+               monitor: Optional[MemoryMonitor]) -> SearchResult:
+    """bfs con nodos en un NodeArena: la frontera guarda índices, los cerrados claves bytes"""
+    start_time = time.perf_counter()
+    initial = problem.initial_state()
+    arena = NodeArena(len(initial))
+    frontier = IndexQueue()
+    frontier.push(arena.add(pack(initial)))
+    explored = set()
+    stats = SearchStats()
+    if monitor is not None: monitor.start(stats, None, frontier, explored, arena, node_bytes=entry_size(pack(initial)))
+    
+    while not frontier.is_empty():
+        index = frontier.pop()
+        state = arena.state(index)
+        
+        if problem.is_goal(state):
+            node = arena.node(index)
+            if observer is not None: observer.on_goal(node)
+            stats.max_closed = len(explored)
+            return _solution(node, stats, start_time, monitor)
+        
+        key = arena.key(index)
+        if key in explored:
+            stats.duplicates += 1
+            if observer is not None: observer.on_duplicate(arena.node(index))
+            continue
+            
+        if cancel is not None and cancel.is_set():
+            return _failure(stats, start_time, CANCELLED, monitor)
+
+        explored.add(key)
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(arena.node(index))
+        
+        g = arena.g[index]
+        last = arena.action_of(index)
+        for action, child, cost in problem.successors(state, last, stats):
+            stats.generated += 1
+            child_key = pack(child)
+            fresh = child_key not in explored
+            # Con observador también se guardan los duplicados (necesitan una vista)
+            if fresh or observer is not None:
+                child_index = arena.add(child_key, index, action, g + cost)
+                if observer is not None: observer.on_generate(arena.node(child_index))
+            if fresh:
+                frontier.push(child_index)
+            else:
+                stats.duplicates += 1
+                if observer is not None: observer.on_duplicate(arena.node(child_index))
+        
+        if len(frontier) > stats.max_frontier: stats.max_frontier = len(frontier)
+        if monitor is not None and monitor.tick():
+            stats.max_closed = len(explored)
+            return _failure(stats, start_time, MEMORY_LIMIT, monitor)
+    
+    stats.max_closed = len(explored)
+    return _failure(stats, start_time, monitor=monitor)
+
+def _best_first_arena(problem: Problem, h: Optional[Callable], cancel, observer: Optional[SearchObserver],
+                      monitor: Optional[MemoryMonitor], tie_break: str) -> SearchResult:
+    """ucs (h=None) y astar con nodos en un NodeArena; mismo orden de expansión"""
+    start_time = time.perf_counter()
+    initial = problem.initial_state()
+    arena = NodeArena(len(initial))
+    frontier = MinHeap(tie_break)
+    h_value = h(initial) if h is not None else 0.0
+    frontier.push(arena.add(pack(initial), h=h_value), h_value, 0.0, h_value)
+    best_g = {pack(initial): 0.0}
+    stats = SearchStats()
+    if monitor is not None: monitor.start(stats, None, frontier, best_g, arena, node_bytes=entry_size(pack(initial)))
+    
+    while not frontier.is_empty():
+        _, index = frontier.pop()
+        state = arena.state(index)
+        g = arena.g[index]
+        
+        if problem.is_goal(state):
+            node = arena.node(index)
+            if observer is not None: observer.on_goal(node)
+            stats.max_closed = len(best_g)
+            return _solution(node, stats, start_time, monitor)
+        
+        if g > best_g[arena.key(index)]:
+            continue
+            
+        if cancel is not None and cancel.is_set():
+            return _failure(stats, start_time, CANCELLED, monitor)
+
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(arena.node(index))
+        
+        last = arena.action_of(index)
+        for action, child, cost in problem.successors(state, last, stats):
+            stats.generated += 1
+            child_g = g + cost
+            child_key = pack(child)
+            known = best_g.get(child_key)
+            better = known is None or child_g < known
+            if better or observer is not None:
+                h_value = h(child) if better and h is not None else 0.0
+                child_index = arena.add(child_key, index, action, child_g, h_value)
+                if observer is not None: observer.on_generate(arena.node(child_index))
+            if better:
+                if known is not None:
+                    stats.reopened += 1
+                    if observer is not None: observer.on_reopen(arena.node(child_index))
+                best_g[child_key] = child_g
+                frontier.push(child_index, child_g + h_value, child_g, h_value)
+            else:
+                stats.duplicates += 1
+                if observer is not None: observer.on_duplicate(arena.node(child_index))
+        
+        if len(frontier) > stats.max_frontier: stats.max_frontier = len(frontier)
+        if monitor is not None and monitor.tick():
+            stats.max_closed = len(best_g)
+            return _failure(stats, start_time, MEMORY_LIMIT, monitor)
+    
+    stats.max_closed = len(best_g)
+    return _failure(stats, start_time, monitor=monitor)
+
+class _Stopped(Exception):
+    """Corte de _frontier_layers por cancelación o tope de memoria"""
+    def __init__(self, status: str):
+        self.status = status
+
+def _frontier_layers(problem: Problem, start, target, relay: Optional[int], stats: SearchStats,
+                     cancel, observer: Optional[SearchObserver], monitor: Optional[MemoryMonitor]):
+    """BFS por capas desde `start` hasta un estado con target(estado).
+
+    Solo guarda las capas anterior, actual y siguiente (estado -> relevo): en un
+    grafo no dirigido los vecinos de la capa k están en k-1, k o k+1, así que no
+    hace falta la lista completa de cerrados. El relevo de cada estado es su
+    ancestro en la profundidad `relay`. Devuelve (profundidad, meta, relevo) o
+    None si se agotó el espacio.
+    """
+    if target(start):
+        if observer is not None: observer.on_goal(Node(start))
+        return 0, start, start
+    previous: Dict[Any, Any] = {}
+    current: Dict[Any, Any] = {start: start if relay == 0 else None}
+    depth = 0
+    while current:
+        following: Dict[Any, Any] = {}
+        if monitor is not None: monitor.watch(previous, current, following)
+        for state, mid in current.items():
+            if cancel is not None and cancel.is_set():
+                raise _Stopped(CANCELLED)
+            stats.expanded += 1
+            if observer is not None: observer.on_expand(Node(state))
+            for _, child, _ in problem.successors(state):
+                stats.generated += 1
+                if child in previous or child in current or child in following:
+                    stats.duplicates += 1
+                    continue
+                child_mid = child if depth + 1 == relay else mid
+                # Prueba de meta al generar: se ahorra expandir la capa de la meta
+                if target(child):
+                    if observer is not None: observer.on_goal(Node(child))
+                    return depth + 1, child, child_mid
+                following[child] = child_mid
+            if monitor is not None and monitor.tick():
+                raise _Stopped(MEMORY_LIMIT)
+        if len(following) > stats.max_frontier: stats.max_frontier = len(following)
+        if len(previous) + len(current) > stats.max_closed: stats.max_closed = len(previous) + len(current)
+        previous, current = current, following
+        depth += 1
+    return None
+
+def _layered_bfs(problem: Problem, cancel, observer: Optional[SearchObserver],
+                 monitor: Optional[MemoryMonitor]) -> SearchResult:
+    """BFS de frontera (Korf): sin punteros al padre; el camino se reconstruye por
+    divide y vencerás repitiendo la búsqueda con un relevo en la mitad (≈2x tiempo).
+
+    Los contadores principales son solo los de la búsqueda hasta la meta
+    (comparables con los demás motores); lo que cuesta reconstruir el camino va
+    aparte en result['reconstruction'].
+    """
+    start_time = time.perf_counter()
+    start = problem.initial_state()
+    stats = SearchStats()
+    rebuild = SearchStats()
+    searches = 0
+    if monitor is not None: monitor.start(stats, None, node_bytes=sys.getsizeof(start))
+
+    def search(source, target, relay=None, observer=None, counters=stats):
+        return _frontier_layers(problem, source, target, relay, counters, cancel, observer, monitor)
+
+    def path(source, goal, depth: int) -> List[Any]:
+        nonlocal searches
+        if depth <= 1:
+            return [source, goal] if depth else [source]
+        half = depth // 2
+        searches += 1
+        _, _, mid = search(source, lambda s: s == goal, half, counters=rebuild)
+        return path(source, mid, half) + path(mid, goal, depth - half)[1:]
+
+    try:
+        found = search(start, problem.is_goal, observer=observer)
+        if found is None:
+            return _failure(stats, start_time, monitor=monitor)
+        depth, goal, _ = found
+        states = path(start, goal, depth)
+    except _Stopped as stop:
+        return _failure(stats, start_time, stop.status, monitor)
+    # Cadena de nodos para el resultado: la acción de cada paso se recupera de successors
+    node = Node(start)
+    for state in states[1:]:
+        action, cost = next((a, c) for a, child, c in problem.successors(node.state) if child == state)
+        node = Node(state, node, action, cost)
+    result = _solution(node, stats, start_time, monitor)
+    result['reconstruction'] = {'searches': searches, 'expanded': rebuild.expanded,
+                                'generated': rebuild.generated, 'max_frontier': rebuild.max_frontier}
+    return result
+
+def ida_star(problem: Problem, h: Callable, max_bound: int = 10000, cancel=None,
+             observer: Optional[SearchObserver] = None, memory=None,
+             memory_limit: Optional[int] = None, checkpoint=None,
+             checkpoint_interval: float = 60.0) -> SearchResult:
+    """Búsqueda IDA* (Iterative Deepening A-Star)
+
+    La recursión va en una pila explícita de marcos; con `checkpoint` la cota y
+    la pila se guardan cada `checkpoint_interval` segundos y una corrida
+    interrumpida continúa desde ahí (ver solver/checkpoint.py).
+    """
+    start_time = time.perf_counter()
+    start_node = Node(problem.initial_state())
+    bound = h(start_node.state)
+    stats = SearchStats()
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node)
+    ckpt = checkpointer(checkpoint, checkpoint_interval)
+    # La "frontera" de IDA* es la pila: marcos [nodo, hijos, siguiente hijo, mínimo f podado]
+    stack: List[list] = []
+    goal = None
+    stopped = None  # CANCELLED / MEMORY_LIMIT si hay que abortar
+    
+    if ckpt is not None:
+        saved = ckpt.bind('ida_star', problem, heuristic=heuristic_name(h), max_bound=max_bound)
+        if saved is not None:
+            bound = saved['bound']
+            restore_stats(stats, saved['stats'])
+            start_time -= saved['elapsed']
+            # Rehacer la pila: cada marco sigue al hijo anterior a su `siguiente`
+            node = start_node
+            for index, min_f in saved['frames']:
+                children = list(node.expand(problem))
+                stack.append([node, children, index, min_f])
+                node = children[index - 1] if index else None
+    
+    def save():
+        ckpt.save({'bound': bound, 'stats': stats_state(stats),
+                   'frames': [(frame[2], frame[3]) for frame in stack],
+                   'elapsed': time.perf_counter() - start_time})
+    
+    def enter(node) -> Optional[float]:
+        """Visita un nodo: devuelve f si queda fuera de la cota; si no, lo apila (o es la meta)"""
+        nonlocal goal, stopped
+        f = node.g + h(node.state)
+        if f > bound:
+            return f
+        if problem.is_goal(node.state):
+            if observer is not None: observer.on_goal(node)
+            goal = node
+            return None
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(node)
+        if node.depth + 1 > stats.max_frontier: stats.max_frontier = node.depth + 1
+        if monitor is not None and monitor.tick():
+            stopped = MEMORY_LIMIT
+            return None
+        stack.append([node, list(node.expand(problem, stats)), 0, float('inf')])
+        return None
+    
+    while bound <= max_bound:
+        t = enter(start_node) if not stack else None
+        while stack and goal is None and stopped is None:
+            # Aquí la pila está completa: el único punto donde se guarda o se cancela
+            cancelled = cancel is not None and cancel.is_set()
+            if ckpt is not None and (cancelled or ckpt.due()):
+                save()
+            if cancelled:
+                stopped = CANCELLED
+                break
+            frame = stack[-1]
+            node, children, index, min_f = frame
+            if index == len(children):
+                stack.pop()
+                if stack:
+                    if min_f < stack[-1][3]: stack[-1][3] = min_f
+                else:
+                    t = min_f
+                continue
+            frame[2] = index + 1
+            child = children[index]
+            stats.generated += 1
+            if observer is not None: observer.on_generate(child)
+            f = enter(child)
+            if f is not None and f < frame[3]:
+                frame[3] = f
+        if goal is not None:
+            return _checkpointed(_solution(goal, stats, start_time, monitor), ckpt)
+        if stopped:
+            return _checkpointed(_failure(stats, start_time, stopped, monitor), ckpt)
+        if t == float('inf'):
+            break
+        bound = t
+    
+    return _checkpointed(_failure(stats, start_time, monitor=monitor), ckpt)
+
+def beam_search(problem: Problem, h: Callable, width: int = 64, max_depth: int = 1000, cancel=None,
+                observer: Optional[SearchObserver] = None, memory=None,
+                memory_limit: Optional[int] = None) -> SearchResult:
+    """Búsqueda en haz (Beam Search): por capas, conserva los `width` mejores por h
+
+    No es completa ni óptima, pero la memoria queda acotada por width × profundidad
+    (cada capa guarda a lo sumo `width` nodos y sus caminos) y el tiempo por
+    width × profundidad × ramificación. Los duplicados se eliminan dentro de cada
+    capa y contra las dos capas anteriores (deshacer un movimiento).
+    """
+    start_time = time.perf_counter()
+    start_node = Node(problem.initial_state())
+    stats = SearchStats()
+    layer = [start_node]
+    previous = set()  # estados de la capa anterior
+    current = {start_node.state}
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node, layer, current)
+    
+    if problem.is_goal(start_node.state):
+        if observer is not None: observer.on_goal(start_node)
+        return _solution(start_node, stats, start_time, monitor)
+    
+    for _ in range(max_depth):
+        candidates: Dict[Any, tuple] = {}  # estado -> (h, orden, nodo): dedup por capa
+        for node in layer:
+            if cancel is not None and cancel.is_set():
+                return _failure(stats, start_time, CANCELLED, monitor)
+            stats.expanded += 1
+            if observer is not None: observer.on_expand(node)
+            for child in node.expand(problem, stats):
+                stats.generated += 1
+                if observer is not None: observer.on_generate(child)
+                if problem.is_goal(child.state):
+                    if observer is not None: observer.on_goal(child)
+                    stats.max_closed = len(previous) + len(current)
+                    return _solution(child, stats, start_time, monitor)
+                if child.state in candidates or child.state in current or child.state in previous:
+                    stats.duplicates += 1
+                    if observer is not None: observer.on_duplicate(child)
+                    continue
+                candidates[child.state] = (h(child.state), stats.generated, child)
+            if monitor is not None and monitor.tick():
+                return _failure(stats, start_time, MEMORY_LIMIT, monitor)
+        if not candidates:
+            break
+        layer = [entry[2] for entry in heapq.nsmallest(width, candidates.values())]
+        previous, current = current, {node.state for node in layer}
+        if len(candidates) > stats.max_frontier: stats.max_frontier = len(candidates)
+        if len(previous) + len(current) > stats.max_closed: stats.max_closed = len(previous) + len(current)
+        if monitor is not None: monitor.watch(layer, current, previous)
+    
+    return _failure(stats, start_time, monitor=monitor)
+
+def bounded_best_first(problem: Problem, h: Callable, width: int = 256, weight: float = 1.0,
+                       max_expansions: Optional[int] = None, cancel=None,
+                       observer: Optional[SearchObserver] = None, memory=None,
+                       memory_limit: Optional[int] = None, tie_break: str = FIFO) -> SearchResult:
+    """Best-first de ancho acotado: A* ponderado (g + weight·h) con la frontera
+    limitada a los `width` mejores nodos (se descartan los peores al pasarse).
+
+    La tabla de duplicados guarda a lo sumo width × 64 estados; al llenarse se
+    reinicia con los de la frontera, así la memoria no crece con las expansiones.
+    Como olvida estados, con una meta inalcanzable (o un ancho muy chico) puede
+    no terminar: `max_expansions` o `cancel` la cortan con EXHAUSTED o CANCELLED.
+    """
+    start_time = time.perf_counter()
+    frontier = MinHeap(tie_break)
+    start_node = Node(problem.initial_state())
+    h_value = h(start_node.state)
+    frontier.push(start_node, weight * h_value, 0.0, h_value)
+    best_g = {start_node.state: 0.0}
+    table_limit = width * 64
+    stats = SearchStats()
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node, frontier, best_g)
+    
+    while not frontier.is_empty():
+        _, node = frontier.pop()
+        
+        if problem.is_goal(node.state):
+            if observer is not None: observer.on_goal(node)
+            return _solution(node, stats, start_time, monitor)
+        
+        if node.g > best_g.get(node.state, node.g):
+            continue
+        if cancel is not None and cancel.is_set():
+            return _failure(stats, start_time, CANCELLED, monitor)
+        if max_expansions is not None and stats.expanded >= max_expansions:
+            break
+        
+        stats.expanded += 1
+        if observer is not None: observer.on_expand(node)
+        
+        for child in node.expand(problem, stats):
+            stats.generated += 1
+            if observer is not None: observer.on_generate(child)
+            known = best_g.get(child.state)
+            if known is None or child.g < known:
+                if known is not None:
+                    stats.reopened += 1
+                    if observer is not None: observer.on_reopen(child)
+                best_g[child.state] = child.g
+                h_value = h(child.state)
+                frontier.push(child, child.g + weight * h_value, child.g, h_value)
+            else:
+                stats.duplicates += 1
+                if observer is not None: observer.on_duplicate(child)
+        
+        if len(frontier) > 2 * width:
+            # Recorte amortizado: conservar los `width` de menor prioridad
+            frontier.truncate(width)
+        if len(best_g) > table_limit:
+            best_g = {n.state: n.g for n in frontier}
+            if monitor is not None: monitor.watch(frontier, best_g)
+        if len(frontier) > stats.max_frontier: stats.max_frontier = len(frontier)
+        if len(best_g) > stats.max_closed: stats.max_closed = len(best_g)
+        if monitor is not None and monitor.tick():
+            return _failure(stats, start_time, MEMORY_LIMIT, monitor)
+    
+    return _failure(stats, start_time, monitor=monitor)
+
+def ara_star(problem: Problem, h: Callable, w0: float = 3.0, w_step: float = 0.5,
+             deadline: Optional[float] = None, cancel=None, observer: Optional[SearchObserver] = None,
+             on_solution: Optional[Callable[[SearchResult], None]] = None, memory=None,
+             memory_limit: Optional[int] = None, tie_break: str = FIFO) -> SearchResult:
+    """Búsqueda ARA* (Anytime Repairing A*, Likhachev et al. 2003)
+
+    Encuentra primero una solución con A* ponderado (f = g + w0·h) y, mientras
+    quede tiempo (`deadline`, en segundos), baja w en `w_step` reutilizando la
+    búsqueda anterior hasta probar la optimalidad (w = 1). Cada mejora se
+    reporta a `on_solution` y se acumula en result['solutions']; result['bound']
+    acota el costo relativo al óptimo (costo <= bound · óptimo).
+    """
+    start_time = time.perf_counter()
+    stop_at = start_time + deadline if deadline is not None else None
+    start_node = Node(problem.initial_state())
+    best = {start_node.state: start_node}  # mejor nodo (g y padre) por estado
+    h_cache: Dict[Any, float] = {}
+    open_states = {start_node.state}
+    incons = set()  # mejorados después de cerrarlos en esta iteración
+    stats = SearchStats()
+    monitor = memory_monitor(memory, memory_limit)
+    if monitor is not None: monitor.start(stats, start_node, open_states, best)
+    incumbent = start_node if problem.is_goal(start_node.state) else None
+    solutions = []
+    w = max(1.0, w0)
+    
+    def hv(state):
+        value = h_cache.get(state)
+        if value is None:
+            value = h_cache[state] = h(state)
+        return value
+    
+    def report(bound):
+        solutions.append({'cost': incumbent.g, 'depth': incumbent.depth, 'weight': w, 'bound': bound,
+                          'time': time.perf_counter() - start_time, 'expanded': stats.expanded})
+        if on_solution is not None:
+            on_solution(dict(solutions[-1]))
+    
+    def finish(status=SOLVED):
+        stats.max_closed = len(best)
+        if incumbent is None:
+            return _failure(stats, start_time, status, monitor)
+        result = _solution(incumbent, stats, start_time, monitor)
+        if status != SOLVED:
+            result['interrupted'] = status
+        result['bound'] = solutions[-1]['bound'] if solutions else w
+        result['weight'] = w
+        result['solutions'] = solutions
+        return result
+    
+    while True:
+        frontier = MinHeap(tie_break)
+        for state in open_states:
+            node = best[state]
+            frontier.push(node, node.g + w * hv(state), node.g, hv(state))
+        closed = set()
+        stopped = None
+        
+        # ImprovePath: A* ponderado hasta que ningún abierto pueda mejorar la solución
+        while not frontier.is_empty():
+            f, node = frontier.pop()
+            if node.state not in open_states or best[node.state] is not node:
+                continue  # entrada vieja: el estado mejoró o ya se expandió
+            if incumbent is not None and incumbent.g <= f:
+                break
+            if cancel is not None and cancel.is_set():
+                stopped = CANCELLED
+                break
+            if stop_at is not None and time.perf_counter() >= stop_at:
+                stopped = DEADLINE
+                break
+            
+            open_states.discard(node.state)
+            closed.add(node.state)
+            stats.expanded += 1
+            if observer is not None: observer.on_expand(node)
+            
+            for child in node.expand(problem, stats):
+                stats.generated += 1
+                if observer is not None: observer.on_generate(child)
+                known = best.get(child.state)
+                if known is not None and child.g >= known.g:
+                    stats.duplicates += 1
+                    if observer is not None: observer.on_duplicate(child)
+                    continue
+                if known is not None:
+                    stats.reopened += 1
+                    if observer is not None: observer.on_reopen(child)
+                best[child.state] = child
+                if problem.is_goal(child.state) and (incumbent is None or child.g < incumbent.g):
+                    incumbent = child
+                    if observer is not None: observer.on_goal(child)
+                if child.state in closed:
+                    incons.add(child.state)
+                else:
+                    open_states.add(child.state)
+                    h_value = hv(child.state)
+                    frontier.push(child, child.g + w * h_value, child.g, h_value)
+            
+            if len(open_states) > stats.max_frontier: stats.max_frontier = len(open_states)
+            if monitor is not None and monitor.tick():
+                stopped = MEMORY_LIMIT
+                break
+        
+        if stopped is not None:
+            return finish(stopped)
+        if incumbent is None:
+            return finish(EXHAUSTED)
+        
+        # Cota: costo / mínimo g+h de lo pendiente (sin pendientes, la solución es óptima)
+        pending = [best[s].g + hv(s) for s in open_states | incons]
+        bound = min(w, incumbent.g / min(pending)) if pending and min(pending) > 0 else 1.0
+        bound = max(1.0, bound)
+        if not solutions or incumbent.g < solutions[-1]['cost'] or bound < solutions[-1]['bound']:
+            report(bound)
+        if bound <= 1.0 or w <= 1.0:
+            return finish()
+        
+        w = max(1.0, w - w_step)
+        open_states |= incons
+        incons = set()
+
+# Aliases para compatibilidad con código existente
+BFS = bfs
+DFS = dfs
+UCS = ucs
+Greedy = greedy
+A_star = astar
+IDA_star = ida_star
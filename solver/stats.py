@@ -0,0 +1,65 @@
+"""Instrumentación de búsquedas: observadores y contadores por corrida."""
+from typing import Any, Dict, Optional
+
+class SearchObserver:
+    """Interfaz de observación de una búsqueda; por defecto no hace nada.
+
+    Los algoritmos solo llaman a estos métodos cuando reciben un observador
+    (``observer=None`` por defecto), así que sin él no hay costo por llamada.
+    """
+    def on_generate(self, node) -> None: pass   # hijo generado
+    def on_expand(self, node) -> None: pass     # nodo expandido
+    def on_duplicate(self, node) -> None: pass  # hijo descartado: estado ya visto sin mejorar g
+    def on_reopen(self, node) -> None: pass     # estado ya conocido reinsertado con mejor g
+    def on_goal(self, node) -> None: pass       # meta encontrada
+
+class SearchStats:
+    """Contadores de una corrida (se vuelcan en el diccionario resultado)"""
+    __slots__ = ("expanded", "generated", "duplicates", "reopened", "pruned", "max_frontier", "max_closed")
+
+    def __init__(self):
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.reopened = 0
+        self.pruned = 0  # hijos no generados por la poda de operadores (Problem.INVERSE/COMMUTING)
+        self.max_frontier = 0
+        self.max_closed = 0
+
+    def as_dict(self, depth: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'duplicates': self.duplicates,
+            'reopened': self.reopened,
+            'pruned': self.pruned,
+            'max_frontier': self.max_frontier,
+            'max_closed': self.max_closed,
+            'ebf': effective_branching_factor(self.generated, depth) if depth else None,
+        }
+
+def effective_branching_factor(generated: int, depth: int, tol: float = 1e-6) -> float:
+    """b* tal que 1 + b* + b*^2 + ... + b*^d = generated + 1 (Russell & Norvig)"""
+    target = generated + 1
+    if depth <= 0 or target <= depth + 1:
+        return 1.0
+
+    def total(b):
+        # Corta al pasar el objetivo: con d de miles (DFS) b**d desbordaría el float
+        acc, term = 0.0, 1.0
+        for _ in range(depth + 1):
+            acc += term
+            if acc >= target:
+                break
+            term *= b
+        return acc
+
+    # b*^d <= total, así que b* <= target^(1/d)
+    lo, hi = 1.0, target ** (1.0 / depth) + 1.0
+    while hi - lo > tol:
+        mid = (lo + hi) / 2
+        if total(mid) < target:
+            lo = mid
+        else:
+            hi = mid
+    return round((lo + hi) / 2, 4)
@@ -0,0 +1,162 @@
+"""Tablas precalculadas guardadas en disco y mapeadas (mmap) bajo demanda.
+
+Uso:
+    python -m solver.tables build [--force] [nombre ...]
+    python -m solver.tables info
+"""
+from typing import Callable, Dict, List, Optional
+import mmap
+import os
+import struct
+import sys
+import time
+
+from .ranking import rank, num_permutations
+
+DATA_DIR = os.environ.get("SOLVER_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data"))
+
+MAGIC = b"NPZT"
+VERSION = 1
+HEADER = struct.Struct("<4sIQ")  # magic, versión, largo del payload
+UNREACHABLE = 255
+
+_BUILDERS: Dict[str, Callable[[], bytes]] = {}
+_LOADED: Dict[str, memoryview] = {}
+_MAPS: Dict[str, mmap.mmap] = {}
+
+def register(name: str):
+    """Registra un constructor de tabla con el nombre dado"""
+    def deco(fn: Callable[[], bytes]):
+        _BUILDERS[name] = fn
+        return fn
+    return deco
+
+def available() -> List[str]:
+    return sorted(_BUILDERS)
+
+def table_path(name: str) -> str:
+    return os.path.join(DATA_DIR, f"{name}.bin")
+
+def build(name: str, force: bool = False) -> str:
+    """Construye la tabla y la escribe de forma atómica; retorna la ruta"""
+    path = table_path(name)
+    if os.path.exists(path) and not force:
+        return path
+    return write(path, _BUILDERS[name]())
+
+def write(path: str, payload: bytes) -> str:
+    """Escribe una tabla (cabecera + payload) de forma atómica"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(payload)))
+        f.write(payload)
+    os.replace(tmp, path)
+    return path
+
+def _map(path: str) -> Optional[memoryview]:
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    magic, version, length = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or version != VERSION or len(mm) != HEADER.size + length:
+        mm.close()
+        return None
+    _MAPS[path] = mm
+    return memoryview(mm)[HEADER.size:]
+
+def load(name: str) -> memoryview:
+    """Retorna la tabla mapeada desde disco; si falta (o es inválida) la construye"""
+    table = _LOADED.get(name)
+    if table is not None:
+        return table
+    if name not in _BUILDERS:
+        raise KeyError(f"Tabla desconocida: {name}")
+    table = _map(table_path(name))
+    if table is None:
+        print(f"⚠️  Tabla '{name}' no encontrada en {DATA_DIR}; construyendo...", file=sys.stderr)
+        table = _map(build(name, force=True))
+    _LOADED[name] = table
+    return table
+
+def preload(names: Optional[List[str]] = None) -> Dict[str, float]:
+    """Fase de arranque: mapea las tablas y retorna el tiempo (s) de cada una"""
+    timings = {}
+    for name in names or available():
+        t0 = time.perf_counter()
+        load(name)
+        timings[name] = time.perf_counter() - t0
+    return timings
+
+# ---------------------------------------------------------------------------
+# Tablas registradas
+
+GOAL_3x3 = (1,2,3,4,5,6,7,8,0)
+
+def _neighbors(width: int, height: int) -> List[List[int]]:
+    """Para cada posición del hueco, las posiciones a las que puede moverse"""
+    result = []
+    for i in range(width * height):
+        x, y = divmod(i, width)
+        moves = []
+        if x > 0: moves.append(i - width)
+        if x < height - 1: moves.append(i + width)
+        if y > 0: moves.append(i - 1)
+        if y < width - 1: moves.append(i + 1)
+        result.append(moves)
+    return result
+
+def bfs_distances(goal, width: int, height: int) -> Dict[tuple, int]:
+    """Distancia exacta a la meta de todos los estados alcanzables (BFS hacia atrás)"""
+    neighbors = _neighbors(width, height)
+    dist = {goal: 0}
+    layer = [goal]
+    d = 0
+    while layer:
+        d += 1
+        nxt = []
+        for s in layer:
+            i = s.index(0)
+            for j in neighbors[i]:
+                t = list(s)
+                t[i], t[j] = t[j], t[i]
+                t = tuple(t)
+                if t not in dist:
+                    dist[t] = d
+                    nxt.append(t)
+        layer = nxt
+    return dist
+
+@register("distance_3x3")
+def _build_distance_3x3() -> bytes:
+    """Distancia óptima a GOAL por rango de permutación (255 = inalcanzable)"""
+    from . import vectorized
+    if vectorized.np is not None:
+        return vectorized.distance_table(3, 3, GOAL_3x3).tobytes()
+    table = bytearray([UNREACHABLE]) * num_permutations(9)
+    for s, d in bfs_distances(GOAL_3x3, 3, 3).items():
+        table[rank(s)] = d
+    return bytes(table)
+
+def distance_3x3(state) -> int:
+    """Largo de la solución óptima de un estado 3x3 hacia GOAL (255 si no tiene)"""
+    return load("distance_3x3")[rank(state)]
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if args and args[0] == "build":
+        force = "--force" in args
+        names = [a for a in args[1:] if not a.startswith("--")] or available()
+        for name in names:
+            t0 = time.perf_counter()
+            path = build(name, force=force)
+            print(f"{name:<16} {os.path.getsize(path):>10} bytes  {time.perf_counter() - t0:.3f}s  {path}")
+    elif args and args[0] == "info":
+        for name in available():
+            path = table_path(name)
+            status = f"{os.path.getsize(path)} bytes" if os.path.exists(path) else "no construida"
+            print(f"{name:<16} {status}")
+    else:
+        print("Uso: python -m solver.tables build [--force] [nombre ...] | info")
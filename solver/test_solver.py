@@ -0,0 +1,383 @@
+"""Pruebas del paquete solver.
+
+Desde la raíz del repositorio: python -m pytest solver
+"""
+import os
+from collections import Counter
+
+import pytest
+
+from Heuristics import compile_heuristic, manhattan_distance
+from Strucure import TIE_BREAKS, MinHeap
+from solver import backward, generator, search, tables, vectorized
+from solver.external import ExternalBFS, load_table
+from solver.problem import SlidingPuzzle
+from solver.ranking import rank
+
+GOAL_3X3 = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+BOARDS_3X3 = [
+    GOAL_3X3,                       # 0 movimientos
+    (1, 2, 3, 4, 5, 6, 7, 0, 8),    # 1
+    (1, 2, 3, 4, 0, 6, 7, 5, 8),    # 2
+    (8, 3, 1, 2, 4, 5, 7, 6, 0),    # 20
+    (7, 2, 4, 5, 0, 6, 8, 3, 1),    # 20
+]
+OPTIMAL_3X3 = [0, 1, 2, 20, 20]
+UNSOLVABLE_2X3 = (2, 1, 3, 4, 5, 0)  # paridad distinta de la meta: 360 estados alcanzables
+
+def manhattan(problem: SlidingPuzzle):
+    return lambda s: manhattan_distance(s, problem.goal, problem.width)
+
+def assert_valid_solution(problem: SlidingPuzzle, result) -> None:
+    """Las acciones llevan del inicio a la meta, una por una, y coinciden con path/depth/cost"""
+    assert result["success"] and result["status"] == search.SOLVED
+    state = problem.initial
+    assert result["path"][0] == state
+    for action, expected in zip(result["actions"], result["path"][1:]):
+        assert action in problem.actions(state)
+        state = problem.result(state, action)
+        assert state == expected
+    assert problem.is_goal(state)
+    assert len(result["actions"]) == len(result["path"]) - 1 == result["depth"] == result["cost"]
+
+# Nodos en arena (nodes='arena') contra objetos Node
+
+@pytest.mark.parametrize("algorithm", ["bfs", "ucs", "astar"])
+@pytest.mark.parametrize("board, optimal", list(zip(BOARDS_3X3, OPTIMAL_3X3)))
+def test_arena_matches_objects(algorithm, board, optimal):
+    problem = SlidingPuzzle(board)
+    args = (manhattan(problem),) if algorithm == "astar" else ()
+    engine = getattr(search, algorithm)
+    objects = engine(problem, *args, nodes="objects")
+    arena = engine(problem, *args, nodes="arena")
+    for result in (objects, arena):
+        assert_valid_solution(problem, result)
+        assert result["cost"] == optimal
+    assert arena["status"] == objects["status"]
+    # Mismo orden de expansión: mismos contadores
+    for counter in ("expanded", "generated", "duplicates", "pruned"):
+        assert arena[counter] == objects[counter], counter
+
+@pytest.mark.parametrize("algorithm", ["bfs", "ucs", "astar"])
+def test_arena_exhausts_like_objects(algorithm):
+    problem = SlidingPuzzle(UNSOLVABLE_2X3, width=3)
+    args = (manhattan(problem),) if algorithm == "astar" else ()
+    engine = getattr(search, algorithm)
+    objects = engine(problem, *args, nodes="objects")
+    arena = engine(problem, *args, nodes="arena")
+    assert objects["status"] == arena["status"] == search.EXHAUSTED
+    assert not arena["success"] and arena["expanded"] == objects["expanded"] == 360
+
+def test_arena_rejects_unknown_modes():
+    with pytest.raises(ValueError):
+        search.bfs(SlidingPuzzle(GOAL_3X3), nodes="tuples")
+
+# BFS de frontera por capas (layered=True): camino rearmado por divide y vencerás
+
+@pytest.mark.parametrize("board, optimal", list(zip(BOARDS_3X3, OPTIMAL_3X3)))
+def test_layered_bfs_path_is_optimal(board, optimal):
+    problem = SlidingPuzzle(board)
+    layered = search.bfs(problem, layered=True)
+    assert_valid_solution(problem, layered)
+    assert layered["cost"] == search.bfs(problem)["cost"] == optimal
+    rebuild = layered["reconstruction"]
+    assert set(rebuild) == {"searches", "expanded", "generated", "max_frontier"}
+    if optimal <= 1:
+        assert rebuild == {"searches": 0, "expanded": 0, "generated": 0, "max_frontier": 0}
+    else:
+        assert rebuild["searches"] >= 1 and rebuild["expanded"] > 0
+
+def test_layered_bfs_odd_depth_on_a_rectangular_board():
+    problem = SlidingPuzzle((4, 5, 0, 1, 2, 3), width=3)  # el más lejano del 2x3: 21 movimientos
+    layered = search.bfs(problem, layered=True)
+    assert_valid_solution(problem, layered)
+    assert layered["cost"] == search.bfs(problem)["cost"] == 21
+
+def test_layered_bfs_unreachable_goal():
+    problem = SlidingPuzzle(UNSOLVABLE_2X3, width=3)
+    result = search.bfs(problem, layered=True)
+    assert result["status"] == search.EXHAUSTED and not result["success"]
+    assert result["expanded"] == 360 and "reconstruction" not in result
+
+def test_layered_bfs_keeps_no_nodes():
+    with pytest.raises(ValueError):
+        search.bfs(SlidingPuzzle(GOAL_3X3), layered=True, nodes="arena")
+
+# Checkpoints: cancelar, reanudar y terminar igual que sin interrupciones
+
+COUNTERS = ("expanded", "generated", "duplicates", "reopened", "pruned", "max_frontier", "max_closed")
+
+class CancelAfter:
+    """Token de cancelación que se activa tras `checks` consultas"""
+    def __init__(self, checks: int):
+        self.checks = checks
+
+    def is_set(self) -> bool:
+        self.checks -= 1
+        return self.checks < 0
+
+def run_engine(name: str, problem: SlidingPuzzle, h, **kwargs):
+    return search.astar(problem, h, **kwargs) if name == "astar" else search.ida_star(problem, h, **kwargs)
+
+@pytest.mark.parametrize("engine", ["astar", "ida_star"])
+def test_checkpoint_resume_matches_an_uninterrupted_run(engine, tmp_path):
+    problem = SlidingPuzzle(BOARDS_3X3[4])
+    h = compile_heuristic("manhattan", problem.goal, problem.width)
+    reference = run_engine(engine, problem, h)
+    path = str(tmp_path / "search.ckpt")
+    interruptions = 0
+    while True:
+        result = run_engine(engine, problem, h, cancel=CancelAfter(100), checkpoint=path)
+        if result["status"] != search.CANCELLED:
+            break
+        interruptions += 1
+        assert os.path.exists(path)
+    assert interruptions >= 2
+    assert result["checkpoint"]["resumed"]
+    assert not os.path.exists(path)  # borrado al terminar
+    assert result["actions"] == reference["actions"] and result["cost"] == reference["cost"]
+    for counter in COUNTERS:
+        assert result[counter] == reference[counter], counter
+
+@pytest.mark.parametrize("engine", ["astar", "ida_star"])
+def test_checkpoint_of_another_search_is_rejected(engine, tmp_path):
+    path = str(tmp_path / "search.ckpt")
+    problem = SlidingPuzzle((4, 5, 0, 1, 2, 3), width=3)
+    manhattan_h = compile_heuristic("manhattan", problem.goal, 3)
+    assert run_engine(engine, problem, manhattan_h, cancel=CancelAfter(0), checkpoint=path)["status"] == search.CANCELLED
+    other_heuristic = compile_heuristic("misplaced", problem.goal, 3)
+    other_goal = SlidingPuzzle(problem.initial, goal=(1, 2, 3, 4, 0, 5), width=3)
+    other_width = SlidingPuzzle(problem.initial, width=2)  # mismas fichas en 3x2
+    for board, h in ((problem, other_heuristic), (other_goal, compile_heuristic("manhattan", other_goal.goal, 3)),
+                     (other_width, compile_heuristic("manhattan", other_width.goal, 2))):
+        with pytest.raises(ValueError, match="otra búsqueda"):
+            # Cancelación como tope: si se aceptara por error, falla en vez de colgarse
+            run_engine(engine, board, h, checkpoint=path, cancel=CancelAfter(10_000))
+    assert os.path.exists(path)  # rechazado, no consumido
+    assert run_engine(engine, problem, manhattan_h, checkpoint=path)["success"]
+    assert not os.path.exists(path)
+
+# BFS externo: capas en disco contra bfs_distances, reanudación y tabla
+
+GOAL_2X3 = (1, 2, 3, 4, 5, 0)
+
+def layer_histogram(goal, width: int, height: int):
+    counts = Counter(tables.bfs_distances(goal, width, height).values())
+    return [counts[d] for d in range(len(counts))]
+
+def test_external_bfs_layers_match_bfs_distances(tmp_path):
+    bfs = ExternalBFS(str(tmp_path), 3, 2, buffer=64)  # buffer chico: varias corridas por capa
+    counts = bfs.run()
+    assert bfs.complete and counts == layer_histogram(GOAL_2X3, 3, 2)
+    assert sum(counts) == 360 and len(counts) == 22
+    assert set(bfs.layer(21)) == {(4, 5, 0, 1, 2, 3)}
+    distances = tables.bfs_distances(GOAL_2X3, 3, 2)
+    for depth in range(len(counts)):
+        assert all(distances[state] == depth for state in bfs.layer(depth))
+
+def test_external_bfs_resumes_from_a_partial_manifest(tmp_path):
+    reference = ExternalBFS(str(tmp_path / "reference"), 3, 2).run()
+    directory = str(tmp_path / "resumed")
+    partial = ExternalBFS(directory, 3, 2).run(cancel=CancelAfter(5))
+    assert 1 < len(partial) < len(reference)
+    resumed = ExternalBFS(directory, 3, 2)
+    assert resumed.counts == partial and not resumed.complete
+    layers = []
+    assert resumed.run(progress=lambda depth, states, seconds: layers.append(depth)) == reference
+    assert layers == list(range(len(partial), len(reference)))  # sólo las capas que faltaban
+
+def test_external_bfs_rejects_another_search(tmp_path):
+    ExternalBFS(str(tmp_path), 3, 2).run(cancel=CancelAfter(1))
+    with pytest.raises(ValueError, match="otra búsqueda"):
+        ExternalBFS(str(tmp_path), 2, 3)
+
+def test_external_bfs_table_matches_bfs_distances(tmp_path):
+    bfs = ExternalBFS(str(tmp_path / "layers"), 3, 2)
+    with pytest.raises(RuntimeError):
+        bfs.write_table(str(tmp_path / "early.bin"))
+    bfs.run()
+    table = load_table(bfs.write_table(str(tmp_path / "distance_2x3.bin")))
+    distances = tables.bfs_distances(GOAL_2X3, 3, 2)
+    assert len(table) == 720
+    assert sum(1 for value in table if value != tables.UNREACHABLE) == len(distances)
+    for state, distance in distances.items():
+        assert table[rank(state)] == distance
+
+# Tablas y PDBs vectorizadas (numpy) contra el BFS en Python puro
+
+@pytest.fixture(scope="module")
+def distances_3x3():
+    return tables.bfs_distances(tables.GOAL_3x3, 3, 3)
+
+def test_vectorized_table_matches_the_python_bfs(distances_3x3):
+    pytest.importorskip("numpy")
+    table = vectorized.distance_table(3, 3, tables.GOAL_3x3)
+    assert len(table) == tables.num_permutations(9)
+    assert int((table != tables.UNREACHABLE).sum()) == len(distances_3x3) == 181440
+    for state, distance in distances_3x3.items():
+        assert table[rank(state)] == distance
+    stored = tables.load("distance_3x3")
+    assert table.tobytes() == bytes(stored)
+
+def test_vectorized_table_on_a_rectangular_board():
+    pytest.importorskip("numpy")
+    table = vectorized.distance_table(3, 2)
+    distances = tables.bfs_distances(GOAL_2X3, 3, 2)
+    assert int((table != tables.UNREACHABLE).sum()) == len(distances)
+    for state, distance in distances.items():
+        assert table[rank(state)] == distance
+
+@pytest.mark.parametrize("pattern", [(1, 2, 3, 4), (5, 6, 7, 8), (1, 2, 3, 4, 5, 6, 7, 8)])
+def test_pattern_database_is_admissible(pattern, distances_3x3, tmp_path):
+    pytest.importorskip("numpy")
+    path = tables.write(str(tmp_path / "pdb.bin"), vectorized.build_pdb(3, 3, pattern, tables.GOAL_3x3).tobytes())
+    pdb = vectorized.PatternDatabase.load(path, 3, 3, pattern)
+    assert pdb.heuristic_name == f"pdb9:{','.join(map(str, pattern))}"
+    assert pdb(tables.GOAL_3x3) == 0
+    combined = vectorized.max_heuristic(pdb, lambda s: manhattan_distance(s, tables.GOAL_3x3, 3))
+    states = sorted(distances_3x3)[::97]  # muestra fija de ~1900 estados
+    for state in states:
+        assert pdb(state) <= combined(state) <= distances_3x3[state]
+    if len(pattern) == 8:  # todas las fichas: la PDB es la distancia exacta
+        assert all(pdb(state) == distances_3x3[state] for state in states)
+
+def test_pattern_database_checks_the_table_size():
+    with pytest.raises(ValueError):
+        vectorized.PatternDatabase(3, 3, (1, 2, 3), bytes(10))
+
+# Árbol BFS hacia atrás compartido (BackwardTree)
+
+def test_backward_tree_sources():
+    tree = backward.BackwardTree(size=9)
+    grown = tree.solve(BOARDS_3X3[2])
+    assert grown["source"] == backward.GROWN and grown["depth"] == 2 and tree.depth == 2
+    cached = tree.solve(BOARDS_3X3[1])
+    assert cached["source"] == backward.TREE and cached["expanded"] == 0
+    for board, optimal in zip(BOARDS_3X3, OPTIMAL_3X3):
+        result = tree.solve(board)
+        assert_valid_solution(SlidingPuzzle(board), result)
+        assert result["depth"] == optimal
+    assert not tree.solve(UNSOLVABLE_2X3 + (6, 7, 8))["success"]
+
+def test_backward_tree_searches_when_it_cannot_grow():
+    tree = backward.BackwardTree(size=9, max_states=500)
+    result = tree.solve(BOARDS_3X3[3])
+    assert result["source"] == backward.SEARCH
+    assert_valid_solution(SlidingPuzzle(BOARDS_3X3[3]), result)
+    assert result["depth"] == 20 and len(tree) <= 500
+
+def test_backward_tree_evicts_and_stays_optimal():
+    starts = [board.state for board in generator.generate(3, per_stratum=2, seed=3).boards]
+    tree = backward.BackwardTree(size=9, max_states=3000)
+    results = tree.solve_many(starts)
+    assert tree.evicted > 0 and len(tree) <= 3000
+    assert {r["source"] for r in results} == {backward.TREE, backward.GROWN, backward.SEARCH}
+    for start, result in zip(starts, results):
+        assert_valid_solution(SlidingPuzzle(start), result)
+        assert result["depth"] == tables.distance_3x3(start)
+        # Tras desalojar, cada estado que queda conserva su cadena de padres hasta la meta
+        assert all(tree.distance(state) == tables.distance_3x3(state) for state in result["path"] if state in tree)
+
+def test_backward_solve_file(tmp_path, capsys):
+    corpus = generator.generate(3, per_stratum=1, strata=range(0, 32, 4), seed=1)
+    path = str(tmp_path / "corpus.bin")
+    generator.save(path, corpus)
+    assert backward._main(["solve-file", path, "--max-states", "5000"]) == 0
+    assert "óptimas" in capsys.readouterr().out
+    # Un largo del corpus que no es el óptimo se informa y termina con error
+    wrong = corpus._replace(boards=[corpus.boards[1]._replace(depth=corpus.boards[1].depth + 1)])
+    generator.save(path, wrong)
+    assert backward._main(["solve-file", path]) == 1
+    assert "el corpus dice" in capsys.readouterr().out
+
+# Desempates del MinHeap
+
+@pytest.mark.parametrize("tie_break, order", [
+    ("fifo", "abcd"),    # orden de inserción
+    ("lifo", "dcba"),    # el último insertado primero
+    ("high_g", "bdca"),  # mayor g primero; entre iguales, inserción
+    ("low_h", "cbad"),   # menor h primero; entre iguales, inserción
+])
+def test_min_heap_tie_breaks(tie_break, order):
+    heap = MinHeap(tie_break)
+    heap.push("z", 6, g=9, h=0)
+    for item, g, h in (("a", 1, 2), ("b", 3, 1), ("c", 2, 0), ("d", 3, 2)):
+        heap.push(item, 5, g=g, h=h)
+    heap.push("y", 4, g=0, h=9)
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert [item for _, item in popped] == ["y", *order, "z"]  # la prioridad manda siempre
+    assert [priority for priority, _ in popped] == [4, 5, 5, 5, 5, 6]
+    assert heap.is_empty()
+
+def test_min_heap_rejects_unknown_tie_breaks():
+    with pytest.raises(ValueError):
+        MinHeap("random")
+
+@pytest.mark.parametrize("tie_break", TIE_BREAKS)
+def test_astar_is_optimal_with_every_tie_break(tie_break):
+    problem = SlidingPuzzle(BOARDS_3X3[3])
+    result = search.astar(problem, manhattan(problem), tie_break=tie_break)
+    assert_valid_solution(problem, result)
+    assert result["cost"] == 20
+
+# ARA*: cotas que no suben y solución final óptima
+
+@pytest.mark.parametrize("heuristic, w_step", [("misplaced", 1.0), ("manhattan", 0.5)])
+@pytest.mark.parametrize("board, optimal", [((8, 6, 7, 2, 5, 4, 3, 0, 1), 31), (BOARDS_3X3[3], 20)])
+def test_ara_star_bounds_only_improve(heuristic, w_step, board, optimal):
+    problem = SlidingPuzzle(board)
+    improvements = []
+    result = search.ara_star(problem, compile_heuristic(heuristic, problem.goal, 3), w0=5.0, w_step=w_step,
+                             on_solution=improvements.append)
+    assert_valid_solution(problem, result)
+    solutions = result["solutions"]
+    assert improvements == solutions and len(solutions) >= 2
+    for before, after in zip(solutions, solutions[1:]):
+        assert after["bound"] <= before["bound"] and after["cost"] <= before["cost"]
+        assert after["weight"] < before["weight"]
+    for solution in solutions:
+        assert solution["cost"] <= solution["bound"] * optimal
+    assert result["bound"] == result["weight"] == 1.0 and result["cost"] == optimal
+    assert "interrupted" not in result
+
+def test_ara_star_keeps_its_incumbent_when_cancelled():
+    problem = SlidingPuzzle((8, 6, 7, 2, 5, 4, 3, 0, 1))
+    h = compile_heuristic("manhattan", problem.goal, 3)
+    first = search.ara_star(problem, h, w0=5.0, cancel=CancelAfter(0))
+    assert first["status"] == search.CANCELLED and not first["success"]  # sin solución todavía
+    cancel = CancelAfter(10_000)
+    # Cancelar apenas aparece la primera solución: se devuelve con su cota
+    result = search.ara_star(problem, h, w0=5.0, cancel=cancel, on_solution=lambda _: setattr(cancel, "checks", 0))
+    assert result["interrupted"] == search.CANCELLED
+    assert_valid_solution(problem, result)
+    assert result["bound"] > 1.0 and len(result["solutions"]) == 1
+
+# Beam y best-first acotado: caminos válidos o fallas limpias
+
+@pytest.mark.parametrize("engine", [search.beam_search, search.bounded_best_first])
+@pytest.mark.parametrize("board", BOARDS_3X3)
+def test_width_limited_search_paths_are_valid(engine, board):
+    problem = SlidingPuzzle(board)
+    result = engine(problem, manhattan(problem), width=64)
+    assert_valid_solution(problem, result)
+    assert result["cost"] >= OPTIMAL_3X3[BOARDS_3X3.index(board)]
+
+def test_beam_search_fails_cleanly_when_too_narrow():
+    problem = SlidingPuzzle(BOARDS_3X3[3])
+    result = search.beam_search(problem, manhattan(problem), width=1, max_depth=200)
+    assert result["status"] == search.EXHAUSTED and not result["success"]
+    assert result["expanded"] == 200  # un nodo por capa hasta max_depth
+    unreachable = SlidingPuzzle(UNSOLVABLE_2X3, width=3)
+    result = search.beam_search(unreachable, manhattan(unreachable), width=256)
+    assert result["status"] == search.EXHAUSTED and result["expanded"] == 360
+
+def test_bounded_best_first_fails_cleanly_when_too_narrow():
+    problem = SlidingPuzzle(UNSOLVABLE_2X3, width=3)
+    h = manhattan(problem)
+    assert search.bounded_best_first(problem, h, width=256)["status"] == search.EXHAUSTED
+    # Ancho 1: la frontera y la tabla olvidan estados; los topes la cortan
+    result = search.bounded_best_first(problem, h, width=1, max_expansions=5000)
+    assert result["status"] == search.EXHAUSTED and not result["success"] and result["expanded"] == 5000
+    assert result["max_frontier"] <= 2
+    result = search.bounded_best_first(problem, h, width=1, cancel=CancelAfter(1000))
+    assert result["status"] == search.CANCELLED and not result["success"]
@@ -0,0 +1,233 @@
+"""BFS vectorizado con NumPy sobre el espacio de rangos: tablas de distancia y PDBs.
+
+Cada capa del BFS es un arreglo de rangos (int64). Por bloques de `chunk`
+estados se hace, todo con operaciones sobre arreglos:
+
+    rangos -> posiciones    unrank_many (hueco + fichas del patrón)
+    posiciones -> hijos     mover el hueco en las 4 direcciones a la vez
+    hijos -> rangos         rank_many, np.unique
+    duplicados              mapa de bits de visitados (1 bit por estado)
+
+Un estado abstracto son las posiciones del hueco y de las fichas del patrón
+(las demás fichas son indistinguibles). La base de datos de patrones (PDB) se
+indexa por las posiciones de las fichas del patrón (ranking.rank_partial) y
+guarda la menor distancia con cualquier posición del hueco; cada movimiento
+cuenta, así que es admisible pero no aditiva (combinar varias con max).
+La tabla completa es la PDB de todas las fichas, reordenada por rank(tablero)
+para quedar en el formato de solver/tables.py.
+
+NumPy es opcional: sin él tables.py construye distance_3x3 con el BFS en
+Python puro y PatternDatabase sigue funcionando sobre tablas ya construidas.
+
+Uso:
+    python -m solver.vectorized table --width 3 --height 3 --out distance_3x3.bin
+    python -m solver.vectorized pdb --width 4 --height 4 --pattern 1,2,3,4,5,6 --out pdb_4x4_a.bin
+"""
+from typing import Callable, List, Optional, Sequence
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # sin numpy: tables.py usa el BFS en Python puro
+    np = None
+
+from .problem import default_goal
+from .ranking import FACTORIALS, num_partial, rank_partial
+from . import tables
+
+CHUNK = 1 << 18  # estados por bloque (acota la memoria de los temporales)
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("solver.vectorized necesita numpy (pip install numpy)")
+
+def _weights(n: int, k: int):
+    """Peso de cada dígito del rango parcial: (n-1-i)! / (n-k)!"""
+    return np.array([FACTORIALS[n - 1 - i] // FACTORIALS[n - k] for i in range(k)], dtype=np.int64)
+
+def rank_many(positions, n: int):
+    """rank_partial de cada fila de `positions` (L x k) -> arreglo int64"""
+    k = positions.shape[1]
+    weights = _weights(n, k)
+    ranks = np.zeros(len(positions), dtype=np.int64)
+    for i in range(k):
+        column = positions[:, i]
+        digit = column.astype(np.int64)
+        for j in range(i):
+            digit -= positions[:, j] < column
+        ranks += digit * weights[i]
+    return ranks
+
+def unrank_many(ranks, n: int, k: int):
+    """Inversa de rank_many: filas de k posiciones (int8)"""
+    weights = _weights(n, k)
+    rest = ranks.astype(np.int64, copy=True)
+    out = np.empty((len(rest), k), dtype=np.int8)
+    for i in range(k):
+        digit, rest = np.divmod(rest, weights[i])
+        out[:, i] = digit
+    # De derecha a izquierda: cada dígito es relativo a las posiciones que dejó libres
+    # el prefijo, así que los de la derecha saltan las ya tomadas
+    for i in range(k - 2, -1, -1):
+        column = out[:, i:i + 1]
+        suffix = out[:, i + 1:]
+        suffix += suffix >= column
+    return out
+
+def _targets(width: int, height: int) -> List:
+    """Por dirección, el destino del hueco desde cada posición (-1 si se sale)"""
+    n = width * height
+    result = []
+    for dx, dy in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+        target = np.full(n, -1, dtype=np.int8)
+        for i in range(n):
+            x, y = divmod(i, width)
+            if 0 <= x + dx < height and 0 <= y + dy < width:
+                target[i] = i + dx * width + dy
+        result.append(target)
+    return result
+
+def _expand(positions, targets):
+    """Hijos de todos los estados: el hueco (columna 0) cambia de lugar con lo que haya en el destino"""
+    blank = positions[:, 0]
+    children = []
+    for target in targets:
+        to = target[blank]
+        ok = to >= 0
+        child = positions[ok]
+        to, frm = to[ok], blank[ok]
+        tiles = child[:, 1:]
+        child[:, 1:] = np.where(tiles == to[:, None], frm[:, None], tiles)
+        child[:, 0] = to
+        children.append(child)
+    return np.concatenate(children)
+
+def _test(bits, ranks):
+    return ((bits[ranks >> 3] >> (ranks & 7)) & 1).astype(bool)
+
+def _mark(bits, ranks) -> None:
+    np.bitwise_or.at(bits, ranks >> 3, (1 << (ranks & 7)).astype(np.uint8))
+
+def build_pdb(width: int, height: int, pattern: Sequence[int], goal: Optional[Sequence[int]] = None,
+              chunk: int = CHUNK, progress: Optional[Callable[[int, int, float], None]] = None):
+    """PDB de `pattern` hacia `goal`: uint8 indexado por rank_partial(posiciones del patrón)
+
+    `progress(profundidad, estados, segundos)` se llama al cerrar cada capa.
+    """
+    _require_numpy()
+    n = width * height
+    goal = tuple(goal) if goal is not None else default_goal(n)
+    m = len(pattern) + 1  # columnas: hueco + fichas del patrón
+    start = np.array([[goal.index(0)] + [goal.index(t) for t in pattern]], dtype=np.int8)
+    targets = _targets(width, height)
+    visited = np.zeros((num_partial(n, m) + 7) // 8, dtype=np.uint8)
+    table = np.full(num_partial(n, m - 1), tables.UNREACHABLE, dtype=np.uint8)
+
+    layer = rank_many(start, n)
+    _mark(visited, layer)
+    table[rank_many(start[:, 1:], n)] = 0
+    depth = 0
+    while layer.size:
+        t0 = time.perf_counter()
+        depth += 1
+        following = []
+        for lo in range(0, layer.size, chunk):
+            children = _expand(unrank_many(layer[lo:lo + chunk], n, m), targets)
+            ranks, first = np.unique(rank_many(children, n), return_index=True)
+            fresh = ~_test(visited, ranks)
+            ranks, children = ranks[fresh], children[first[fresh]]
+            if not ranks.size:
+                continue
+            _mark(visited, ranks)
+            following.append(ranks)
+            # Por capas la primera vez que aparece un patrón es su menor distancia
+            keys = rank_many(children[:, 1:], n)
+            keys = keys[table[keys] == tables.UNREACHABLE]
+            table[keys] = depth
+        layer = np.concatenate(following) if following else np.empty(0, dtype=np.int64)
+        if progress is not None and layer.size:
+            progress(depth, int(layer.size), time.perf_counter() - t0)
+    return table
+
+def distance_table(width: int, height: int, goal: Optional[Sequence[int]] = None, chunk: int = CHUNK):
+    """Distancia exacta a `goal` por rank(tablero), como tables.distance_3x3 (255 = inalcanzable)"""
+    _require_numpy()
+    n = width * height
+    by_pattern = build_pdb(width, height, range(1, n), goal, chunk)
+    table = np.full(FACTORIALS[n], tables.UNREACHABLE, dtype=np.uint8)
+    tiles = np.arange(n, dtype=np.int8)
+    total = n * (n - 1) // 2
+    for lo in range(0, len(by_pattern), chunk):
+        keys = np.arange(lo, min(lo + chunk, len(by_pattern)), dtype=np.int64)
+        positions = unrank_many(keys, n, n - 1)
+        # El hueco ocupa la única posición que falta
+        blank = total - positions.sum(axis=1, dtype=np.int64)
+        positions = np.concatenate([blank[:, None].astype(np.int8), positions], axis=1)
+        boards = np.empty_like(positions)
+        np.put_along_axis(boards, positions.astype(np.int64), np.broadcast_to(tiles, positions.shape), axis=1)
+        table[rank_many(boards, n)] = by_pattern[lo:lo + len(keys)]
+    return table
+
+class PatternDatabase:
+    """Heurística de una PDB construida con build_pdb (no necesita numpy para consultar)"""
+    def __init__(self, width: int, height: int, pattern: Sequence[int], table):
+        self.n = width * height
+        self.pattern = tuple(pattern)
+        if len(table) != num_partial(self.n, len(self.pattern)):
+            raise ValueError(f"La tabla tiene {len(table)} entradas; el patrón {self.pattern} "
+                             f"en {width}x{height} necesita {num_partial(self.n, len(self.pattern))}")
+        self.table = table
+
+    @classmethod
+    def load(cls, path: str, width: int, height: int, pattern: Sequence[int]) -> 'PatternDatabase':
+        table = tables._map(path)
+        if table is None:
+            raise ValueError(f"{path} no es una tabla válida")
+        return cls(width, height, pattern, table)
+
+    @property
+    def heuristic_name(self) -> str:
+        return f"pdb{self.n}:{','.join(map(str, self.pattern))}"
+
+    def __call__(self, state: Sequence[int]) -> int:
+        where = [0] * self.n
+        for i, tile in enumerate(state):
+            where[tile] = i
+        return int(self.table[rank_partial([where[t] for t in self.pattern], self.n)])
+
+def max_heuristic(*heuristics: Callable) -> Callable:
+    """Máximo de varias heurísticas admisibles (sigue siendo admisible)"""
+    return lambda state: max(h(state) for h in heuristics)
+
+def _main(argv: List[str]) -> int:
+    import argparse
+    parser = argparse.ArgumentParser(prog="python -m solver.vectorized",
+                                     description="Tablas de distancia y PDBs con BFS vectorizado (NumPy)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, help_text in (("table", "tabla de distancias exacta por rank(tablero)"),
+                            ("pdb", "base de datos de patrones por rank_partial(posiciones)")):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--width", type=int, required=True)
+        p.add_argument("--height", type=int, required=True)
+        p.add_argument("--out", required=True, help="archivo de salida (formato de solver/tables.py)")
+        p.add_argument("--chunk", type=int, default=CHUNK, help="estados por bloque vectorizado")
+        if name == "pdb":
+            p.add_argument("--pattern", required=True, help="fichas del patrón separadas por comas")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.command == "table":
+        table = distance_table(args.width, args.height, chunk=args.chunk)
+    else:
+        pattern = [int(t) for t in args.pattern.split(",")]
+        table = build_pdb(args.width, args.height, pattern, chunk=args.chunk,
+                          progress=lambda d, c, s: print(f"  capa {d:>3}: {c:>12} estados  {s:8.2f}s"))
+    tables.write(args.out, table.tobytes())
+    reached = int((table != tables.UNREACHABLE).sum())
+    print(f"✅ {reached} entradas, máximo {int(table[table != tables.UNREACHABLE].max())}, "
+          f"{time.perf_counter() - t0:.2f}s -> {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
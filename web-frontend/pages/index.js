@@ -219,12 +219,15 @@ export default function Home() {
                     <SelectValue placeholder="Select algorithm" />
                   </SelectTrigger>
                   <SelectContent>
+                    <SelectItem value="auto">Auto (fastest optimal)</SelectItem>
                     <SelectItem value="astar">A* Search</SelectItem>
                     <SelectItem value="bfs">Breadth-First Search</SelectItem>
                     <SelectItem value="dfs">Depth-First Search</SelectItem>
                     <SelectItem value="greedy">Greedy Best-First</SelectItem>
                     <SelectItem value="ucs">Uniform Cost</SelectItem>
                     <SelectItem value="ida">IDA*</SelectItem>
+                    <SelectItem value="ara">ARA* (anytime, 1 s budget)</SelectItem>
+                    <SelectItem value="beam">Beam Search (approximate)</SelectItem>
                   </SelectContent>
                 </Select>
               </div>
@@ -234,7 +237,7 @@ export default function Home() {
                 <Select 
                   value={heuristic} 
                   onValueChange={(v) => setHeuristic(v)}
-                  disabled={!["greedy", "astar", "ida"].includes(algorithm)}
+                  disabled={!["greedy", "astar", "ida", "ara", "beam"].includes(algorithm)}
                 >
                   <SelectTrigger id="heuristic">
                     <SelectValue placeholder="Select heuristic" />
@@ -244,7 +247,7 @@ export default function Home() {
                     <SelectItem value="misplaced">Misplaced Tiles</SelectItem>
                   </SelectContent>
                 </Select>
-                {!["greedy", "astar", "ida"].includes(algorithm) && (
+                {!["greedy", "astar", "ida", "ara", "beam"].includes(algorithm) && (
                   <p className="text-xs text-muted-foreground mt-1">
                     Heuristic not used for this algorithm
                   </p>